@@ -0,0 +1,205 @@
+"""
+Download pipeline benchmark for Saildeck.
+
+Runs the GameBanana API client, download_file and the download manager
+against the local stand-in server (download/gamebanana/fake_server.py)
+and reports:
+  - API throughput (Subfeed pages and file lists per second)
+  - time to first card (first page fetched and parsed + first thumbnail)
+  - raw download throughput, single stream and segmented
+  - end-to-end install latency through the download manager
+
+Usage:
+    python bench_downloads.py --mods 60 --payload-mb 8 --latency 0.03
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+import requests
+
+from download.gamebanana import api
+from download.gamebanana import gb_download
+from download.gamebanana import cache
+from download.gamebanana.async_client import get_async_client
+from download.gamebanana.fake_server import FakeGameBananaServer
+from download.gamebanana.download_manager import DownloadManager, FINISHED_STATES, STATE_COMPLETED
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def bench_api(pages):
+    """Fetch Subfeed pages and every listed mod's file list."""
+    started = time.perf_counter()
+    mods = []
+    for page in range(1, pages + 1):
+        page_mods, _, has_more = api.fetch_soh_mods(page=page, per_page=50)
+        mods.extend(page_mods)
+        if not has_more:
+            break
+    pages_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for mod in mods:
+        api.get_mod_files(mod["mod_id"])
+    files_elapsed = time.perf_counter() - started
+
+    client = get_async_client()
+    started = time.perf_counter()
+    client.run(client.get_files_for_mods([mod["mod_id"] for mod in mods]))
+    async_elapsed = time.perf_counter() - started
+
+    return {
+        "pages": page,
+        "pages_per_s": page / pages_elapsed if pages_elapsed else 0.0,
+        "file_lists": len(mods),
+        "file_lists_per_s": len(mods) / files_elapsed if files_elapsed else 0.0,
+        "async_file_lists_per_s": len(mods) / async_elapsed if async_elapsed else 0.0,
+    }
+
+
+def bench_first_card():
+    """Time from request to first renderable card (record + thumbnail)."""
+    started = time.perf_counter()
+    mods, _, _ = api.fetch_soh_mods(page=1, per_page=50)
+    first_record = time.perf_counter() - started
+    if mods and mods[0].get("image_url"):
+        requests.get(mods[0]["image_url"], timeout=5).content
+    return {"first_record_s": first_record, "first_card_s": time.perf_counter() - started}
+
+
+def bench_download(server, work_dir, segments):
+    """Download the largest payload once and return MB/s."""
+    mod = server.catalog.mods[0]
+    files = []
+    for _ in range(3):  # Tolerate injected errors on the file list
+        files = api.get_mod_files(mod["_idRow"])
+        if files:
+            break
+    if not files:
+        return {"ok": False, "mb_per_s": 0.0}
+    file_info = max(files, key=lambda f: f["filesize"])
+    dest = os.path.join(work_dir, f"bench_{segments}_{file_info['filename']}")
+
+    started = time.perf_counter()
+    digests = gb_download.download_file(file_info["download_url"], dest,
+                                        expected_size=file_info["filesize"], segments=segments)
+    elapsed = time.perf_counter() - started
+    ok = bool(digests) and digests["md5"] == file_info["md5"]
+    if os.path.exists(dest):
+        os.remove(dest)
+    return {"ok": ok, "mb_per_s": file_info["filesize"] / (1024 * 1024) / elapsed if elapsed else 0.0}
+
+
+def bench_installs(server, mods_dir, count, concurrency):
+    """Install `count` mods through the download manager; return latencies."""
+    manager = DownloadManager(max_concurrent=concurrency)
+    started = {}
+    finished = {}
+    lock = threading.Lock()
+
+    def on_update(snapshot):
+        with lock:
+            task_id = snapshot["task_id"]
+            if snapshot["state"] in FINISHED_STATES and task_id not in finished:
+                finished[task_id] = (time.perf_counter(), snapshot["state"])
+
+    manager.subscribe(on_update)
+    mods, _, _ = api.fetch_soh_mods(page=1, per_page=min(50, count))
+    wall_start = time.perf_counter()
+    for mod in mods[:count]:
+        enqueued_at = time.perf_counter()
+        task_id = manager.enqueue(mod, mods_dir)
+        started[task_id] = enqueued_at
+
+    deadline = time.monotonic() + 600
+    while len(finished) < len(started) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    wall = time.perf_counter() - wall_start
+
+    latencies = [finished[t][0] - started[t] for t in finished]
+    succeeded = sum(1 for _, state in finished.values() if state == STATE_COMPLETED)
+    return {
+        "installed": succeeded,
+        "requested": len(started),
+        "wall_s": wall,
+        "p50_s": statistics.median(latencies) if latencies else 0.0,
+        "p95_s": _percentile(latencies, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Saildeck download pipeline offline")
+    parser.add_argument("--mods", type=int, default=60, help="mods in the fake catalog")
+    parser.add_argument("--payload-mb", type=float, default=4.0, help="size of each mod payload")
+    parser.add_argument("--latency", type=float, default=0.02, help="server latency per request (s)")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0.0, help="per-connection cap (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--installs", type=int, default=12, help="mods to install end to end")
+    parser.add_argument("--concurrency", type=int, default=3, help="download manager concurrency")
+    parser.add_argument("--segments", type=int, default=4, help="segments for the segmented download run")
+    args = parser.parse_args()
+
+    server = FakeGameBananaServer(
+        mod_count=args.mods,
+        payload_size=int(args.payload_mb * 1024 * 1024),
+        latency=args.latency,
+        bandwidth=int(args.bandwidth_mbps * 1024 * 1024) or None,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+    ).start()
+    api.API_V11_BASE = server.api_base
+    gb_download.RETRY_BACKOFF_SECONDS = 0.1
+    # Let the segmented run kick in for benchmark-sized payloads
+    gb_download.SEGMENTED_MIN_SIZE = min(gb_download.SEGMENTED_MIN_SIZE, 1024 * 1024)
+
+    work_dir = tempfile.mkdtemp(prefix="saildeck_bench_")
+    mods_dir = os.path.join(work_dir, "mods")
+    os.makedirs(mods_dir)
+    # Install into a throwaway archive cache: the user's cache would turn reruns into cache hits
+    cache._archive_cache = cache.ArchiveCache(os.path.join(work_dir, "cache"), 4 * 1024 ** 3)
+
+    try:
+        print(f"[Bench] Fake GameBanana at {server.base_url} "
+              f"({args.mods} mods, {args.payload_mb} MB payloads, {args.latency * 1000:.0f} ms latency)")
+
+        result = bench_first_card()
+        print(f"[Bench] Time to first card: {result['first_card_s'] * 1000:.1f} ms "
+              f"(first record {result['first_record_s'] * 1000:.1f} ms)")
+
+        result = bench_api(pages=max(1, args.mods // 50 + 1))
+        print(f"[Bench] API: {result['pages_per_s']:.1f} pages/s, "
+              f"{result['file_lists_per_s']:.1f} file lists/s sequential, "
+              f"{result['async_file_lists_per_s']:.1f} file lists/s async ({result['file_lists']} mods)")
+
+        for segments in (1, args.segments):
+            result = bench_download(server, work_dir, segments)
+            status = "ok" if result["ok"] else "FAILED"
+            print(f"[Bench] Download ({segments} segment{'s' if segments > 1 else ''}): "
+                  f"{result['mb_per_s']:.1f} MB/s [{status}]")
+
+        result = bench_installs(server, mods_dir, args.installs, args.concurrency)
+        print(f"[Bench] Installs: {result['installed']}/{result['requested']} in {result['wall_s']:.2f} s, "
+              f"latency p50 {result['p50_s']:.2f} s, p95 {result['p95_s']:.2f} s")
+
+        stats = server.stats
+        print(f"[Bench] Server: {stats['requests']} requests, {stats['errors']} injected errors, "
+              f"{stats['drops']} dropped transfers, {stats['bytes_sent'] / (1024 * 1024):.1f} MB sent")
+    finally:
+        server.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,10 @@ from send2trash import send2trash
 from theme_manager import get_theme_manager
 
 
-def delete_mod(path, refresh_callback=None, status_callback=None):
+def confirm_delete(path, status_callback=None):
     """
-    Delete the given mod or folder, with optional confirmation based on settings.
-    refresh_callback: function to call to refresh the UI after deletion
-    status_callback: function to update the status (e.g., lambda text: window.status_var.set(text))
+    Check that path exists and ask for confirmation if the setting requires it.
+    Returns True if the deletion should go ahead. Call on the Tk thread.
     """
     if not os.path.exists(path):
         messagebox.showerror("Error", f"The path does not exist:\n{path}")
@@ -18,24 +17,17 @@ def delete_mod(path, refresh_callback=None, status_callback=None):
 
     # Check if confirmation is required based on settings
     theme_manager = get_theme_manager()
-    confirm_delete = theme_manager.get_setting("behavior", "confirm_delete", True)
+    needs_confirmation = theme_manager.get_setting("behavior", "confirm_delete", True)
 
-    if confirm_delete:
+    if needs_confirmation:
         confirm = messagebox.askyesno("Confirm", f"Are you sure you want to delete '{os.path.basename(path)}'?")
         if not confirm:
             if status_callback:
                 status_callback("⚠️ Deletion cancelled.")
             return False
+    return True
 
-    try:
-        send2trash(path)
-        if status_callback:
-            status_callback(f"✅ Deleted '{os.path.basename(path)}'")
-        if refresh_callback:
-            refresh_callback()
-        return True
-    except Exception as e:
-        if status_callback:
-            status_callback(f"❌ Failed to delete: {e}")
-        messagebox.showerror("Error", f"Failed to delete:\n{e}")
-        return False
+
+def trash_path(path):
+    """Move a mod or folder to the trash (can be slow for big folders; safe off the Tk thread)."""
+    send2trash(path)
@@ -4,9 +4,10 @@ import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from PIL import Image, ImageTk
 
-import threading
-from download.gamebanana.api import fetch_soh_mods
-from download.gamebanana.widgets import render_mod_card
+from download.gamebanana.async_client import get_async_client
+from download.gamebanana.catalog import get_catalog, get_catalog_sync
+from download.gamebanana.search import get_catalog_search
+from download.gamebanana.widgets import ModCard, VirtualCardList, load_thumbnail, thumbnail_cached
 
 try:
     from theme_manager import get_theme_manager, get_platform_font
@@ -28,6 +29,11 @@ CATEGORIES = [
     "Voices"
 ]
 
+PAGE_SIZE = 50
+SEARCH_AS_YOU_TYPE_MS = 60  # Debounce for local search while typing
+INFINITE_SCROLL_ROWS = 6  # Load the next page when this close to the end
+PREFETCH_BUDGET = 12  # Max look-ahead requests (file lists + thumbnails) in flight
+
 
 class ToolTip:
     def __init__(self, widget, text):
@@ -53,7 +59,7 @@ class ToolTip:
             self.tip_window = None
 
 
-def open_downloader_window(parent, mods_dir=None, on_download_complete=None):
+def open_downloader_window(parent, mods_dir=None):
     font = get_platform_font()
 
     window = tb.Toplevel(parent)
@@ -95,8 +101,22 @@ def open_downloader_window(parent, mods_dir=None, on_download_complete=None):
         "has_more": False,
         "search": None,
         "sort": "new",
-        "category": "All Categories"
+        "category": "All Categories",
+        "generation": 0,  # Bumped per query so stale responses are dropped
+        "local": False,  # Current results come from the local catalog
+        "total": 0,
+        "search_results": [],  # Ranked local search results, paged through by load_local
+        "typing_after_id": None,
+        "next_page": None,  # Background fetch of the next remote page
+        "prefetch_futures": set(),  # Outstanding look-ahead fetches, cancelled on query change
+        "prefetch_in_flight": 0,
+        "prefetched_ids": set(),
+        "scroll_load_pending": False
     }
+    client = get_async_client()
+    catalog = get_catalog()
+    catalog_sync = get_catalog_sync()
+    searcher = get_catalog_search()
 
     tb.Separator(main_frame, orient=VERTICAL).pack(side="left", fill="y", padx=0, pady=10)
 
@@ -145,24 +165,13 @@ def open_downloader_window(parent, mods_dir=None, on_download_complete=None):
     vsb.pack(side="right", fill="y")
 
     canvas.pack(side="left", fill="both", expand=True)
-    canvas.configure(yscrollcommand=vsb.set)
-
-    # Inner frame for content
-    inner_frame = tb.Frame(canvas)
-
-    # Create window in canvas - store the ID
-    inner_window = canvas.create_window((0, 0), window=inner_frame, anchor="nw")
-
-    def update_scroll_region(event=None):
-        """Update scroll region when inner frame changes size."""
-        canvas.configure(scrollregion=canvas.bbox("all"))
-
-    def update_canvas_width(event):
-        """Make inner frame match canvas width."""
-        canvas.itemconfig(inner_window, width=event.width)
 
-    inner_frame.bind("<Configure>", update_scroll_region)
-    canvas.bind("<Configure>", update_canvas_width)
+    # Only cards near the viewport exist; they are recycled while scrolling
+    card_list = VirtualCardList(
+        canvas, vsb,
+        card_factory=lambda parent: ModCard(parent, mods_dir=mods_dir),
+        on_range_changed=lambda first, last: on_visible_range(first, last)
+    )
 
     # Mouse wheel
     def on_wheel(event):
@@ -192,23 +201,17 @@ def open_downloader_window(parent, mods_dir=None, on_download_complete=None):
 
     def on_close():
         unbind_wheel()
+        start_query()  # Cancel outstanding prefetches
         window.destroy()
 
     window.protocol("WM_DELETE_WINDOW", on_close)
 
     def clear_mods():
-        for w in inner_frame.winfo_children():
-            w.destroy()
-        if hasattr(inner_frame, "_images"):
-            inner_frame._images = []
-        canvas.yview_moveto(0)
-        window.update_idletasks()
+        card_list.clear()
 
     def show_msg(text):
         clear_mods()
-        tb.Label(inner_frame, text=text, font=(font, 10)).pack(pady=20)
-        window.update_idletasks()
-        update_scroll_region()
+        card_list.set_footer(tb.Label(canvas, text=text, font=(font, 10), anchor="center"))
 
     def filter_mods_by_category(mods, category):
         """Filter mods list by category."""
@@ -216,42 +219,49 @@ def open_downloader_window(parent, mods_dir=None, on_download_complete=None):
             return mods
         return [m for m in mods if m.get("category", "").lower() == category.lower()]
 
+    def show_footer_msg(text):
+        card_list.set_footer(tb.Label(canvas, text=text, font=(font, 10), anchor="center"), height=50)
+
     def display_mods(mods, append=False):
         """Display mods in the UI."""
         if not append:
             clear_mods()
 
-        filtered = filter_mods_by_category(mods, state["category"])
+        # Local catalog results are already filtered by the query
+        filtered = mods if state["local"] else filter_mods_by_category(mods, state["category"])
 
-        if not filtered and not append:
+        if not filtered and not append and not state["has_more"]:
             show_msg("No mods found for this category")
             results_label.config(text="0 mods")
             return
 
-        total_display = len(filter_mods_by_category(state["all_mods"], state["category"]))
+        if state["local"]:
+            total_display = state["total"]
+        else:
+            total_display = len(filter_mods_by_category(state["all_mods"], state["category"]))
         results_label.config(text=f"{total_display} mods")
 
-        for mod in filtered:
-            render_mod_card(inner_frame, mod, mods_dir=mods_dir, on_download_complete=on_download_complete)
-
-        # Load more button
+        # Footer first, so the range check after the items land sees has_more
         if state["has_more"]:
-            def load_next():
-                load_more_btn.destroy()
-                load_mods(page=state["page"] + 1, append=True)
-
-            load_more_btn = tb.Button(
-                inner_frame,
-                text="⬇ Load More Mods...",
-                bootstyle="success",
-                command=load_next,
-                cursor="hand2"
-            )
-            load_more_btn.pack(pady=20, ipadx=20, ipady=5)
-
-        # Force scroll region update
-        window.update_idletasks()
-        update_scroll_region()
+            show_footer_msg("Loading more mods...")
+        else:
+            card_list.set_footer(None)
+
+        if append:
+            card_list.append_items(filtered)
+        else:
+            card_list.set_items(filtered)
+
+    def start_query():
+        """Begin a new result set: drop stale responses and outstanding prefetches."""
+        state["generation"] += 1
+        for future in list(state["prefetch_futures"]):
+            future.cancel()
+        state["prefetch_futures"] = set()
+        state["prefetch_in_flight"] = 0
+        state["prefetched_ids"] = set()
+        state["next_page"] = None
+        return state["generation"]
 
     def load_mods(search=None, sort="new", page=1, append=False):
         if state["loading"]:
@@ -262,39 +272,184 @@ def open_downloader_window(parent, mods_dir=None, on_download_complete=None):
         state["search"] = search
         state["sort"] = sort
 
+        generation = state["generation"] if append else start_query()
+        sort_key = "new" if sort == "Newest" else "updated"
+
+        # Browsing and search run against the local catalog once it has been synced
+        if catalog.count() > 0:
+            load_local(sort_key, page, append, search)
+            return
+
+        state["local"] = False
         if not append:
             state["all_mods"] = []
             show_msg("Loading mods...")
 
-        def fetch():
-            try:
-                sort_key = "new" if sort == "Newest" else "updated"
-                mods, total, has_more = fetch_soh_mods(
-                    page=page,
-                    per_page=50,  # Load more per page
-                    sort=sort_key,
-                    search=search if search else None
-                )
-
-                state["has_more"] = has_more
+        def on_page(result, error):
+            if generation != state["generation"] or not window.winfo_exists():
+                return  # Superseded by a newer query or window closed
+            state["loading"] = False
 
+            if error is not None:
+                print(f"[Downloader] Error: {error}")
                 if append:
-                    state["all_mods"].extend(mods)
+                    state["page"] = page - 1  # Let the next scroll retry this page
+                    show_footer_msg(f"Error: {error}")
                 else:
-                    state["all_mods"] = mods
+                    show_msg(f"Error: {error}")
+                return
+
+            mods, total, has_more = result
+            state["has_more"] = has_more
+            if append:
+                state["all_mods"].extend(mods)
+            else:
+                state["all_mods"] = mods
+
+            display_mods(mods, append=append)
+            if has_more:
+                prefetch_next_page(search, sort_key, page + 1, generation)
+
+        # Page N+1 is usually already fetched (or on its way) while the user reads page N
+        pending = state["next_page"]
+        state["next_page"] = None
+        if append and pending and pending["page"] == page:
+            if pending["done"]:
+                on_page(pending["result"], pending["error"])
+            else:
+                pending["waiter"] = on_page
+            return
 
-                def update_ui():
-                    display_mods(mods, append=append)
-                    state["loading"] = False
+        client.submit(
+            client.fetch_mods(page=page, per_page=PAGE_SIZE, sort=sort_key, search=search if search else None),
+            on_done=on_page,
+            widget=window
+        )
+
+    def prefetch_next_page(search, sort_key, page, generation):
+        """Fetch the next remote result page in the background."""
+        pending = {"page": page, "done": False, "result": None, "error": None, "waiter": None}
+        state["next_page"] = pending
+
+        def on_next(result, error):
+            if generation != state["generation"]:
+                return
+            pending.update(done=True, result=result, error=error)
+            if pending["waiter"]:
+                pending["waiter"](result, error)
+
+        future = client.submit(
+            client.fetch_mods(page=page, per_page=PAGE_SIZE, sort=sort_key, search=search if search else None),
+            on_done=on_next,
+            widget=window
+        )
+        state["prefetch_futures"].add(future)
+        future.add_done_callback(state["prefetch_futures"].discard)
+
+    def load_local(sort_key, page, append, search=None):
+        category = state["category"]
+        category = None if category == "All Categories" else category
+        offset = (page - 1) * PAGE_SIZE
+        if search:
+            if page == 1:
+                state["search_results"] = searcher.search(search, category=category)
+            total = len(state["search_results"])
+            mods = state["search_results"][offset:offset + PAGE_SIZE]
+        else:
+            mods, total = catalog.query(category=category, sort=sort_key, limit=PAGE_SIZE, offset=offset)
+        state["local"] = True
+        state["total"] = total
+        state["has_more"] = (page - 1) * PAGE_SIZE + len(mods) < total
+        if append:
+            state["all_mods"].extend(mods)
+        else:
+            state["all_mods"] = mods
+        state["loading"] = False
 
-                window.after(0, update_ui)
+        display_mods(mods, append=append)
 
-            except Exception as e:
-                print(f"[Downloader] Error: {e}")
-                window.after(0, lambda: show_msg(f"Error: {e}"))
-                state["loading"] = False
+    def on_catalog_synced(changed, error):
+        """Refresh the first page of browse results once the mirror changes."""
+        if error is not None:
+            print(f"[Downloader] Catalog sync failed: {error}")
+            return
+        try:
+            if not window.winfo_exists():
+                return
+        except Exception:
+            return
+
+        category_combo.config(values=["All Categories"] + (catalog.categories() or CATEGORIES[1:]))
+        if changed and state["source"] == "Gamebanana" and state["page"] == 1 and not state["loading"]:
+            load_mods(search=state["search"], sort=state["sort"], page=1)
+
+    def on_visible_range(first, last):
+        """Drive infinite scroll and look-ahead prefetching from the visible rows."""
+        items = card_list.items
+        if state["has_more"] and not state["loading"] and not state["scroll_load_pending"] \
+                and last >= len(items) - INFINITE_SCROLL_ROWS:
+            # Deferred so the list finishes its refresh before items are appended
+            state["scroll_load_pending"] = True
+            window.after(0, load_next_page)
+        prefetch_ahead(items[first:last + (last - first)])
+
+    def load_next_page():
+        state["scroll_load_pending"] = False
+        if state["has_more"] and not state["loading"]:
+            load_mods(search=state["search"], sort=state["sort"], page=state["page"] + 1, append=True)
+
+    def prefetch_ahead(mods):
+        """
+        Warm file lists and thumbnails for the visible rows and the next screen.
+
+        At most PREFETCH_BUDGET requests are in flight; anything past the
+        budget is picked up on a later scroll. Outstanding work is cancelled
+        when the query changes (see start_query).
+        """
+        generation = state["generation"]
+        budget = PREFETCH_BUDGET - state["prefetch_in_flight"]
+        if budget <= 0:
+            return
 
-        threading.Thread(target=fetch, daemon=True).start()
+        def track(future, cost):
+            state["prefetch_in_flight"] += cost
+            if future is not None:
+                state["prefetch_futures"].add(future)
+                future.add_done_callback(state["prefetch_futures"].discard)
+
+        def release(cost):
+            if generation == state["generation"]:
+                state["prefetch_in_flight"] = max(0, state["prefetch_in_flight"] - cost)
+
+        file_mods = []
+        for mod in mods:
+            if budget <= 0:
+                break
+            if mod["mod_id"] in state["prefetched_ids"]:
+                continue
+            state["prefetched_ids"].add(mod["mod_id"])
+            if mod.get("has_files", True) and not mod.get("files"):
+                file_mods.append(mod)
+                budget -= 1
+            url = mod.get("image_url")
+            if url and budget > 0 and not thumbnail_cached(url):
+                track(load_thumbnail(url, window, lambda image: release(1), retry_on_cancel=False), 1)
+                budget -= 1
+
+        if not file_mods:
+            return
+
+        def on_files(files_by_mod, error):
+            release(len(file_mods))
+            if error is not None or generation != state["generation"]:
+                return
+            for mod in file_mods:
+                files = files_by_mod.get(mod["mod_id"])
+                if files:
+                    mod["files"] = files
+
+        track(client.submit(client.get_files_for_mods([m["mod_id"] for m in file_mods]),
+                            on_done=on_files, widget=window), len(file_mods))
 
     def on_search(event=None):
         if state["source"] == "Gamebanana":
@@ -304,12 +459,31 @@ def open_downloader_window(parent, mods_dir=None, on_download_complete=None):
 
     def on_category_change(event=None):
         """Re-filter displayed mods when category changes."""
-        if state["source"] == "Gamebanana" and state["all_mods"]:
-            state["category"] = category_var.get()
+        if state["source"] != "Gamebanana":
+            return
+        state["category"] = category_var.get()
+        if state["local"]:
+            load_mods(search=state["search"], sort=state["sort"], page=1)
+        elif state["all_mods"]:
             display_mods(state["all_mods"], append=False)
 
+    def on_search_typed(event=None):
+        """Search as you type once the local catalog can answer instantly."""
+        if state["source"] != "Gamebanana" or catalog.count() == 0:
+            return
+        if (search_var.get().strip() or None) == state["search"]:
+            return
+        if state["typing_after_id"]:
+            window.after_cancel(state["typing_after_id"])
+        state["typing_after_id"] = window.after(SEARCH_AS_YOU_TYPE_MS, run_typed_search)
+
+    def run_typed_search():
+        state["typing_after_id"] = None
+        on_search()
+
     search_btn.config(command=on_search)
     search_entry.bind("<Return>", on_search)
+    search_entry.bind("<KeyRelease>", on_search_typed)
     sort_combo.bind("<<ComboboxSelected>>", on_search)
     category_combo.bind("<<ComboboxSelected>>", on_category_change)
 
@@ -326,6 +500,7 @@ def open_downloader_window(parent, mods_dir=None, on_download_complete=None):
         if name == "Gamebanana":
             filter_bar.pack(fill="x", pady=(0, 5))
             load_mods(sort="Newest", page=1)
+            catalog_sync.start(on_done=on_catalog_synced, widget=window)
         else:
             filter_bar.pack_forget()
             show_msg(f"{name} - coming soon")
@@ -1,7 +1,9 @@
+import os
 import requests
 
 SOH_GAME_ID = "16121"
-API_V11_BASE = "https://gamebanana.com/apiv11"
+# Overridable to point Saildeck at a local stand-in (see fake_server.py)
+API_V11_BASE = os.environ.get("SAILDECK_GB_API_BASE", "https://gamebanana.com/apiv11")
 HEADERS = {"User-Agent": "Saildeck/1.0 (Ship of Harkinian Mod Manager)"}
 
 
@@ -30,8 +32,8 @@ def fetch_soh_mods(page=1, per_page=15, sort="new", search=None):
         return [], 0, False
 
 
-def _browse_mods(page, per_page, sort):
-    """Browse mods without search."""
+def _browse_request(page, per_page, sort):
+    """Return (url, params) for a Subfeed browse request."""
     url = f"{API_V11_BASE}/Game/{SOH_GAME_ID}/Subfeed"
     params = {
         "_nPage": str(page),
@@ -39,25 +41,11 @@ def _browse_mods(page, per_page, sort):
         "_sSort": sort,
         "_aFilters[Generic_Category]": "Mod"
     }
+    return url, params
 
-    response = requests.get(url, params=params, headers=HEADERS, timeout=15)
-    response.raise_for_status()
-    data = response.json()
-
-    metadata = data.get("_aMetadata", {})
-    total_count = metadata.get("_nRecordCount", 0)
-    is_complete = metadata.get("_bIsComplete", True)
-
-    mods = []
-    for record in data.get("_aRecords", []):
-        mod = _parse_mod_record(record)
-        mods.append(mod)
 
-    return mods, total_count, not is_complete
-
-
-def _search_mods(search_term, page, per_page):
-    """Search mods by term."""
+def _search_request(search_term, page, per_page):
+    """Return (url, params) for a search request."""
     url = f"{API_V11_BASE}/Util/Search/Results"
     params = {
         "_sSearchString": search_term,
@@ -65,11 +53,11 @@ def _search_mods(search_term, page, per_page):
         "_nPerpage": str(per_page),
         "_idGameRow": SOH_GAME_ID
     }
+    return url, params
 
-    response = requests.get(url, params=params, headers=HEADERS, timeout=15)
-    response.raise_for_status()
-    data = response.json()
 
+def _parse_mods_response(data):
+    """Parse a Subfeed/Search response into (mods, total count, has more)."""
     metadata = data.get("_aMetadata", {})
     total_count = metadata.get("_nRecordCount", 0)
     is_complete = metadata.get("_bIsComplete", True)
@@ -83,6 +71,22 @@ def _search_mods(search_term, page, per_page):
     return mods, total_count, not is_complete
 
 
+def _browse_mods(page, per_page, sort):
+    """Browse mods without search."""
+    url, params = _browse_request(page, per_page, sort)
+    response = requests.get(url, params=params, headers=HEADERS, timeout=15)
+    response.raise_for_status()
+    return _parse_mods_response(response.json())
+
+
+def _search_mods(search_term, page, per_page):
+    """Search mods by term."""
+    url, params = _search_request(search_term, page, per_page)
+    response = requests.get(url, params=params, headers=HEADERS, timeout=15)
+    response.raise_for_status()
+    return _parse_mods_response(response.json())
+
+
 def _parse_mod_record(record):
     """Parse a mod record from the V11 API response."""
     mod_id = record.get("_idRow")
@@ -118,10 +122,33 @@ def _parse_mod_record(record):
         "date_added": record.get("_tsDateAdded"),
         "date_updated": record.get("_tsDateUpdated"),
         "has_files": record.get("_bHasFiles", False),
+        "description": record.get("_sDescription", ""),
         "files": []  # Files loaded on-demand when downloading
     }
 
 
+def _files_url(mod_id):
+    """Return the Files endpoint URL for a mod."""
+    return f"{API_V11_BASE}/Mod/{mod_id}/Files"
+
+
+def _parse_files_response(data):
+    """Parse a Mod/<id>/Files response into file dicts."""
+    files = []
+    if isinstance(data, list):
+        for file_info in data:
+            files.append({
+                "file_id": file_info.get("_idRow"),
+                "filename": file_info.get("_sFile", ""),
+                "filesize": file_info.get("_nFilesize", 0),
+                "download_url": file_info.get("_sDownloadUrl", ""),
+                "download_count": file_info.get("_nDownloadCount", 0),
+                "md5": file_info.get("_sMd5Checksum", ""),
+                "analysis_result": file_info.get("_sAnalysisResult", ""),
+            })
+    return files
+
+
 def get_mod_files(mod_id):
     """Fetch download files for a specific mod.
 
@@ -132,25 +159,11 @@ def get_mod_files(mod_id):
         List of file dicts with download info
     """
     try:
-        url = f"{API_V11_BASE}/Mod/{mod_id}/Files"
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        response = requests.get(_files_url(mod_id), headers=HEADERS, timeout=10)
         response.raise_for_status()
         data = response.json()
 
-        files = []
-        if isinstance(data, list):
-            for file_info in data:
-                files.append({
-                    "file_id": file_info.get("_idRow"),
-                    "filename": file_info.get("_sFile", ""),
-                    "filesize": file_info.get("_nFilesize", 0),
-                    "download_url": file_info.get("_sDownloadUrl", ""),
-                    "download_count": file_info.get("_nDownloadCount", 0),
-                    "md5": file_info.get("_sMd5Checksum", ""),
-                    "analysis_result": file_info.get("_sAnalysisResult", ""),
-                })
-
-        return files
+        return _parse_files_response(data)
 
     except Exception as e:
         print(f"[API] Error fetching files for mod {mod_id}: {e}")
@@ -0,0 +1,245 @@
+"""
+asyncio-based GameBanana client.
+
+One event loop runs on a single background thread for the whole app.
+Page, file-list and image fetches are coroutines on that loop, limited by
+semaphores, so fan-out work (every visible mod's file list, several result
+pages) runs concurrently without an OS thread per request. Results are
+handed back to Tk with widget.after.
+
+aiohttp is used when installed; otherwise requests calls run on a small,
+bounded thread pool owned by the loop.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import requests
+
+from download.gamebanana import api
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+MAX_API_REQUESTS = 4
+MAX_IMAGE_REQUESTS = 6
+FALLBACK_WORKERS = 8  # Thread pool size when aiohttp is missing
+API_TIMEOUT = 15
+IMAGE_TIMEOUT = 5
+
+
+class AsyncRateLimiter:
+    """Token bucket for coroutines: at most `rate` acquisitions per second, bursts up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._last = None
+        self._lock = None
+
+    async def acquire(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()  # Created on the loop that uses it
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if self._last is not None:
+                    self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncGameBananaClient:
+    """GameBanana API client running on a shared asyncio loop thread."""
+
+    def __init__(self, max_api_requests=MAX_API_REQUESTS, max_image_requests=MAX_IMAGE_REQUESTS):
+        self._max_api_requests = max_api_requests
+        self._max_image_requests = max_image_requests
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._session = None
+        self._executor = None
+        self._api_sem = None
+        self._image_sem = None
+
+    # ---- Loop management ----
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is not None:
+                return self._loop
+            self._loop = asyncio.new_event_loop()
+            self._executor = ThreadPoolExecutor(max_workers=FALLBACK_WORKERS, thread_name_prefix="saildeck-gb")
+            self._loop.set_default_executor(self._executor)
+            self._thread = threading.Thread(target=self._run_loop, name="saildeck-gb-loop", daemon=True)
+            self._thread.start()
+            return self._loop
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        # Semaphores must be created on the loop that uses them
+        self._api_sem = asyncio.Semaphore(self._max_api_requests)
+        self._image_sem = asyncio.Semaphore(self._max_image_requests)
+        self._loop.run_forever()
+
+    def submit(self, coro, on_done=None, widget=None):
+        """
+        Schedule a coroutine on the client loop.
+
+        on_done(result, error) is called when it finishes: on the Tk thread
+        via widget.after if widget is given, otherwise on the loop thread.
+        Returns a concurrent.futures.Future (cancel() to abandon the work).
+        """
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+
+        if on_done is not None:
+            def deliver(fut):
+                if fut.cancelled():
+                    return
+                error = fut.exception()
+                result = None if error else fut.result()
+                if widget is None:
+                    on_done(result, error)
+                    return
+                try:
+                    widget.after(0, lambda: on_done(result, error))
+                except Exception:
+                    pass  # Widget destroyed before the result arrived
+
+            future.add_done_callback(deliver)
+        return future
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the client loop and block for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result(timeout)
+
+    # ---- HTTP primitives ----
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(headers=api.HEADERS)
+        return self._session
+
+    async def _get_json(self, url, params=None, timeout=API_TIMEOUT):
+        async with self._api_sem:
+            if HAS_AIOHTTP:
+                session = await self._get_session()
+                async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+
+            def fetch():
+                response = requests.get(url, params=params, headers=api.HEADERS, timeout=timeout)
+                response.raise_for_status()
+                return response.json()
+
+            return await asyncio.get_running_loop().run_in_executor(None, fetch)
+
+    async def _get_bytes(self, url, timeout=IMAGE_TIMEOUT):
+        async with self._image_sem:
+            if HAS_AIOHTTP:
+                session = await self._get_session()
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    response.raise_for_status()
+                    return await response.read()
+
+            def fetch():
+                response = requests.get(url, headers=api.HEADERS, timeout=timeout)
+                response.raise_for_status()
+                return response.content
+
+            return await asyncio.get_running_loop().run_in_executor(None, fetch)
+
+    # ---- API ----
+
+    async def fetch_mods(self, page=1, per_page=15, sort="new", search=None):
+        """Async counterpart of api.fetch_soh_mods; returns (mods, total, has_more)."""
+        if search:
+            url, params = api._search_request(search, page, per_page)
+        else:
+            url, params = api._browse_request(page, per_page, sort)
+        data = await self._get_json(url, params)
+        return api._parse_mods_response(data)
+
+    async def fetch_pages(self, pages, per_page=15, sort="new", search=None):
+        """
+        Fetch several result pages concurrently.
+
+        Returns a list of (mods, total, has_more) in the order of pages;
+        a page that fails yields ([], 0, False).
+        """
+        results = await asyncio.gather(
+            *(self.fetch_mods(page, per_page, sort, search) for page in pages),
+            return_exceptions=True
+        )
+        pages_out = []
+        for page, result in zip(pages, results):
+            if isinstance(result, Exception):
+                print(f"[AsyncAPI] Error fetching page {page}: {result}")
+                pages_out.append(([], 0, False))
+            else:
+                pages_out.append(result)
+        return pages_out
+
+    async def get_mod_files(self, mod_id, limiter=None):
+        """Async counterpart of api.get_mod_files."""
+        if limiter is not None:
+            await limiter.acquire()
+        data = await self._get_json(api._files_url(mod_id), timeout=10)
+        return api._parse_files_response(data)
+
+    async def get_files_for_mods(self, mod_ids, limiter=None):
+        """
+        Fetch file lists for many mods at once; returns {mod_id: files}.
+
+        An AsyncRateLimiter caps the request rate for large batches.
+        """
+        results = await asyncio.gather(*(self.get_mod_files(mod_id, limiter) for mod_id in mod_ids),
+                                       return_exceptions=True)
+        files_by_mod = {}
+        for mod_id, result in zip(mod_ids, results):
+            if isinstance(result, Exception):
+                print(f"[AsyncAPI] Error fetching files for mod {mod_id}: {result}")
+                continue
+            files_by_mod[mod_id] = result
+        return files_by_mod
+
+    async def fetch_image(self, url, size=None):
+        """
+        Download an image and decode it to a PIL image (resized if size).
+
+        Decoding runs on the loop's executor so the loop stays free; the
+        caller creates the ImageTk.PhotoImage on the Tk thread.
+        """
+        data = await self._get_bytes(url)
+
+        def decode():
+            from PIL import Image
+            img = Image.open(BytesIO(data))
+            img.load()
+            return img.resize(size) if size else img
+
+        return await asyncio.get_running_loop().run_in_executor(None, decode)
+
+
+# Global client instance
+_async_client = None
+
+
+def get_async_client():
+    """Get the global AsyncGameBananaClient instance."""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncGameBananaClient()
+    return _async_client
@@ -0,0 +1,254 @@
+"""
+Content-addressed cache of downloaded mods.
+
+Every archive Saildeck installs is kept as its extracted payloads (the
+.otr/.o2r files, which is all an install needs) in a directory named after
+the archive's SHA-256, and indexed by MD5 as well since that is the
+checksum GameBanana publishes. Reinstalling a deleted mod, or installing
+it into another mods folder, is then a hardlink (or a copy across volumes)
+instead of a download.
+
+The cache lives next to the settings file, is bounded by the
+"archive_cache_mb" setting and evicts least recently used archives first.
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+# Import theme_manager from parent package
+try:
+    from theme_manager import get_settings_path, get_theme_manager
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from theme_manager import get_settings_path, get_theme_manager
+
+from download.gamebanana.staging import link_or_copy
+
+CACHE_DIRNAME = "saildeck_cache"
+INDEX_FILENAME = "index.json"
+INDEX_VERSION = 1
+DEFAULT_CACHE_MB = 2048
+
+
+def get_cache_dir():
+    """Return the path of the archive cache (next to the settings file)."""
+    return os.path.join(os.path.dirname(get_settings_path()), CACHE_DIRNAME)
+
+
+def _unique_name(folder, name):
+    """Return name, or name_1, name_2... if it's taken in folder."""
+    base, ext = os.path.splitext(name)
+    candidate, counter = name, 1
+    while os.path.lexists(os.path.join(folder, candidate)):
+        candidate = f"{base}_{counter}{ext}"
+        counter += 1
+    return candidate
+
+
+class ArchiveCache:
+    """LRU cache of extracted archives keyed by SHA-256, with an MD5 index."""
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._entries = {}  # sha256 -> entry
+        self._by_md5 = {}  # md5 -> sha256
+        self._load()
+
+    # ---- Persistence ----
+
+    def _load(self):
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.startswith(".tmp_"):
+                    shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)  # Interrupted store
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"[Cache] Could not read {self.index_path}: {e}")
+            return
+
+        for entry in data.get("archives", {}).values():
+            if os.path.isdir(self._entry_dir(entry["sha256"])):
+                self._index(entry)
+
+    def _save(self):
+        """Write the index atomically; callers hold the lock."""
+        data = {"version": INDEX_VERSION, "archives": self._entries}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".index_", suffix=".tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _index(self, entry):
+        self._entries[entry["sha256"]] = entry
+        if entry.get("md5"):
+            self._by_md5[entry["md5"]] = entry["sha256"]
+
+    def _unindex(self, sha256):
+        entry = self._entries.pop(sha256, None)
+        if entry and self._by_md5.get(entry.get("md5")) == sha256:
+            del self._by_md5[entry["md5"]]
+        return entry
+
+    def _entry_dir(self, sha256):
+        return os.path.join(self.cache_dir, sha256[:2], sha256)
+
+    # ---- Lookups ----
+
+    def lookup(self, md5=None, sha256=None):
+        """Return the cached entry for an archive digest, or None."""
+        with self._lock:
+            if not sha256 and md5:
+                sha256 = self._by_md5.get(md5.lower())
+            entry = self._entries.get((sha256 or "").lower())
+            if entry is None:
+                return None
+            entry_dir = self._entry_dir(entry["sha256"])
+            if not all(os.path.isfile(os.path.join(entry_dir, name)) for name in entry["files"]):
+                # Tampered with outside Saildeck
+                self._unindex(entry["sha256"])
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                self._save()
+                return None
+            return dict(entry)
+
+    def materialize(self, entry, dest_dir):
+        """
+        Link or copy a cached archive's payloads into dest_dir; returns the file names.
+        Files already in dest_dir are kept: clashing payloads get a numeric suffix.
+        """
+        entry_dir = self._entry_dir(entry["sha256"])
+        os.makedirs(dest_dir, exist_ok=True)
+        installed = []
+        for name in entry["files"]:
+            target = name
+            while True:
+                target = _unique_name(dest_dir, target)
+                try:
+                    link_or_copy(os.path.join(entry_dir, name), os.path.join(dest_dir, target))
+                    break
+                except FileExistsError:
+                    continue  # Created between the check and the link; pick another name
+            installed.append(target)
+        with self._lock:
+            current = self._entries.get(entry["sha256"])
+            if current is not None:
+                current["last_used"] = time.time()
+                self._save()
+        return installed
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry["size"] for entry in self._entries.values())
+
+    # ---- Writes ----
+
+    def store(self, digests, source_dir, files, filename=""):
+        """
+        Add an installed archive's payloads (files, relative to source_dir) to the cache.
+
+        digests is the {"md5", "sha256"} dict of the downloaded archive.
+        Never raises; a failure only means the next install downloads again.
+        """
+        if self.max_bytes <= 0 or not digests or not digests.get("sha256"):
+            return False
+        sha256 = digests["sha256"].lower()
+        with self._lock:
+            if sha256 in self._entries:
+                self._entries[sha256]["last_used"] = time.time()
+                self._save()
+                return True
+
+        tmp_dir = os.path.join(self.cache_dir, f".tmp_{uuid.uuid4().hex[:12]}")
+        try:
+            os.makedirs(tmp_dir)
+            size = 0
+            for name in files:
+                src = os.path.join(source_dir, name)
+                link_or_copy(src, os.path.join(tmp_dir, name))
+                size += os.path.getsize(src)
+            if size > self.max_bytes:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                return False
+
+            entry_dir = self._entry_dir(sha256)
+            os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+            with self._lock:
+                if os.path.isdir(entry_dir):
+                    shutil.rmtree(entry_dir, ignore_errors=True)  # Left over from a lost index
+                os.rename(tmp_dir, entry_dir)
+                self._index({
+                    "sha256": sha256,
+                    "md5": (digests.get("md5") or "").lower(),
+                    "filename": filename,
+                    "files": list(files),
+                    "size": size,
+                    "last_used": time.time(),
+                })
+                self._evict()
+                self._save()
+            return True
+        except Exception as e:
+            print(f"[Cache] Could not cache {filename or sha256}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+
+    def _evict(self):
+        """Drop least recently used archives until the cache fits; callers hold the lock."""
+        total = sum(entry["size"] for entry in self._entries.values())
+        for entry in sorted(self._entries.values(), key=lambda e: e["last_used"]):
+            if total <= self.max_bytes:
+                break
+            self._unindex(entry["sha256"])
+            shutil.rmtree(self._entry_dir(entry["sha256"]), ignore_errors=True)
+            total -= entry["size"]
+            print(f"[Cache] Evicted {entry.get('filename') or entry['sha256']}")
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            for sha256 in list(self._entries):
+                self._unindex(sha256)
+                shutil.rmtree(self._entry_dir(sha256), ignore_errors=True)
+            self._save()
+
+
+# Global archive cache instance
+_archive_cache = None
+_archive_cache_lock = threading.Lock()
+
+
+def get_archive_cache():
+    """Get the global ArchiveCache, sized from the archive_cache_mb setting."""
+    global _archive_cache
+    max_bytes = get_theme_manager().get_setting("behavior", "archive_cache_mb", DEFAULT_CACHE_MB) * 1024 * 1024
+    with _archive_cache_lock:
+        if _archive_cache is None:
+            _archive_cache = ArchiveCache(get_cache_dir(), max_bytes)
+        elif _archive_cache.max_bytes != max_bytes:
+            _archive_cache.set_max_bytes(max_bytes)
+        return _archive_cache
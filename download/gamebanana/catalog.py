@@ -0,0 +1,406 @@
+"""
+Local mirror of the Ship of Harkinian mod catalog.
+
+Mod records are kept in a SQLite database next to the settings file so the
+mod browser can browse, sort and filter by category locally instead of
+paging through the live Subfeed. A background sync fills the mirror:
+
+  - full sync: page 1 gives the record count, the remaining pages are
+    fetched in parallel on the async client; mods that are gone upstream
+    are dropped afterwards
+  - incremental sync: pages sorted by _tsDateUpdated are fetched until a
+    record older than the last seen update is reached
+"""
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from download.gamebanana.async_client import get_async_client
+
+# Import theme_manager and scheduler from parent package
+try:
+    from theme_manager import get_settings_path
+    from scheduler import get_scheduler, BACKGROUND
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from theme_manager import get_settings_path
+    from scheduler import get_scheduler, BACKGROUND
+
+CATALOG_FILENAME = "saildeck_catalog.db"
+SYNC_PAGE_SIZE = 50
+SYNC_MIN_INTERVAL_SECONDS = 10 * 60  # Don't re-sync more often than this
+FULL_SYNC_INTERVAL_SECONDS = 7 * 24 * 60 * 60  # Periodic full sync picks up deletions
+MAX_INCREMENTAL_PAGES = 20  # Beyond this a full sync is cheaper
+
+# Sort keys accepted by CatalogStore.query
+SORT_COLUMNS = {
+    "new": "date_added DESC",
+    "updated": "date_updated DESC",
+    "likes": "like_count DESC",
+    "views": "view_count DESC",
+}
+
+_COLUMNS = ("mod_id", "name", "author", "image_url", "category", "view_count", "like_count",
+            "url", "date_added", "date_updated", "has_files", "description")
+
+
+def get_catalog_path():
+    """Return the path of the catalog database (next to the settings file)."""
+    return os.path.join(os.path.dirname(get_settings_path()), CATALOG_FILENAME)
+
+
+class CatalogStore:
+    """SQLite-backed store of parsed mod records (see api._parse_mod_record)."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.version = 0  # Bumped on every write; lets search indexes know when to rebuild
+        self.has_fts = False
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS mods (
+                    mod_id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    author TEXT,
+                    image_url TEXT,
+                    category TEXT,
+                    view_count INTEGER DEFAULT 0,
+                    like_count INTEGER DEFAULT 0,
+                    url TEXT,
+                    date_added INTEGER,
+                    date_updated INTEGER,
+                    has_files INTEGER DEFAULT 0,
+                    description TEXT,
+                    synced_at REAL
+                )
+            """)
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(mods)")}
+            if "description" not in columns:
+                self._conn.execute("ALTER TABLE mods ADD COLUMN description TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_mods_category ON mods (category)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_mods_added ON mods (date_added)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_mods_updated ON mods (date_updated)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._create_fts()
+
+    def _create_fts(self):
+        """Create the full-text index over mods, kept in step by triggers (needs FTS5)."""
+        try:
+            with self._lock, self._conn:
+                exists = self._conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'mods_fts'"
+                ).fetchone()
+                self._conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS mods_fts USING fts5(
+                        name, author, category, description,
+                        content='mods', content_rowid='mod_id',
+                        tokenize='unicode61 remove_diacritics 2'
+                    )
+                """)
+                self._conn.executescript("""
+                    CREATE TRIGGER IF NOT EXISTS mods_fts_insert AFTER INSERT ON mods BEGIN
+                        INSERT INTO mods_fts (rowid, name, author, category, description)
+                        VALUES (new.mod_id, new.name, new.author, new.category, new.description);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS mods_fts_delete AFTER DELETE ON mods BEGIN
+                        INSERT INTO mods_fts (mods_fts, rowid, name, author, category, description)
+                        VALUES ('delete', old.mod_id, old.name, old.author, old.category, old.description);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS mods_fts_update AFTER UPDATE ON mods BEGIN
+                        INSERT INTO mods_fts (mods_fts, rowid, name, author, category, description)
+                        VALUES ('delete', old.mod_id, old.name, old.author, old.category, old.description);
+                        INSERT INTO mods_fts (rowid, name, author, category, description)
+                        VALUES (new.mod_id, new.name, new.author, new.category, new.description);
+                    END;
+                """)
+                if not exists:
+                    # Index rows mirrored before the FTS table existed
+                    self._conn.execute("INSERT INTO mods_fts (mods_fts) VALUES ('rebuild')")
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            print(f"[Catalog] Full-text search unavailable, using fuzzy search only: {e}")
+
+    # ---- Metadata ----
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    # ---- Writes ----
+
+    def upsert_mods(self, mods, synced_at=None):
+        """Insert or update parsed mod records in one transaction."""
+        if not mods:
+            return 0
+        synced_at = synced_at or time.time()
+        rows = [
+            (m["mod_id"], m.get("name") or f"Mod #{m['mod_id']}", m.get("author"), m.get("image_url"),
+             m.get("category"), m.get("view_count") or 0, m.get("like_count") or 0, m.get("url"),
+             m.get("date_added"), m.get("date_updated"), 1 if m.get("has_files") else 0,
+             m.get("description") or "", synced_at)
+            for m in mods if m.get("mod_id") is not None
+        ]
+        # Counts against the background I/O limit (approximate row size) when run as a sync job
+        get_scheduler().throttle(sum(len(repr(row)) for row in rows))
+        # Upsert rather than REPLACE so the update trigger keeps the FTS index in step
+        updates = ", ".join(f"{column} = excluded.{column}" for column in _COLUMNS[1:] + ("synced_at",))
+        with self._lock, self._conn:
+            self._conn.executemany(f"""
+                INSERT INTO mods ({", ".join(_COLUMNS)}, synced_at)
+                VALUES ({", ".join("?" * (len(_COLUMNS) + 1))})
+                ON CONFLICT (mod_id) DO UPDATE SET {updates}
+            """, rows)
+            self.version += 1
+        return len(rows)
+
+    def delete_missing(self, synced_before):
+        """Drop mods not seen by a full sync that started at synced_before."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM mods WHERE synced_at < ?", (synced_before,))
+            self.version += 1
+        return cursor.rowcount
+
+    # ---- Reads ----
+
+    def count(self, category=None):
+        sql, params = "SELECT COUNT(*) FROM mods", []
+        if category:
+            sql += " WHERE category = ? COLLATE NOCASE"
+            params.append(category)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def categories(self):
+        """Return category names present in the catalog, most populated first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT category FROM mods WHERE category IS NOT NULL "
+                "GROUP BY category ORDER BY COUNT(*) DESC"
+            ).fetchall()
+        return [row["category"] for row in rows]
+
+    def latest_update(self):
+        with self._lock:
+            value = self._conn.execute("SELECT MAX(date_updated) FROM mods").fetchone()[0]
+        return value or 0
+
+    def stored_updates(self, mod_ids):
+        """Return {mod_id: date_updated} for the given mods that are already stored."""
+        mod_ids = list(mod_ids)
+        if not mod_ids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT mod_id, date_updated FROM mods WHERE mod_id IN ({', '.join('?' * len(mod_ids))})",
+                mod_ids,
+            ).fetchall()
+        return dict(rows)
+
+    def query(self, category=None, sort="new", limit=50, offset=0):
+        """
+        Return (mods, total) for one page of the local catalog.
+
+        mods are dicts in the same shape as api._parse_mod_record.
+        """
+        where, params = "", []
+        if category:
+            where = " WHERE category = ? COLLATE NOCASE"
+            params.append(category)
+        order = SORT_COLUMNS.get(sort, SORT_COLUMNS["new"])
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM mods{where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM mods{where} ORDER BY {order}, mod_id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return [_row_to_mod(row) for row in rows], total
+
+    def get_mods(self, mod_ids):
+        """Return mods for mod_ids, in the given order (unknown ids are skipped)."""
+        if not mod_ids:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM mods WHERE mod_id IN ({', '.join('?' * len(mod_ids))})",
+                list(mod_ids)
+            ).fetchall()
+        by_id = {row["mod_id"]: _row_to_mod(row) for row in rows}
+        return [by_id[mod_id] for mod_id in mod_ids if mod_id in by_id]
+
+    def search_rows(self):
+        """Return (mod_id, name, author, category, like_count, view_count) for every mod."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT mod_id, name, author, category, like_count, view_count FROM mods"
+            ).fetchall()
+
+    def fts_search(self, match, limit=200):
+        """Return mod ids matching an FTS5 query, best match first."""
+        if not self.has_fts:
+            return []
+        with self._lock:
+            try:
+                rows = self._conn.execute(
+                    "SELECT rowid FROM mods_fts WHERE mods_fts MATCH ? "
+                    "ORDER BY bm25(mods_fts, 10.0, 5.0, 2.0, 1.0) LIMIT ?",
+                    (match, limit)
+                ).fetchall()
+            except sqlite3.OperationalError:
+                return []  # Malformed query
+        return [row[0] for row in rows]
+
+    def get_mod(self, mod_id):
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM mods WHERE mod_id = ?",
+                                     (mod_id,)).fetchone()
+        return _row_to_mod(row) if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _row_to_mod(row):
+    mod = dict(row)
+    mod["has_files"] = bool(mod["has_files"])
+    mod["files"] = []  # Files loaded on-demand when downloading
+    return mod
+
+
+def _in_background(fn, *args):
+    """Await fn(*args) on the scheduler's background pool, behind any interactive work."""
+    return asyncio.wrap_future(get_scheduler().submit(fn, *args, priority=BACKGROUND,
+                                                      name=f"catalog {fn.__name__}").future)
+
+
+class CatalogSync:
+    """
+    Keeps a CatalogStore in step with GameBanana using the async client.
+
+    Database writes (and the FTS indexing they trigger) run as background
+    jobs on the scheduler, so a sync never competes with interactive work.
+    """
+
+    def __init__(self, store, client=None):
+        self.store = store
+        self.client = client or get_async_client()
+        self._future = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_syncing(self):
+        return self._future is not None and not self._future.done()
+
+    @property
+    def pending(self):
+        """The running sync's future, or None."""
+        return self._future if self.is_syncing else None
+
+    def needs_sync(self):
+        last_sync = float(self.store.get_meta("last_sync", 0))
+        return time.time() - last_sync >= SYNC_MIN_INTERVAL_SECONDS
+
+    def start(self, on_done=None, widget=None, force=False):
+        """
+        Start a background sync unless one is running or the last one is fresh.
+
+        on_done(changed, error) is delivered like AsyncGameBananaClient.submit.
+        Returns the future, or None if no sync was started.
+        """
+        with self._lock:
+            if self.is_syncing or not (force or self.needs_sync()):
+                return None
+            self._future = self.client.submit(self.sync(), on_done=on_done, widget=widget)
+            return self._future
+
+    async def sync(self):
+        """Run a full or incremental sync; returns the number of records written."""
+        last_full = float(self.store.get_meta("last_full_sync", 0))
+        if time.time() - last_full >= FULL_SYNC_INTERVAL_SECONDS:
+            changed = await self._full_sync()
+        else:
+            changed = await self._incremental_sync()
+            if changed is None:
+                changed = await self._full_sync()
+        await _in_background(self.store.set_meta, "last_sync", time.time())
+        return changed
+
+    async def _full_sync(self):
+        started = time.time()
+        print("[Catalog] Full sync started")
+        first_mods, total, has_more = await self.client.fetch_mods(page=1, per_page=SYNC_PAGE_SIZE, sort="updated")
+        changed = await _in_background(self.store.upsert_mods, first_mods, started)
+
+        complete = True
+        if has_more:
+            pages = list(range(2, math.ceil(total / SYNC_PAGE_SIZE) + 1))
+            results = await self.client.fetch_pages(pages, per_page=SYNC_PAGE_SIZE, sort="updated")
+            for page, (mods, _, _) in zip(pages, results):
+                if not mods:
+                    complete = False  # Failed page; keep what we have
+                    continue
+                changed += await _in_background(self.store.upsert_mods, mods, started)
+
+        if complete:
+            removed = await _in_background(self.store.delete_missing, started)
+            if removed:
+                print(f"[Catalog] Removed {removed} mod(s) no longer on GameBanana")
+            await _in_background(self.store.set_meta, "last_full_sync", started)
+        print(f"[Catalog] Full sync stored {changed} of {total} mods in {time.time() - started:.1f}s")
+        return changed
+
+    async def _incremental_sync(self):
+        """Fetch mods updated since the newest local record; None if a full sync is needed."""
+        watermark = await _in_background(self.store.latest_update)
+        if not watermark:
+            return None
+
+        changed = 0
+        for page in range(1, MAX_INCREMENTAL_PAGES + 1):
+            mods, _, has_more = await self.client.fetch_mods(page=page, per_page=SYNC_PAGE_SIZE, sort="updated")
+            # >= so mods updated in the same second as the watermark aren't missed; rows
+            # already stored with that date are skipped so they don't count as changes
+            fresh = [m for m in mods if (m.get("date_updated") or 0) >= watermark]
+            stored = await _in_background(self.store.stored_updates, [m.get("mod_id") for m in fresh])
+            updated = [m for m in fresh if stored.get(m.get("mod_id"), -1) != m.get("date_updated")]
+            changed += await _in_background(self.store.upsert_mods, updated)
+            if len(fresh) < len(mods) or not has_more:
+                if changed:
+                    print(f"[Catalog] Incremental sync updated {changed} mod(s)")
+                return changed
+        return None
+
+
+# Global catalog instances
+_catalog_store = None
+_catalog_sync = None
+
+
+def get_catalog():
+    """Get the global CatalogStore instance."""
+    global _catalog_store
+    if _catalog_store is None:
+        _catalog_store = CatalogStore(get_catalog_path())
+    return _catalog_store
+
+
+def get_catalog_sync():
+    """Get the global CatalogSync instance."""
+    global _catalog_sync
+    if _catalog_sync is None:
+        _catalog_sync = CatalogSync(get_catalog())
+    return _catalog_sync
@@ -0,0 +1,378 @@
+"""
+Download manager for GameBanana mods.
+
+Queues mod installs behind a global concurrency limit and per-host limits,
+and publishes a single progress model that any window can subscribe to.
+"""
+import heapq
+import itertools
+import os
+import threading
+from urllib.parse import urlparse
+
+from download.gamebanana.gb_download import download_and_install_mod, DownloadCancelled
+from download.gamebanana.api import get_mod_files
+
+# Import theme_manager and scheduler from parent package
+try:
+    from theme_manager import get_theme_manager
+    from scheduler import get_scheduler, CancelToken, Cancelled, USER_INITIATED
+    from tracing import span, add_counter
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from theme_manager import get_theme_manager
+    from scheduler import get_scheduler, CancelToken, Cancelled, USER_INITIATED
+    from tracing import span, add_counter
+
+# Priorities (lower runs first, FIFO within the same priority)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+MAX_CONCURRENT_DOWNLOADS = 3
+MAX_DOWNLOADS_PER_HOST = 2
+
+# Task states
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_PAUSED = "paused"
+STATE_COMPLETED = "completed"
+STATE_FAILED = "failed"
+STATE_CANCELLED = "cancelled"
+
+FINISHED_STATES = {STATE_COMPLETED, STATE_FAILED, STATE_CANCELLED}
+
+
+class DownloadTask:
+    """A single queued mod install."""
+
+    def __init__(self, task_id, mod, mods_dir, file_info=None, priority=PRIORITY_NORMAL, replace_folder=None,
+                 target_dir=None):
+        self.task_id = task_id
+        self.mod = mod
+        self.mods_dir = mods_dir
+        self.file_info = file_info
+        self.replace_folder = replace_folder  # Installed folder an update replaces
+        self.target_dir = target_dir  # Folder a modpack import collects the payloads in
+        self.priority = priority
+        self.state = STATE_QUEUED
+        self.downloaded = 0
+        self.total = 0
+        self.status = "Queued"
+        self.message = ""
+        self.result = None  # Install record (folder, files, md5, sha256) on success
+        self.host = _host_of(file_info)
+        # Set while the task may run; cleared to pause it
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self.token = CancelToken()  # Shared with the scheduler job running the task
+
+    def snapshot(self):
+        """Return a plain dict describing the task for subscribers."""
+        return {
+            "task_id": self.task_id,
+            "mod_id": self.mod.get("mod_id"),
+            "name": self.mod.get("name", "Unknown Mod"),
+            "state": self.state,
+            "downloaded": self.downloaded,
+            "total": self.total,
+            "status": self.status,
+            "message": self.message,
+            "result": self.result,
+        }
+
+    def wait_if_paused(self):
+        """Block while paused; raise DownloadCancelled if cancelled."""
+        while not self._resume_event.wait(0.25):
+            if self.token.cancelled:
+                break
+        if self.token.cancelled:
+            raise DownloadCancelled()
+
+
+def _host_of(file_info):
+    """Return the host of a file's download URL, or None if unknown."""
+    if not file_info or not file_info.get("download_url"):
+        return None
+    return urlparse(file_info["download_url"]).netloc.lower() or None
+
+
+class DownloadManager:
+    """
+    Central queue for mod downloads.
+
+    Tasks run on worker threads, at most max_concurrent at once and at most
+    max_per_host against the same mirror. Subscribers receive task snapshots
+    (dicts) from worker threads and must marshal to Tk themselves.
+    """
+
+    def __init__(self, max_concurrent=MAX_CONCURRENT_DOWNLOADS, max_per_host=MAX_DOWNLOADS_PER_HOST):
+        self.max_concurrent = max_concurrent
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._queue = []  # heap of (priority, seq, task_id)
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._tasks = {}
+        self._running = set()
+        self._host_counts = {}
+        self._subscribers = []
+
+    # ---- Subscriptions ----
+
+    def subscribe(self, callback, task_id=None):
+        """Register callback(snapshot); restrict to one task with task_id."""
+        with self._lock:
+            self._subscribers.append((callback, task_id))
+
+    def unsubscribe(self, callback):
+        """Remove every registration of callback."""
+        with self._lock:
+            self._subscribers = [(cb, tid) for cb, tid in self._subscribers if cb is not callback]
+
+    def _publish(self, task):
+        snapshot = task.snapshot()
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback, task_id in subscribers:
+            if task_id is not None and task_id != task.task_id:
+                continue
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"[DownloadManager] Subscriber error: {e}")
+
+    # ---- Queue control ----
+
+    def enqueue(self, mod, mods_dir, file_info=None, priority=PRIORITY_NORMAL, replace_folder=None,
+                target_dir=None):
+        """
+        Queue a mod for download and install.
+
+        If file_info is None, the mod's first file is looked up when the task
+        starts. With replace_folder, the install replaces that existing mod
+        folder (updates); with target_dir, the payloads are only put in that
+        folder (modpack imports). Returns the task id.
+        """
+        with self._lock:
+            task_id = next(self._ids)
+            task = DownloadTask(task_id, mod, mods_dir, file_info, priority, replace_folder, target_dir)
+            self._tasks[task_id] = task
+            heapq.heappush(self._queue, (priority, next(self._seq), task_id))
+        self._publish(task)
+        self._schedule()
+        return task_id
+
+    def pause(self, task_id):
+        """Pause a queued or running task."""
+        task = self._tasks.get(task_id)
+        if not task or task.state in FINISHED_STATES or task.state == STATE_PAUSED:
+            return False
+        task._resume_event.clear()
+        task.state = STATE_PAUSED
+        task.status = "Paused"
+        self._publish(task)
+        return True
+
+    def resume(self, task_id):
+        """Resume a paused task."""
+        task = self._tasks.get(task_id)
+        if not task or task.state != STATE_PAUSED:
+            return False
+        with self._lock:
+            task.state = STATE_RUNNING if task_id in self._running else STATE_QUEUED
+        task.status = "Downloading..." if task.state == STATE_RUNNING else "Queued"
+        task._resume_event.set()
+        self._publish(task)
+        self._schedule()
+        return True
+
+    def cancel(self, task_id):
+        """Cancel a task; running tasks stop at the next chunk."""
+        task = self._tasks.get(task_id)
+        if not task or task.state in FINISHED_STATES:
+            return False
+        task.token.cancel()
+        task._resume_event.set()
+        with self._lock:
+            running = task_id in self._running
+            if not running:
+                task.state = STATE_CANCELLED
+                task.status = "Cancelled"
+        if not running:
+            self._publish(task)
+            self._schedule()
+        return True
+
+    def cancel_all(self):
+        """Cancel every unfinished task."""
+        for task_id in list(self._tasks):
+            self.cancel(task_id)
+
+    def get_task(self, task_id):
+        """Return a snapshot of a task, or None."""
+        task = self._tasks.get(task_id)
+        return task.snapshot() if task else None
+
+    def get_tasks(self):
+        """Return snapshots of all known tasks in queue order."""
+        return [task.snapshot() for _, task in sorted(self._tasks.items())]
+
+    def find_task(self, mod_id):
+        """Return a snapshot of the newest task for mod_id, or None."""
+        with self._lock:
+            tasks = [task for task in self._tasks.values() if task.mod.get("mod_id") == mod_id]
+        if not tasks:
+            return None
+        return max(tasks, key=lambda task: task.task_id).snapshot()
+
+    # ---- Scheduling ----
+
+    def _schedule(self):
+        """Start as many queued tasks as the limits allow."""
+        to_start = []
+        with self._lock:
+            deferred = []
+            while self._queue and len(self._running) < self.max_concurrent:
+                entry = heapq.heappop(self._queue)
+                task = self._tasks[entry[2]]
+                if task.state == STATE_CANCELLED:
+                    continue
+                if task.state == STATE_PAUSED:
+                    deferred.append(entry)
+                    continue
+                if task.host and self._host_counts.get(task.host, 0) >= self.max_per_host:
+                    deferred.append(entry)
+                    continue
+                if task.host:
+                    self._host_counts[task.host] = self._host_counts.get(task.host, 0) + 1
+                self._running.add(task.task_id)
+                task.state = STATE_RUNNING
+                to_start.append(task)
+            for entry in deferred:
+                heapq.heappush(self._queue, entry)
+
+        for task in to_start:
+            job = get_scheduler().submit(self._run, task, priority=USER_INITIATED,
+                                         name=f"download {task.mod.get('name', task.task_id)}", token=task.token)
+            job.future.add_done_callback(lambda future, task=task: self._on_job_done(future, task))
+
+    def _on_job_done(self, future, task):
+        """Finish a task whose job was cancelled before _run started (e.g. on exit)."""
+        if future.cancelled() or isinstance(future.exception(), Cancelled):
+            self._release(task)
+            self._finish(task, False, "Cancelled")
+
+    def _release(self, task):
+        with self._lock:
+            self._running.discard(task.task_id)
+            if task.host:
+                count = self._host_counts.get(task.host, 0) - 1
+                if count > 0:
+                    self._host_counts[task.host] = count
+                else:
+                    self._host_counts.pop(task.host, None)
+
+    def _run(self, task):
+        try:
+            if task.file_info is None and not self._resolve_file(task):
+                return
+            self._install(task)
+        finally:
+            self._schedule()
+
+    def _resolve_file(self, task):
+        """Look up the file to download; requeue if its host is now full."""
+        task.status = "Fetching file info..."
+        self._publish(task)
+
+        files = task.mod.get("files") or get_mod_files(task.mod.get("mod_id"))
+        if not files:
+            self._release(task)
+            self._finish(task, False, "No downloadable files found")
+            return False
+
+        task.file_info = files[0]
+        host = _host_of(task.file_info)
+        with self._lock:
+            self._running.discard(task.task_id)
+            task.host = host
+            if host and self._host_counts.get(host, 0) >= self.max_per_host:
+                task.state = STATE_QUEUED
+                task.status = "Queued"
+                heapq.heappush(self._queue, (task.priority, next(self._seq), task.task_id))
+                requeued = True
+            else:
+                if host:
+                    self._host_counts[host] = self._host_counts.get(host, 0) + 1
+                self._running.add(task.task_id)
+                requeued = False
+        if requeued:
+            self._publish(task)
+            return False
+        return True
+
+    def _install(self, task):
+        def on_progress(downloaded, total):
+            task.wait_if_paused()
+            task.downloaded = downloaded
+            task.total = total
+            self._publish(task)
+
+        def on_status(msg):
+            task.status = msg
+            self._publish(task)
+
+        def on_installed(record):
+            task.result = record
+
+        callbacks = {
+            "on_progress": on_progress,
+            "on_status": on_status,
+            "on_installed": on_installed,
+        }
+
+        segments = get_theme_manager().get_setting("behavior", "download_segments", 4)
+
+        add_counter("downloads.active", 1)
+        try:
+            task.wait_if_paused()
+            with span("install_mod", cat="download", mod_id=task.mod.get("mod_id")):
+                success, msg = download_and_install_mod(task.mod, task.file_info, task.mods_dir, callbacks,
+                                                        segments=segments, replace_folder=task.replace_folder,
+                                                        target_dir=task.target_dir)
+        except DownloadCancelled:
+            success, msg = False, "Cancelled"
+        except Exception as e:
+            success, msg = False, str(e)
+        finally:
+            add_counter("downloads.active", -1)
+            self._release(task)
+
+        self._finish(task, success, msg)
+
+    def _finish(self, task, success, msg):
+        if task.token.cancelled and not success:
+            task.state = STATE_CANCELLED
+            task.status = "Cancelled"
+        elif success:
+            task.state = STATE_COMPLETED
+            task.status = msg
+        else:
+            task.state = STATE_FAILED
+            task.status = f"Failed: {msg}"
+        task.message = msg
+        self._publish(task)
+
+
+# Global download manager instance
+_download_manager = None
+
+
+def get_download_manager():
+    """Get the global DownloadManager instance."""
+    global _download_manager
+    if _download_manager is None:
+        _download_manager = DownloadManager()
+    return _download_manager
@@ -0,0 +1,438 @@
+"""
+Local GameBanana stand-in server.
+
+Serves Subfeed / Search / Files responses in the V11 API shape, thumbnails
+and synthetic mod payloads (zip, 7z, raw .o2r), so the download pipeline
+and the downloader window can be exercised and benchmarked offline.
+
+Latency, bandwidth and error injection (HTTP 503s and connections dropped
+mid-transfer) are configurable. Payload downloads honour Range/If-Range.
+
+Run standalone:
+    python -m download.gamebanana.fake_server --port 8765 --latency 0.05
+
+then point Saildeck at it:
+    SAILDECK_GB_API_BASE=http://127.0.0.1:8765/apiv11 python main.py
+"""
+import argparse
+import hashlib
+import io
+import json
+import random
+import re
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+try:
+    import py7zr
+    HAS_7Z = True
+except ImportError:
+    HAS_7Z = False
+
+SOH_GAME_ID = "16121"
+CATEGORIES = ["Models", "Textures", "Other/Misc", "Samples", "Music", "Audio", "Skins", "Animations", "Voices"]
+NAME_WORDS = ["Link", "Zelda", "Hyrule", "Epona", "Navi", "Ganon", "Kokiri", "Goron", "Zora", "Sheik",
+              "Retro", "HD", "Remastered", "Classic", "Dark", "Ocarina", "Sword", "Shield", "Tunic", "Mask"]
+WRITE_CHUNK = 64 * 1024
+
+
+def _png_bytes(width, height, rgb):
+    """Build a solid-colour PNG without any imaging library."""
+    def chunk(tag, data):
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+    row = b"\x00" + bytes(rgb) * width
+    raw = row * height
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw))
+            + chunk(b"IEND", b""))
+
+
+class FakeCatalog:
+    """Deterministic set of mods, files and payloads."""
+
+    def __init__(self, mod_count=120, payload_size=2 * 1024 * 1024, seed=0):
+        self.rng = random.Random(seed)
+        self.payload_size = payload_size
+        self.mods = []
+        self.files = {}  # mod_id -> list of file dicts (V11 shape)
+        self.payloads = {}  # file_id -> bytes
+        self._payload_lock = threading.Lock()
+
+        now = int(time.time())
+        for i in range(mod_count):
+            mod_id = 400000 + i
+            name = " ".join(self.rng.sample(NAME_WORDS, 3))
+            self.mods.append({
+                "_idRow": mod_id,
+                "_sModelName": "Mod",
+                "_sName": f"{name} #{i}",
+                "_sDescription": f"{name} for Ship of Harkinian.",
+                "_sProfileUrl": f"https://gamebanana.com/mods/{mod_id}",
+                "_tsDateAdded": now - (mod_count - i) * 86400,
+                "_tsDateUpdated": now - (mod_count - i) * 43200,
+                "_bHasFiles": True,
+                "_nViewCount": self.rng.randint(0, 50000),
+                "_nLikeCount": self.rng.randint(0, 500),
+                "_aSubmitter": {"_sName": f"modder{self.rng.randint(1, 40)}"},
+                "_aRootCategory": {"_sName": self.rng.choice(CATEGORIES)},
+                "_aPreviewMedia": {"_aImages": [{"_sBaseUrl": "", "_sFile220": f"{mod_id}.png"}]},
+            })
+            kind = ("zip", "7z", "o2r")[i % 3]
+            if kind == "7z" and not HAS_7Z:
+                kind = "zip"
+            file_id = 900000 + i
+            self.files[mod_id] = [{
+                "_idRow": file_id,
+                "_sFile": f"{name.lower().replace(' ', '_')}_{i}.{kind}",
+                "_nFilesize": 0,  # Filled in when the payload is built
+                "_sDownloadUrl": "",
+                "_nDownloadCount": self.rng.randint(0, 5000),
+                "_sMd5Checksum": "",
+                "_sAnalysisResult": "ok",
+                "_kind": kind,
+            }]
+        # Newest first, like the live Subfeed
+        self.mods.reverse()
+
+        # Build every payload up front so requests only pay for simulated latency and bandwidth
+        all_files = [file_info for files in self.files.values() for file_info in files]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(self.payload, all_files))
+
+    def payload(self, file_info):
+        """Return the payload bytes for a file (rebuilt if a test changed its id)."""
+        file_id = file_info["_idRow"]
+        with self._payload_lock:
+            data = self.payloads.get(file_id)
+        if data is not None:
+            return data
+        data = self._build_payload(file_info)
+        md5 = hashlib.md5(data).hexdigest()
+        with self._payload_lock:
+            if file_id not in self.payloads:
+                self.payloads[file_id] = data
+                file_info["_nFilesize"] = len(data)
+                file_info["_sMd5Checksum"] = md5
+            return self.payloads[file_id]
+
+    def _build_payload(self, file_info):
+        rng = random.Random(file_info["_idRow"])
+        mod_bytes = rng.randbytes(self.payload_size)
+        base = file_info["_sFile"].rsplit(".", 1)[0]
+        kind = file_info["_kind"]
+
+        if kind == "o2r":
+            return mod_bytes
+
+        extras = {
+            "README.txt": b"Synthetic Saildeck benchmark mod.\n" * 20,
+            "preview/preview.png": _png_bytes(64, 64, (rng.randrange(256), 80, 160)),
+        }
+        buf = io.BytesIO()
+        if kind == "7z":
+            # Stored like the zips: LZMA on random bytes only costs build time
+            with py7zr.SevenZipFile(buf, "w", filters=[{"id": py7zr.FILTER_COPY}]) as archive:
+                for name, data in extras.items():
+                    archive.writestr(data, name)
+                archive.writestr(mod_bytes, f"{base}/{base}.o2r")
+        else:
+            with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+                for name, data in extras.items():
+                    zf.writestr(name, data)
+                zf.writestr(f"{base}/{base}.o2r", mod_bytes)
+        return buf.getvalue()
+
+    def find_file(self, file_id):
+        for files in self.files.values():
+            for file_info in files:
+                if file_info["_idRow"] == file_id:
+                    return file_info
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, delayed ACKs add ~40 ms per response
+    disable_nagle_algorithm = True
+    server_version = "FakeGameBanana/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # ---- Helpers ----
+
+    def _inject_faults(self):
+        """Apply latency and maybe answer 503. Returns True if handled."""
+        srv = self.server
+        if srv.latency:
+            time.sleep(srv.latency)
+        with srv.stats_lock:
+            srv.stats["requests"] += 1
+        if srv.error_rate and srv.rng.random() < srv.error_rate:
+            with srv.stats_lock:
+                srv.stats["errors"] += 1
+            self._send_json({"_sErrorCode": "ERR_INJECTED"}, status=503)
+            return True
+        return False
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_bytes(self, data, content_type, status=200, extra_headers=None, droppable=False):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+
+        srv = self.server
+        drop_at = None
+        if droppable and srv.drop_rate and len(data) > WRITE_CHUNK and srv.rng.random() < srv.drop_rate:
+            drop_at = srv.rng.randrange(WRITE_CHUNK, len(data))
+
+        view = memoryview(data)
+        sent = 0
+        started = time.monotonic()
+        while sent < len(data):
+            end = min(sent + WRITE_CHUNK, len(data))
+            if drop_at is not None and end > drop_at:
+                self.wfile.write(view[sent:drop_at])
+                with srv.stats_lock:
+                    srv.stats["drops"] += 1
+                self.close_connection = True
+                return
+            self.wfile.write(view[sent:end])
+            sent = end
+            if srv.bandwidth:
+                # Sleep until we're back under the configured rate
+                ahead = sent / srv.bandwidth - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+        with srv.stats_lock:
+            srv.stats["bytes_sent"] += len(data)
+
+    def _page_params(self, query):
+        page = max(1, int(query.get("_nPage", ["1"])[0]))
+        per_page = max(1, min(50, int(query.get("_nPerpage", ["15"])[0])))
+        return page, per_page
+
+    def _send_page(self, records, page, per_page):
+        start = (page - 1) * per_page
+        page_records = records[start:start + per_page]
+        self._send_json({
+            "_aMetadata": {
+                "_nRecordCount": len(records),
+                "_nPerpage": per_page,
+                "_bIsComplete": start + per_page >= len(records),
+            },
+            "_aRecords": [self._public_record(r) for r in page_records],
+        })
+
+    def _public_record(self, record):
+        record = json.loads(json.dumps(record))
+        images = record["_aPreviewMedia"]["_aImages"]
+        images[0]["_sBaseUrl"] = f"{self.server.base_url}/img"
+        return record
+
+    # ---- Routes ----
+
+    def do_GET(self):
+        if self._inject_faults():
+            return
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path
+        catalog = self.server.catalog
+
+        if path == f"/apiv11/Game/{SOH_GAME_ID}/Subfeed":
+            page, per_page = self._page_params(query)
+            records = list(catalog.mods)
+            if query.get("_sSort", ["new"])[0] == "updated":
+                records.sort(key=lambda r: r["_tsDateUpdated"], reverse=True)
+            self._send_page(records, page, per_page)
+            return
+
+        if path == "/apiv11/Util/Search/Results":
+            page, per_page = self._page_params(query)
+            term = query.get("_sSearchString", [""])[0].lower()
+            records = [r for r in catalog.mods if term in r["_sName"].lower()]
+            self._send_page(records, page, per_page)
+            return
+
+        match = re.fullmatch(r"/apiv11/Mod/(\d+)/Files", path)
+        if match:
+            files = catalog.files.get(int(match.group(1)))
+            if files is None:
+                self._send_json({"_sErrorCode": "ERR_NOT_FOUND"}, status=404)
+                return
+            result = []
+            for file_info in files:
+                catalog.payload(file_info)  # Prebuilt; rebuilt only if a test changed the file id
+                public = {k: v for k, v in file_info.items() if k != "_kind"}
+                public["_sDownloadUrl"] = f"{self.server.base_url}/dl/{file_info['_idRow']}"
+                result.append(public)
+            self._send_json(result)
+            return
+
+        match = re.fullmatch(r"/img/(\d+)\.png", path)
+        if match:
+            shade = int(match.group(1)) % 200
+            self._send_bytes(_png_bytes(220, 124, (shade, 120, 200 - shade)), "image/png")
+            return
+
+        match = re.fullmatch(r"/dl/(\d+)", path)
+        if match:
+            file_info = catalog.find_file(int(match.group(1)))
+            if file_info is None:
+                self._send_json({"_sErrorCode": "ERR_NOT_FOUND"}, status=404)
+                return
+            self._send_payload(file_info)
+            return
+
+        self._send_json({"_sErrorCode": "ERR_NOT_FOUND"}, status=404)
+
+    def _send_payload(self, file_info):
+        data = self.server.catalog.payload(file_info)
+        etag = f'"{file_info["_sMd5Checksum"]}"'
+        headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", range_header or "")
+        if match and (if_range is None or if_range == etag):
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(data) - 1
+            end = min(end, len(data) - 1)
+            if start >= len(data) or start > end:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(data)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+            self._send_bytes(data[start:end + 1], "application/octet-stream", status=206,
+                             extra_headers=headers, droppable=True)
+            return
+
+        self._send_bytes(data, "application/octet-stream", extra_headers=headers, droppable=True)
+
+
+class FakeGameBananaServer:
+    """
+    Threaded local server standing in for gamebanana.com.
+
+    Args:
+        host, port: Bind address (port 0 picks a free port)
+        mod_count: Number of mods in the catalog
+        payload_size: Size of each synthetic .o2r payload in bytes
+        latency: Seconds added before every response
+        bandwidth: Per-connection cap in bytes/s (None for unlimited)
+        error_rate: Probability of answering 503
+        drop_rate: Probability of dropping a download mid-transfer
+        seed: Seed for the catalog and fault injection
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, mod_count=120, payload_size=2 * 1024 * 1024,
+                 latency=0.0, bandwidth=None, error_rate=0.0, drop_rate=0.0, seed=0, verbose=False):
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.catalog = FakeCatalog(mod_count, payload_size, seed)
+        self._httpd.latency = latency
+        self._httpd.bandwidth = bandwidth
+        self._httpd.error_rate = error_rate
+        self._httpd.drop_rate = drop_rate
+        self._httpd.rng = random.Random(seed + 1)
+        self._httpd.verbose = verbose
+        self._httpd.stats = {"requests": 0, "errors": 0, "drops": 0, "bytes_sent": 0}
+        self._httpd.stats_lock = threading.Lock()
+        self._httpd.base_url = f"http://{host}:{self._httpd.server_port}"
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return self._httpd.base_url
+
+    @property
+    def api_base(self):
+        """Value for API_V11_BASE / SAILDECK_GB_API_BASE."""
+        return f"{self._httpd.base_url}/apiv11"
+
+    @property
+    def catalog(self):
+        return self._httpd.catalog
+
+    @property
+    def stats(self):
+        with self._httpd.stats_lock:
+            return dict(self._httpd.stats)
+
+    def start(self):
+        """Serve on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local GameBanana stand-in for Saildeck")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--mods", type=int, default=120, help="number of mods in the catalog")
+    parser.add_argument("--payload-mb", type=float, default=2.0, help="size of each mod payload")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0.0, help="per-connection cap in MB/s (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 503 response")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="probability of dropping a download")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = FakeGameBananaServer(
+        host=args.host,
+        port=args.port,
+        mod_count=args.mods,
+        payload_size=int(args.payload_mb * 1024 * 1024),
+        latency=args.latency,
+        bandwidth=int(args.bandwidth_mbps * 1024 * 1024) or None,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        verbose=args.verbose,
+    )
+    print(f"[FakeGB] Serving {args.mods} mods at {server.base_url}")
+    print(f"[FakeGB] Run Saildeck with SAILDECK_GB_API_BASE={server.api_base}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
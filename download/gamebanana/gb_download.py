@@ -1,11 +1,31 @@
 import os
 import re
 import shutil
-import tempfile
 import zipfile
 import hashlib
+import json
+import threading
+import time
 import uuid
 import requests
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+from download.gamebanana.staging import (
+    get_download_path,
+    create_install_dir,
+    commit_install_dir,
+    replace_install_dir,
+)
+from download.gamebanana.manifest import get_install_manifest
+from download.gamebanana.cache import get_archive_cache
+
+# Import tracing from parent package
+try:
+    from tracing import traced
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from tracing import traced
 
 # Try to import py7zr for 7z support
 try:
@@ -18,6 +38,13 @@ MOD_EXTENSIONS = {".otr", ".o2r"}
 HEADERS = {"User-Agent": "Saildeck/1.0 (Ship of Harkinian Mod Manager)"}
 
 
+class DownloadCancelled(Exception):
+    """Raised from a progress callback to abort a download."""
+
+    def __init__(self, message="Download cancelled"):
+        super().__init__(message)
+
+
 def sanitize_folder_name(name):
     """Create a safe folder name from mod name."""
     # Remove or replace unsafe characters
@@ -29,28 +56,420 @@ def sanitize_folder_name(name):
     return name or "mod"
 
 
-def download_file(url, dest_path, progress_callback=None):
-    """Download a file with progress callback."""
+PARTIAL_SUFFIX = ".part"
+PARTIAL_META_SUFFIX = ".part.json"
+MAX_DOWNLOAD_RETRIES = 5
+RETRY_BACKOFF_SECONDS = 2
+DOWNLOAD_BUFFER_SIZE = 256 * 1024
+
+
+class _StreamHasher:
+    """MD5 + SHA-256 computed from the same bytes that are written to disk."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.md5 = hashlib.md5()
+        self.sha256 = hashlib.sha256()
+        self.hashed = 0
+
+    def update(self, data):
+        self.md5.update(data)
+        self.sha256.update(data)
+        self.hashed += len(data)
+
+    def catch_up(self, path, size):
+        """Bring the digests in line with the first `size` bytes of path.
+
+        Only needed when resuming a partial left by an earlier run; bytes
+        streamed in this run are hashed as they are written.
+        """
+        if self.hashed > size:
+            self.reset()
+        if self.hashed == size:
+            return
+        buf = bytearray(DOWNLOAD_BUFFER_SIZE)
+        view = memoryview(buf)
+        with open(path, "rb") as f:
+            f.seek(self.hashed)
+            while self.hashed < size:
+                n = f.readinto(view[:min(len(buf), size - self.hashed)])
+                if not n:
+                    break
+                self.update(view[:n])
+
+    def hexdigests(self):
+        return {"md5": self.md5.hexdigest(), "sha256": self.sha256.hexdigest()}
+
+
+def _load_partial_meta(meta_path, url):
+    """Load validators saved for a partial download, or {} if unusable."""
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if meta.get("url") != url:
+        return {}
+    return meta
+
+
+def _save_partial_meta(meta_path, meta):
+    try:
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    except OSError as e:
+        print(f"[Download] Could not save resume info: {e}")
+
+
+def _discard_partial(part_path, meta_path):
+    for path in (part_path, meta_path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+SEGMENTED_MIN_SIZE = 32 * 1024 * 1024
+SEGMENT_META_SAVE_BYTES = 4 * 1024 * 1024  # Save segment offsets this often while downloading
+
+
+class _SegmentsUnsupported(Exception):
+    """The server does not honour byte ranges; use a single stream."""
+
+
+def _probe_ranges(url):
+    """Ask for the first byte to learn whether byte ranges are supported.
+
+    Returns (total_size, validators dict) or raises _SegmentsUnsupported.
+    """
+    headers = dict(HEADERS)
+    headers["Range"] = "bytes=0-0"
+    response = requests.get(url, stream=True, headers=headers, timeout=30, allow_redirects=True)
     try:
-        response = requests.get(url, stream=True, headers=HEADERS, timeout=120, allow_redirects=True)
         response.raise_for_status()
+        match = re.match(r"bytes 0-0/(\d+)", response.headers.get("content-range", ""))
+        if response.status_code != 206 or not match:
+            raise _SegmentsUnsupported()
+        validators = {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+        }
+        if not (validators["etag"] or validators["last_modified"]):
+            # Without a validator, segments could mix two versions of the file
+            raise _SegmentsUnsupported()
+        return int(match.group(1)), validators
+    finally:
+        response.close()
+
+
+def _write_at(fd, handle, data, offset):
+    """Positional write; falls back to seek+write where pwrite is missing."""
+    if hasattr(os, "pwrite"):
+        while data:
+            written = os.pwrite(fd, data, offset)
+            data = data[written:]
+            offset += written
+    else:
+        handle.seek(offset)
+        while data:
+            written = handle.write(data)
+            data = data[written:]
+
+
+def _download_segmented(url, part_path, meta_path, meta, segments, progress_callback, expected_size):
+    """Fetch a file as parallel byte-range segments into a preallocated file.
+
+    Segment progress is saved in the partial's metadata every
+    SEGMENT_META_SAVE_BYTES and when the segments finish, so an interrupted
+    segmented download resumes each segment close to where it stopped.
+    Connection drops and 5xx answers are retried per segment. Returns the
+    total size on success, False on failure. Raises _SegmentsUnsupported
+    when ranges are not available.
+    """
+    if not meta.get("segments"):
+        total_size, validators = _probe_ranges(url)
+        if expected_size and total_size != expected_size:
+            print(f"[Download] Size mismatch for {url}: server reports {total_size}, expected {expected_size}")
+            return False
+        if total_size < SEGMENTED_MIN_SIZE:
+            raise _SegmentsUnsupported()
+        step = -(-total_size // segments)
+        meta.clear()
+        meta.update(validators)
+        meta["url"] = url
+        meta["total"] = total_size
+        # [next offset to fetch, last byte] per segment
+        meta["segments"] = [[start, min(start + step, total_size) - 1]
+                            for start in range(0, total_size, step)]
+        with open(part_path, "wb") as f:
+            f.truncate(total_size)  # Preallocate
+        _save_partial_meta(meta_path, meta)
+
+    total_size = meta["total"]
+    validator = meta.get("etag") or meta.get("last_modified")
+    seg_state = meta["segments"]
+    lock = threading.Lock()
+    abort = threading.Event()
+    errors = []
+    progress = {"done": total_size - sum(end - pos + 1 for pos, end in seg_state), "unsaved": 0}
+
+    @traced("download_segment", cat="download")
+    def fetch(index):
+        buf = memoryview(bytearray(DOWNLOAD_BUFFER_SIZE))
+        attempt = 0
+        # Unbuffered, so saved offsets never run ahead of the data on disk
+        with open(part_path, "r+b", buffering=0) as handle:
+            fd = handle.fileno()
+            while seg_state[index][0] <= seg_state[index][1] and not abort.is_set():
+                pos, end = seg_state[index]
+                headers = dict(HEADERS)
+                headers["Range"] = f"bytes={pos}-{end}"
+                headers["If-Range"] = validator
+                try:
+                    response = requests.get(url, stream=True, headers=headers, timeout=120, allow_redirects=True)
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        # File changed upstream or ranges were dropped
+                        response.close()
+                        raise _SegmentsUnsupported()
+                    raw = response.raw
+                    raw.decode_content = True
+                    while pos <= end and not abort.is_set():
+                        n = raw.readinto(buf[:min(len(buf), end - pos + 1)])
+                        if not n:
+                            break
+                        _write_at(fd, handle, buf[:n], pos)
+                        pos += n
+                        with lock:
+                            seg_state[index][0] = pos
+                            progress["done"] += n
+                            progress["unsaved"] += n
+                            if progress["unsaved"] >= SEGMENT_META_SAVE_BYTES:
+                                # Keep the offsets usable if the app exits mid-download
+                                _save_partial_meta(meta_path, meta)
+                                progress["unsaved"] = 0
+                            if progress_callback:
+                                progress_callback(progress["done"], total_size)
+                    response.close()
+                    if pos <= end and not abort.is_set():
+                        raise requests.exceptions.ChunkedEncodingError(
+                            f"Segment {index} closed at {pos}/{end + 1}"
+                        )
+                except (requests.exceptions.ConnectionError,
+                        requests.exceptions.Timeout,
+                        requests.exceptions.ChunkedEncodingError,
+                        ProtocolError,
+                        ReadTimeoutError) as e:
+                    attempt += 1
+                    if attempt > MAX_DOWNLOAD_RETRIES:
+                        errors.append(e)
+                        abort.set()
+                        return
+                    time.sleep(RETRY_BACKOFF_SECONDS * attempt)
+                except requests.exceptions.HTTPError as e:
+                    status = e.response.status_code if e.response is not None else 0
+                    attempt += 1
+                    if status < 500 or attempt > MAX_DOWNLOAD_RETRIES:
+                        errors.append(e)
+                        abort.set()
+                        return
+                    time.sleep(RETRY_BACKOFF_SECONDS * attempt)
+                except BaseException as e:
+                    errors.append(e)
+                    abort.set()
+                    return
+
+    threads = [threading.Thread(target=fetch, args=(i,), name=f"saildeck-segment-{i}", daemon=True)
+               for i in range(len(seg_state))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Persist per-segment progress so a later call can resume
+    _save_partial_meta(meta_path, meta)
+
+    for error in errors:
+        if isinstance(error, (DownloadCancelled, _SegmentsUnsupported)):
+            raise error
+    if errors:
+        print(f"[Download] Segmented download of {url} failed: {errors[0]}")
+        return False
+    return total_size
+
+
+@traced(cat="download")
+def download_file(url, dest_path, progress_callback=None, expected_size=None, segments=1):
+    """Download a file with progress callback, resuming interrupted transfers.
+
+    Data is streamed to dest_path + ".part". If the connection drops, the
+    transfer is retried with a Range request validated by If-Range, so only
+    the missing bytes are fetched. The partial is kept on failure so a later
+    call can resume it, and renamed to dest_path once complete.
+
+    MD5 and SHA-256 are computed incrementally from the streamed chunks.
+    Returns a dict of hex digests ({"md5": ..., "sha256": ...}) on success,
+    False on failure.
 
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
+    With segments > 1, files of at least SEGMENTED_MIN_SIZE are fetched as
+    that many parallel byte ranges written in place into a preallocated
+    file; MD5/SHA-256 are then computed in one pass at the end. Servers
+    without range support fall back to a single stream.
 
-        with open(dest_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
+    The callback may raise DownloadCancelled to abort the transfer. With
+    segments it is called from several threads, one call at a time.
+    """
+    part_path = dest_path + PARTIAL_SUFFIX
+    meta_path = dest_path + PARTIAL_META_SUFFIX
+    meta = _load_partial_meta(meta_path, url)
+    if not meta and os.path.exists(part_path):
+        # No validators to resume against: start over
+        _discard_partial(part_path, meta_path)
+
+    # A single-stream partial in progress is resumed as a single stream
+    resuming_stream = bool(meta) and not meta.get("segments")
+    large_enough = not expected_size or expected_size >= SEGMENTED_MIN_SIZE
+    if segments > 1 and large_enough and not resuming_stream:
+        try:
+            total_size = _download_segmented(url, part_path, meta_path, meta, segments,
+                                             progress_callback, expected_size)
+        except DownloadCancelled:
+            raise
+        except (_SegmentsUnsupported, requests.exceptions.RequestException) as e:
+            if not isinstance(e, _SegmentsUnsupported):
+                print(f"[Download] Range probe failed ({e}), using a single stream")
+            total_size = None
+        if total_size is False:
+            return False
+        if total_size:
+            hasher = _StreamHasher()
+            hasher.catch_up(part_path, total_size)
+            os.replace(part_path, dest_path)
+            _discard_partial(part_path, meta_path)
+            return hasher.hexdigests()
+
+    if meta.get("segments"):
+        # Segmented partial that can no longer be continued
+        _discard_partial(part_path, meta_path)
+        meta = {}
+
+    hasher = _StreamHasher()
+    view = memoryview(bytearray(DOWNLOAD_BUFFER_SIZE))
+
+    attempt = 0
+    while True:
+        try:
+            downloaded = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            headers = dict(HEADERS)
+            validator = meta.get("etag") or meta.get("last_modified")
+            if downloaded and validator:
+                headers["Range"] = f"bytes={downloaded}-"
+                headers["If-Range"] = validator
+
+            response = requests.get(url, stream=True, headers=headers, timeout=120, allow_redirects=True)
+
+            if response.status_code == 416 and downloaded:
+                response.close()
+                if downloaded == meta.get("total"):
+                    break  # Nothing left to fetch
+                # Partial no longer matches the remote file: start over
+                _discard_partial(part_path, meta_path)
+                meta = {}
+                attempt += 1
+                continue
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                content_range = response.headers.get("content-range", "")
+                match = re.match(r"bytes (\d+)-\d+/(\d+|\*)", content_range)
+                if not match or int(match.group(1)) != downloaded:
+                    raise requests.exceptions.ContentDecodingError(
+                        f"Unexpected Content-Range: {content_range!r}"
+                    )
+                total_size = int(match.group(2)) if match.group(2) != "*" else 0
+                mode = "ab"
+            else:
+                # Full response (no range support or the file changed upstream)
+                downloaded = 0
+                total_size = int(response.headers.get('content-length', 0))
+                mode = "wb"
+                meta = {
+                    "url": url,
+                    "etag": response.headers.get("etag"),
+                    "last_modified": response.headers.get("last-modified"),
+                    "total": total_size or expected_size,
+                }
+                _save_partial_meta(meta_path, meta)
+
+            total_size = total_size or meta.get("total") or 0
+
+            if mode == "wb":
+                hasher.reset()
+            else:
+                hasher.catch_up(part_path, downloaded)
+
+            # Read straight into one reusable buffer; the same bytes feed the
+            # file and the hashes, so no second pass over the file is needed.
+            raw = response.raw
+            raw.decode_content = True
+            with open(part_path, mode) as f:
+                while True:
+                    n = raw.readinto(view)
+                    if not n:
+                        break
+                    chunk = view[:n]
                     f.write(chunk)
-                    downloaded += len(chunk)
+                    hasher.update(chunk)
+                    downloaded += n
                     if progress_callback:
                         progress_callback(downloaded, total_size)
 
-        return True
-    except Exception as e:
-        print(f"[Download] Error downloading {url}: {e}")
+            if total_size and downloaded < total_size:
+                raise requests.exceptions.ChunkedEncodingError(
+                    f"Connection closed at {downloaded}/{total_size} bytes"
+                )
+            break
+
+        except DownloadCancelled:
+            raise
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.ContentDecodingError,
+                ProtocolError,
+                ReadTimeoutError) as e:
+            attempt += 1
+            if attempt > MAX_DOWNLOAD_RETRIES:
+                print(f"[Download] Giving up on {url} after {attempt} attempts: {e}")
+                return False
+            print(f"[Download] Connection lost ({e}), resuming (attempt {attempt}/{MAX_DOWNLOAD_RETRIES})...")
+            time.sleep(RETRY_BACKOFF_SECONDS * attempt)
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 0
+            attempt += 1
+            if status < 500 or attempt > MAX_DOWNLOAD_RETRIES:
+                print(f"[Download] Error downloading {url}: {e}")
+                return False
+            print(f"[Download] Server error ({status}), retrying (attempt {attempt}/{MAX_DOWNLOAD_RETRIES})...")
+            time.sleep(RETRY_BACKOFF_SECONDS * attempt)
+        except Exception as e:
+            print(f"[Download] Error downloading {url}: {e}")
+            return False
+
+    final_size = os.path.getsize(part_path)
+    expected_size = expected_size or meta.get("total")
+    if expected_size and final_size != expected_size:
+        print(f"[Download] Size mismatch for {url}: got {final_size}, expected {expected_size}")
+        _discard_partial(part_path, meta_path)
         return False
 
+    hasher.catch_up(part_path, final_size)
+    os.replace(part_path, dest_path)
+    _discard_partial(part_path, meta_path)
+    return hasher.hexdigests()
+
 
 def _is_path_safe(member_path, dest_dir):
     """Check if extracted path stays within destination directory (prevents Zip Slip)."""
@@ -61,87 +480,127 @@ def _is_path_safe(member_path, dest_dir):
     return abs_member.startswith(abs_dest + os.sep) or abs_member == abs_dest
 
 
-def _safe_extract_zip(archive_path, dest_dir):
-    """Safely extract a ZIP file, validating paths to prevent Zip Slip attacks."""
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+
+
+def _is_mod_member(name):
+    """Return True if an archive member name is a mod payload (.otr/.o2r)."""
+    return os.path.splitext(name.lower())[1] in MOD_EXTENSIONS
+
+
+def _unique_dest_path(folder, filename):
+    """Return a path in folder for filename, suffixing _1, _2... on clashes."""
+    dest_path = os.path.join(folder, filename)
+    if os.path.exists(dest_path):
+        base, ext = os.path.splitext(filename)
+        counter = 1
+        while os.path.exists(dest_path):
+            dest_path = os.path.join(folder, f"{base}_{counter}{ext}")
+            counter += 1
+    return dest_path
+
+
+def _payload_filename(member_name, dest_dir):
+    """Return the flat file name a payload member installs as.
+
+    Rejects the archive if the member path would escape the destination.
+    """
+    if not _is_path_safe(member_name, dest_dir):
+        raise ValueError(f"Attempted path traversal in archive: {member_name}")
+    filename = os.path.basename(member_name.replace("\\", "/"))
+    if not filename or filename in (".", ".."):
+        raise ValueError(f"Invalid member name in archive: {member_name}")
+    return filename
+
+
+def _extract_zip_payloads(archive_path, dest_dir):
+    """Stream .otr/.o2r members of a ZIP straight into dest_dir."""
+    installed = []
     with zipfile.ZipFile(archive_path, 'r') as zf:
+        # Validate the whole index before writing anything
         for member in zf.namelist():
             if not _is_path_safe(member, dest_dir):
                 raise ValueError(f"Attempted path traversal in archive: {member}")
-        zf.extractall(dest_dir)
+
+        payloads = [info for info in zf.infolist() if not info.is_dir() and _is_mod_member(info.filename)]
+        for info in payloads:
+            dest_path = _unique_dest_path(dest_dir, _payload_filename(info.filename, dest_dir))
+            with zf.open(info) as src, open(dest_path, 'xb') as dst:
+                shutil.copyfileobj(src, dst, EXTRACT_BUFFER_SIZE)
+            installed.append(os.path.basename(dest_path))
+    return installed
 
 
-def _safe_extract_7z(archive_path, dest_dir):
-    """Safely extract a 7z file, validating paths to prevent path traversal attacks."""
+def _extract_7z_payloads(archive_path, dest_dir):
+    """Extract only the .otr/.o2r members of a 7z archive into dest_dir."""
     with py7zr.SevenZipFile(archive_path, 'r') as archive:
-        for name in archive.getnames():
+        names = archive.getnames()
+        for name in names:
             if not _is_path_safe(name, dest_dir):
                 raise ValueError(f"Attempted path traversal in archive: {name}")
-        archive.extractall(dest_dir)
 
+        targets = [name for name in names if _is_mod_member(name)]
+        if not targets:
+            return []
 
-def extract_archive(archive_path, dest_dir):
-    """Extract an archive (ZIP or 7z) with path traversal protection."""
+        # py7zr keeps member paths, so extract the selected members into a
+        # scratch folder inside dest_dir and flatten them with renames.
+        scratch_dir = os.path.join(dest_dir, f".extract_{uuid.uuid4().hex[:8]}")
+        os.makedirs(scratch_dir)
+        try:
+            archive.extract(path=scratch_dir, targets=targets)
+            installed = []
+            for name in targets:
+                src_path = os.path.join(scratch_dir, name)
+                if not os.path.isfile(src_path):
+                    continue
+                dest_path = _unique_dest_path(dest_dir, _payload_filename(name, dest_dir))
+                os.replace(src_path, dest_path)
+                installed.append(os.path.basename(dest_path))
+            return installed
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+@traced(cat="extract")
+def extract_mod_payloads(archive_path, dest_dir):
+    """Extract only the mod files (.otr/.o2r) of an archive into dest_dir.
+
+    Reads the archive index, skips readmes, previews and other assets, and
+    writes each payload directly to its final flat location in dest_dir
+    (duplicate names get a numeric suffix). Every member path is checked
+    for traversal before anything is written.
+
+    Returns the list of installed file names, or None if the archive could
+    not be read.
+    """
     filename_lower = archive_path.lower()
+    os.makedirs(dest_dir, exist_ok=True)
 
     try:
-        if filename_lower.endswith('.zip'):
-            _safe_extract_zip(archive_path, dest_dir)
-            return True
-
-        elif filename_lower.endswith('.7z') and HAS_7Z:
-            _safe_extract_7z(archive_path, dest_dir)
-            return True
-
-        elif filename_lower.endswith('.7z') and not HAS_7Z:
-            print("[Download] Cannot extract 7z - py7zr not installed")
-            return False
+        if filename_lower.endswith('.7z'):
+            if not HAS_7Z:
+                print("[Download] Cannot extract 7z - py7zr not installed")
+                return None
+            return _extract_7z_payloads(archive_path, dest_dir)
 
-        elif filename_lower.endswith('.rar'):
+        if filename_lower.endswith('.rar'):
             print("[Download] RAR files not supported")
-            return False
+            return None
 
-        else:
-            # Try as zip
-            try:
-                _safe_extract_zip(archive_path, dest_dir)
-                return True
-            except zipfile.BadZipFile:
-                print(f"[Download] Unknown archive format: {archive_path}")
-                return False
+        # ZIP, or unknown extension tried as ZIP
+        try:
+            return _extract_zip_payloads(archive_path, dest_dir)
+        except zipfile.BadZipFile:
+            print(f"[Download] Unknown archive format: {archive_path}")
+            return None
 
     except ValueError as e:
         print(f"[Download] Security error: {e}")
-        return False
+        return None
     except Exception as e:
         print(f"[Download] Error extracting {archive_path}: {e}")
-        return False
-
-
-def find_mod_files(directory):
-    """Find all mod files (.otr/.o2r) recursively."""
-    mod_files = []
-    for root, dirs, files in os.walk(directory):
-        for filename in files:
-            ext = os.path.splitext(filename.lower())[1]
-            if ext in MOD_EXTENSIONS:
-                mod_files.append(os.path.join(root, filename))
-    return mod_files
-
-
-def verify_md5(file_path, expected_md5):
-    """Verify file MD5 checksum.
-
-    Returns True if checksum matches or if no expected checksum provided.
-    """
-    if not expected_md5:
-        return True  # No checksum to verify
-
-    md5 = hashlib.md5()
-    with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
-            md5.update(chunk)
-
-    return md5.hexdigest().lower() == expected_md5.lower()
+        return None
 
 
 def is_file_safe(file_info):
@@ -164,20 +623,62 @@ def is_file_safe(file_info):
     return True, None
 
 
-def download_and_install_mod(mod, file_info, mods_dir, callbacks=None):
+def _install_record(mod_folder, files, digests):
+    """Describe a finished install for callers that keep a local manifest."""
+    return {
+        "folder": mod_folder,
+        "files": list(files),
+        "md5": digests["md5"],
+        "sha256": digests["sha256"],
+    }
+
+
+def _record_install(mods_dir, mod, file_info, record):
+    """Add a finished install to the mods folder's manifest (never fails the install)."""
+    try:
+        get_install_manifest(mods_dir).record_install(mod, file_info, record)
+    except Exception as e:
+        print(f"[GB Download] Could not update install manifest: {e}")
+
+
+def _commit(install_dir, mod_folder, replace_folder, manifest):
+    if install_dir == mod_folder:
+        return mod_folder  # Staged for a caller (target_dir), nothing to commit
+    if replace_folder:
+        # Files the old install put there; everything else in the folder is the user's
+        entry = manifest.find_by_folder(replace_folder)
+        return replace_install_dir(install_dir, replace_folder, entry["files"] if entry else None)
+    return commit_install_dir(install_dir, mod_folder)
+
+
+def download_and_install_mod(mod, file_info, mods_dir, callbacks=None, segments=1, replace_folder=None,
+                             target_dir=None):
     """Download and install a mod into its own subfolder.
 
+    Installs are recorded in the mods folder's install manifest; a file
+    that is already installed for the mod is not downloaded again, and a
+    file found in the archive cache (by MD5) is installed from there.
+
     Args:
         mod: Mod dict with name and other details
         file_info: File info dict with download_url, filename
         mods_dir: Base mods directory
-        callbacks: Dict with on_progress, on_status, on_complete, on_error
+        callbacks: Dict with on_progress, on_status, on_complete, on_error,
+            on_installed (receives the folder, installed file names and the
+            archive's md5/sha256 digests)
+        segments: Parallel connections for large files (1 = single stream)
+        replace_folder: Existing mod folder to swap the new install into
+            (updates); by default a new folder named after the mod is used
+        target_dir: Put the payloads in this existing folder instead of
+            installing them (modpack imports); nothing is recorded in the
+            install manifest, but the archive is still cached
     """
     callbacks = callbacks or {}
     on_progress = callbacks.get('on_progress', lambda d, t: None)
     on_status = callbacks.get('on_status', lambda m: None)
     on_complete = callbacks.get('on_complete', lambda s, m: None)
     on_error = callbacks.get('on_error', lambda m: None)
+    on_installed = callbacks.get('on_installed', lambda r: None)
 
     download_url = file_info.get('download_url')
     filename = file_info.get('filename', 'mod_download')
@@ -197,55 +698,92 @@ def download_and_install_mod(mod, file_info, mods_dir, callbacks=None):
         on_complete(False, reason)
         return False, reason
 
-    # Create mod subfolder with atomic naming to avoid race conditions
+    # Same file already installed for this mod: nothing to download
+    manifest = get_install_manifest(mods_dir)
+    installed_entry = None if target_dir else manifest.find_identical(mod.get('mod_id'), file_info)
+    if installed_entry:
+        on_installed(_install_record(manifest.folder_path(installed_entry), installed_entry["files"],
+                                     {"md5": installed_entry["md5"], "sha256": installed_entry["sha256"]}))
+        msg = f"Already installed: {installed_entry['folder']}"
+        on_status(msg)
+        on_complete(True, msg)
+        return True, msg
+
+    # Target mod subfolder; the final name is settled atomically on commit
     folder_name = sanitize_folder_name(mod_name)
-    mod_folder = os.path.join(mods_dir, folder_name)
+    mod_folder = target_dir or os.path.join(mods_dir, folder_name)
 
-    # Handle existing folder atomically using unique naming to avoid race conditions
-    if os.path.exists(mod_folder):
-        unique_suffix = str(uuid.uuid4())[:8]
-        mod_folder = f"{mod_folder}_{unique_suffix}"
+    # Downloads and installs are staged on the same volume as the mods folder
+    # so installing is a rename, never a copy
+    archive_path = get_download_path(mods_dir, file_info)
+    install_dir = None
+    archive_cache = get_archive_cache()
 
-    temp_dir = tempfile.mkdtemp(prefix="saildeck_")
+    def finish(mod_folder, installed, digests, source=""):
+        folder_name = os.path.basename(mod_folder)
+        if len(installed) == 1:
+            msg = f"Installed{source}: {folder_name}/{installed[0]}"
+        else:
+            msg = f"Installed {len(installed)} files{source} to {folder_name}/"
+        record = _install_record(mod_folder, installed, digests)
+        if not target_dir:
+            _record_install(mods_dir, mod, file_info, record)
+        on_installed(record)
+        on_status(msg)
+        on_complete(True, msg)
+        return True, msg
 
     try:
+        # Installed before, here or in another mods folder: reuse the cached payloads
+        cached = archive_cache.lookup(md5=expected_md5) if expected_md5 else None
+        if cached:
+            on_status("Installing from cache...")
+            install_dir = target_dir or create_install_dir(mods_dir)
+            installed = archive_cache.materialize(cached, install_dir)
+            mod_folder = _commit(install_dir, mod_folder, replace_folder, manifest)
+            install_dir = None
+            return finish(mod_folder, installed, {"md5": cached["md5"], "sha256": cached["sha256"]},
+                          source=" from cache")
+
         # Download
         on_status("Downloading...")
-        archive_path = os.path.join(temp_dir, filename)
+        expected_size = file_info.get('filesize') or None
 
-        if not download_file(download_url, archive_path, on_progress):
-            msg = "Download failed"
+        digests = download_file(download_url, archive_path, on_progress,
+                                expected_size=expected_size, segments=segments)
+        if not digests:
+            msg = "Download failed (partial download kept, retry to resume)"
             on_error(msg)
             on_complete(False, msg)
             return False, msg
 
-        # Verify MD5 checksum if provided
+        # Verify MD5 checksum if provided (hashed while downloading)
         if expected_md5:
-            on_status("Verifying checksum...")
-            if not verify_md5(archive_path, expected_md5):
+            if digests["md5"].lower() != expected_md5.lower():
+                os.remove(archive_path)
                 msg = "Checksum verification failed - file may be corrupted"
                 on_error(msg)
                 on_complete(False, msg)
                 return False, msg
 
+        install_dir = target_dir or create_install_dir(mods_dir)
+
         # Check if it's already a mod file (not an archive)
         ext = os.path.splitext(filename.lower())[1]
         if ext in MOD_EXTENSIONS:
             on_status("Installing...")
-            os.makedirs(mod_folder, exist_ok=True)
-            dest_path = os.path.join(mod_folder, filename)
-            shutil.move(archive_path, dest_path)
-            msg = f"Installed: {folder_name}/{filename}"
-            on_status(msg)
-            on_complete(True, msg)
-            return True, msg
-
-        # Extract archive
+            os.replace(archive_path, os.path.join(install_dir, filename))
+            # Cached from the staged folder: an update may still rename payloads to their disabled form
+            archive_cache.store(digests, install_dir, [filename], filename)
+            mod_folder = _commit(install_dir, mod_folder, replace_folder, manifest)
+            install_dir = None
+            return finish(mod_folder, [filename], digests)
+
+        # Extract only the mod payloads into the staged install folder
         on_status("Extracting...")
-        extract_dir = os.path.join(temp_dir, "extracted")
-        os.makedirs(extract_dir, exist_ok=True)
+        installed = extract_mod_payloads(archive_path, install_dir)
 
-        if not extract_archive(archive_path, extract_dir):
+        if installed is None:
             # Check if it's a RAR file
             if filename.lower().endswith('.rar'):
                 msg = "RAR files not supported. Please extract manually."
@@ -255,45 +793,17 @@ def download_and_install_mod(mod, file_info, mods_dir, callbacks=None):
             on_complete(False, msg)
             return False, msg
 
-        # Find mod files
-        on_status("Finding mod files...")
-        mod_files = find_mod_files(extract_dir)
-
-        if not mod_files:
+        if not installed:
             msg = "No .otr/.o2r files found in archive"
             on_error(msg)
             on_complete(False, msg)
             return False, msg
 
-        # Create mod folder and move files
         on_status("Installing...")
-        os.makedirs(mod_folder, exist_ok=True)
-
-        installed = []
-        for mod_file in mod_files:
-            mod_filename = os.path.basename(mod_file)
-            dest_path = os.path.join(mod_folder, mod_filename)
-
-            # Handle duplicates within same mod
-            if os.path.exists(dest_path):
-                base, ext = os.path.splitext(mod_filename)
-                counter = 1
-                while os.path.exists(dest_path):
-                    dest_path = os.path.join(mod_folder, f"{base}_{counter}{ext}")
-                    counter += 1
-
-            shutil.move(mod_file, dest_path)
-            installed.append(os.path.basename(dest_path))
-
-        # Success message
-        if len(installed) == 1:
-            msg = f"Installed: {folder_name}/{installed[0]}"
-        else:
-            msg = f"Installed {len(installed)} files to {folder_name}/"
-
-        on_status(msg)
-        on_complete(True, msg)
-        return True, msg
+        archive_cache.store(digests, install_dir, installed, filename)
+        mod_folder = _commit(install_dir, mod_folder, replace_folder, manifest)
+        install_dir = None
+        return finish(mod_folder, installed, digests)
 
     except Exception as e:
         msg = str(e)
@@ -302,9 +812,14 @@ def download_and_install_mod(mod, file_info, mods_dir, callbacks=None):
         return False, msg
 
     finally:
+        # Uncommitted installs never reach the mods folder
+        if install_dir and install_dir != target_dir:
+            shutil.rmtree(install_dir, ignore_errors=True)
+        # Completed archives are not needed once installed (partials are kept)
         try:
-            shutil.rmtree(temp_dir, ignore_errors=True)
-        except Exception:
+            if os.path.exists(archive_path):
+                os.remove(archive_path)
+        except OSError:
             pass
 
 
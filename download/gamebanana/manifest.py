@@ -0,0 +1,184 @@
+"""
+Manifest of mods installed from GameBanana.
+
+Each mods folder keeps a small JSON manifest that links installed folders
+back to the GameBanana mod and file they came from (mod_id, file_id, md5,
+sha256, date_updated, installed paths). It is rewritten atomically
+(temp file + rename) on every install and indexed in memory by mod id and
+by MD5, so the mod browser can mark installed mods and skip downloading a
+file that is already installed.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+MANIFEST_FILENAME = ".saildeck_manifest.json"
+MANIFEST_VERSION = 1
+
+
+class InstallManifest:
+    """Installed-mod records for one mods folder."""
+
+    def __init__(self, mods_dir):
+        self.mods_dir = os.path.abspath(mods_dir)
+        self.path = os.path.join(self.mods_dir, MANIFEST_FILENAME)
+        self._lock = threading.RLock()
+        self._entries = {}  # mod_id (str) -> entry
+        self._by_md5 = {}  # md5 -> mod_id (str)
+        self._load()
+
+    # ---- Persistence ----
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"[Manifest] Could not read {self.path}: {e}")
+            return
+
+        for entry in data.get("mods", {}).values():
+            if entry.get("mod_id") is not None:
+                self._index(entry)
+        if self.prune():
+            self._save()
+
+    def _save(self):
+        """Write the manifest atomically; callers hold the lock."""
+        data = {"version": MANIFEST_VERSION, "mods": self._entries}
+        os.makedirs(self.mods_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".manifest_", suffix=".tmp", dir=self.mods_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _index(self, entry):
+        key = str(entry["mod_id"])
+        previous = self._entries.get(key)
+        if previous and self._by_md5.get(previous.get("md5")) == key:
+            del self._by_md5[previous["md5"]]
+        self._entries[key] = entry
+        if entry.get("md5"):
+            self._by_md5[entry["md5"].lower()] = key
+
+    def _unindex(self, key):
+        entry = self._entries.pop(key, None)
+        if entry and self._by_md5.get((entry.get("md5") or "").lower()) == key:
+            del self._by_md5[entry["md5"].lower()]
+        return entry
+
+    # ---- Writes ----
+
+    def record_install(self, mod, file_info, record):
+        """
+        Record a finished install.
+
+        record is the dict passed to the on_installed callback of
+        gb_download.download_and_install_mod (folder, files, md5, sha256).
+        """
+        entry = {
+            "mod_id": mod.get("mod_id"),
+            "name": mod.get("name", "Unknown Mod"),
+            "file_id": file_info.get("file_id"),
+            "filename": file_info.get("filename", ""),
+            "md5": (record.get("md5") or file_info.get("md5") or "").lower(),
+            "sha256": record.get("sha256", ""),
+            "date_updated": mod.get("date_updated"),
+            "folder": os.path.relpath(record["folder"], self.mods_dir),
+            "files": list(record.get("files", [])),
+            "installed_at": int(time.time()),
+        }
+        with self._lock:
+            self._index(entry)
+            self._save()
+        return entry
+
+    def remove(self, mod_id):
+        with self._lock:
+            entry = self._unindex(str(mod_id))
+            if entry:
+                self._save()
+        return entry
+
+    def prune(self):
+        """Drop entries whose folder no longer exists; returns how many were dropped."""
+        with self._lock:
+            missing = [key for key, entry in self._entries.items() if not self._folder_exists(entry)]
+            for key in missing:
+                self._unindex(key)
+        return len(missing)
+
+    # ---- Lookups ----
+
+    def _folder_exists(self, entry):
+        return os.path.isdir(os.path.join(self.mods_dir, entry.get("folder", "")))
+
+    def get(self, mod_id):
+        """Return the entry for an installed mod, or None (also if its folder was deleted)."""
+        entry = self._entries.get(str(mod_id))
+        if entry is None or not self._folder_exists(entry):
+            return None
+        return dict(entry)
+
+    def is_installed(self, mod_id):
+        return self.get(mod_id) is not None
+
+    def find_by_md5(self, md5):
+        """Return the installed entry whose archive had this MD5, or None."""
+        key = self._by_md5.get((md5 or "").lower())
+        return self.get(key) if key else None
+
+    def find_identical(self, mod_id, file_info):
+        """Return the installed entry if file_info is exactly what is installed for mod_id."""
+        entry = self.get(mod_id)
+        if entry is None:
+            return None
+        md5 = (file_info.get("md5") or "").lower()
+        if md5:
+            return entry if entry.get("md5") == md5 else None
+        return entry if entry.get("file_id") == file_info.get("file_id") else None
+
+    def entries(self):
+        """Return all entries whose folders still exist."""
+        with self._lock:
+            return [dict(entry) for entry in self._entries.values() if self._folder_exists(entry)]
+
+    def find_by_folder(self, folder):
+        """Return the entry installed in folder (an absolute path), or None."""
+        key = os.path.normcase(os.path.abspath(folder))
+        with self._lock:
+            for entry in self._entries.values():
+                if os.path.normcase(os.path.abspath(self.folder_path(entry))) == key:
+                    return dict(entry)
+        return None
+
+    def folder_path(self, entry):
+        return os.path.join(self.mods_dir, entry["folder"])
+
+
+# One manifest per mods folder
+_manifests = {}
+_manifests_lock = threading.Lock()
+
+
+def get_install_manifest(mods_dir):
+    """Get the InstallManifest for mods_dir."""
+    key = os.path.normcase(os.path.abspath(mods_dir))
+    with _manifests_lock:
+        manifest = _manifests.get(key)
+        if manifest is None:
+            manifest = _manifests[key] = InstallManifest(mods_dir)
+        return manifest
@@ -0,0 +1,139 @@
+"""
+Progress aggregation between download workers and the Tk loop.
+
+Workers publish progress as fast as they read data. The aggregator only
+records the latest snapshot per task, then on a fixed UI tick computes
+throughput and ETA and pushes one batched update to its subscribers.
+"""
+import threading
+import time
+
+from download.gamebanana.download_manager import get_download_manager, FINISHED_STATES
+
+UI_TICK_MS = 100  # 10 Hz
+RATE_SMOOTHING = 0.3  # Weight of the newest sample in the throughput average
+
+
+class ProgressAggregator:
+    """
+    Coalesces download manager snapshots into one update per UI tick.
+
+    Subscribers are called on the Tk thread with view dicts: the manager
+    snapshot plus "rate" (bytes/s) and "eta" (seconds or None).
+    """
+
+    def __init__(self, root, manager=None, interval_ms=UI_TICK_MS):
+        self._root = root
+        self._manager = manager or get_download_manager()
+        self._interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self._pending = {}  # task_id -> latest snapshot (written by workers)
+        self._rates = {}  # task_id -> (last sample time, last bytes, smoothed rate)
+        self._subscribers = []
+        self._after_id = None
+        self._manager.subscribe(self._on_snapshot)
+
+    # ---- Worker side ----
+
+    def _on_snapshot(self, snapshot):
+        """Record the newest snapshot; cheap enough to call for every chunk."""
+        with self._lock:
+            self._pending[snapshot["task_id"]] = snapshot
+
+    # ---- Tk side ----
+
+    def subscribe(self, callback, task_id=None):
+        """
+        Register callback on the Tk thread.
+
+        With task_id, callback(view) receives that task's updates only;
+        otherwise callback(views) receives a dict of task_id -> view per tick.
+        """
+        self._subscribers.append((callback, task_id))
+        if task_id is not None:
+            snapshot = self._manager.get_task(task_id)
+            if snapshot:
+                self._on_snapshot(snapshot)  # Catch up on earlier updates
+        self._ensure_ticking()
+
+    def unsubscribe(self, callback):
+        """Remove every registration of callback."""
+        self._subscribers = [(cb, tid) for cb, tid in self._subscribers if cb is not callback]
+
+    def _ensure_ticking(self):
+        if self._after_id is None:
+            try:
+                self._after_id = self._root.after(self._interval_ms, self._tick)
+            except Exception:
+                self._after_id = None  # Root destroyed
+
+    def _tick(self):
+        self._after_id = None
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if pending:
+            now = time.monotonic()
+            views = {task_id: self._build_view(snapshot, now) for task_id, snapshot in pending.items()}
+            self._dispatch(views)
+
+        if self._subscribers:
+            self._ensure_ticking()
+
+    def _build_view(self, snapshot, now):
+        task_id = snapshot["task_id"]
+        downloaded = snapshot["downloaded"]
+        total = snapshot["total"]
+
+        last_time, last_bytes, rate = self._rates.get(task_id, (now, downloaded, 0.0))
+        elapsed = now - last_time
+        if elapsed > 0 and downloaded >= last_bytes:
+            sample = (downloaded - last_bytes) / elapsed
+            rate = sample if rate == 0.0 else (RATE_SMOOTHING * sample + (1 - RATE_SMOOTHING) * rate)
+        self._rates[task_id] = (now, downloaded, rate)
+
+        if snapshot["state"] in FINISHED_STATES:
+            self._rates.pop(task_id, None)
+
+        eta = None
+        if rate > 0 and total > downloaded:
+            eta = (total - downloaded) / rate
+
+        view = dict(snapshot)
+        view["rate"] = rate
+        view["eta"] = eta
+        return view
+
+    def _dispatch(self, views):
+        for callback, task_id in list(self._subscribers):
+            try:
+                if task_id is None:
+                    callback(views)
+                elif task_id in views:
+                    callback(views[task_id])
+            except Exception as e:
+                print(f"[Progress] Subscriber error: {e}")
+
+
+def format_eta(seconds):
+    """Format an ETA in seconds as m:ss or h:mm:ss."""
+    if seconds is None:
+        return ""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+# Global progress aggregator instance
+_progress_aggregator = None
+
+
+def get_progress_aggregator(widget):
+    """Get the global ProgressAggregator, bound to widget's Tk root."""
+    global _progress_aggregator
+    if _progress_aggregator is None:
+        _progress_aggregator = ProgressAggregator(widget.nametowidget("."))
+    return _progress_aggregator
@@ -0,0 +1,176 @@
+"""
+Offline search over the local mod catalog.
+
+Two matchers run against the catalog mirror:
+
+  - full text: an FTS5 prefix query over name, author, category and
+    description (weighted in that order)
+  - fuzzy: trigram similarity between query words and the words of mod
+    names and authors, backed by edit distance for short words, so typos
+    ("ocrina", "zleda") still match
+
+Matches are ranked by relevance, boosted by likes and views. The trigram
+index lives in memory and is rebuilt only when the catalog changes.
+"""
+import math
+import re
+import threading
+
+from download.gamebanana.catalog import get_catalog
+
+MIN_FUZZY_SIMILARITY = 0.45  # Dice coefficient over trigrams
+MAX_EDIT_DISTANCE = 2  # Transpositions count as one edit
+MAX_RESULTS = 200
+FTS_RELEVANCE = 2.0  # Best full-text match; fuzzy matches score at most 1.0
+LIKE_BOOST = 0.08  # Per decade of likes
+VIEW_BOOST = 0.03  # Per decade of views
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _words(text):
+    return _WORD_RE.findall((text or "").lower())
+
+
+def _trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a, b, limit):
+    """Optimal string alignment distance, or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        row = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], prev2[j - 2] + 1)
+        if min(row) > limit:
+            return limit + 1
+        prev2, prev = prev, row
+    return prev[-1]
+
+
+class CatalogSearch:
+    """Full-text plus fuzzy search over a CatalogStore."""
+
+    def __init__(self, store=None):
+        self.store = store or get_catalog()
+        self._lock = threading.Lock()
+        self._version = None
+        self._word_mods = {}  # word -> set of mod ids
+        self._word_trigrams = {}  # word -> trigram set
+        self._trigram_words = {}  # trigram -> set of words
+        self._popularity = {}  # mod id -> ranking boost
+        self._categories = {}  # mod id -> lowercase category
+
+    def _ensure_index(self):
+        if self._version == self.store.version and self._word_mods:
+            return
+        word_mods, word_trigrams, trigram_words = {}, {}, {}
+        popularity, categories = {}, {}
+
+        for mod_id, name, author, category, likes, views in self.store.search_rows():
+            popularity[mod_id] = 1.0 + LIKE_BOOST * math.log10(1 + (likes or 0)) \
+                + VIEW_BOOST * math.log10(1 + (views or 0))
+            categories[mod_id] = (category or "").lower()
+            for word in set(_words(name) + _words(author)):
+                word_mods.setdefault(word, set()).add(mod_id)
+
+        for word in word_mods:
+            grams = _trigrams(word)
+            word_trigrams[word] = grams
+            for gram in grams:
+                trigram_words.setdefault(gram, set()).add(word)
+
+        self._word_mods, self._word_trigrams, self._trigram_words = word_mods, word_trigrams, trigram_words
+        self._popularity, self._categories = popularity, categories
+        self._version = self.store.version
+
+    def _similar_words(self, token):
+        """Return {word: similarity} for indexed words close to token."""
+        grams = _trigrams(token)
+        shared = {}
+        for gram in grams:
+            for word in self._trigram_words.get(gram, ()):
+                shared[word] = shared.get(word, 0) + 1
+
+        matches = {}
+        for word, count in shared.items():
+            if word.startswith(token):
+                matches[word] = 1.0  # Prefix of a word being typed
+                continue
+            similarity = 2.0 * count / (len(grams) + len(self._word_trigrams[word]))
+            if similarity < MIN_FUZZY_SIMILARITY and len(token) >= 4:
+                # Short words share few trigrams; swapped or missing letters are still close
+                limit = 1 if len(token) < 7 else MAX_EDIT_DISTANCE
+                distance = _edit_distance(token, word, limit)
+                if distance <= limit:
+                    similarity = 1.0 - distance / max(len(token), len(word))
+            if similarity >= MIN_FUZZY_SIMILARITY:
+                matches[word] = similarity
+        return matches
+
+    def _fuzzy_scores(self, tokens):
+        """Score mods whose words match every token; the score is the mean best similarity."""
+        scores = None
+        for token in tokens:
+            token_scores = {}
+            for word, similarity in self._similar_words(token).items():
+                for mod_id in self._word_mods[word]:
+                    if similarity > token_scores.get(mod_id, 0.0):
+                        token_scores[mod_id] = similarity
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {mod_id: scores[mod_id] + sim for mod_id, sim in token_scores.items() if mod_id in scores}
+            if not scores:
+                return {}
+        return {mod_id: total / len(tokens) for mod_id, total in (scores or {}).items()}
+
+    def search(self, query, category=None, limit=MAX_RESULTS):
+        """
+        Search the catalog; returns mod dicts (api._parse_mod_record shape), best first.
+
+        category limits results to one category (case-insensitive).
+        """
+        tokens = _words(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            self._ensure_index()
+
+            # Full-text matches start above fuzzy ones and keep their bm25 order
+            fts_ids = self.store.fts_search(" ".join(f'"{token}"*' for token in tokens), limit=MAX_RESULTS)
+            relevance = {}
+            for rank, mod_id in enumerate(fts_ids):
+                relevance[mod_id] = FTS_RELEVANCE - 0.5 * rank / len(fts_ids)
+
+            for mod_id, score in self._fuzzy_scores(tokens).items():
+                if score > relevance.get(mod_id, 0.0):
+                    relevance[mod_id] = score
+
+            wanted = (category or "").lower()
+            ranked = sorted(
+                (mod_id for mod_id in relevance if not wanted or self._categories.get(mod_id) == wanted),
+                key=lambda mod_id: relevance[mod_id] * self._popularity.get(mod_id, 1.0),
+                reverse=True
+            )
+        return self.store.get_mods(ranked[:limit])
+
+
+# Global search instance
+_catalog_search = None
+
+
+def get_catalog_search():
+    """Get the global CatalogSearch instance."""
+    global _catalog_search
+    if _catalog_search is None:
+        _catalog_search = CatalogSearch()
+    return _catalog_search
@@ -0,0 +1,189 @@
+"""
+GameBanana sources for modpack files.
+
+A reference modpack lists mods that came from GameBanana by mod id, file
+id and archive MD5 instead of carrying their bytes. On export, files are
+matched to the GameBanana install they came from through the install
+manifest. On import, every archive a pack needs is collected in the
+cheapest way available: linked from an install of the same archive in the
+mods folder, materialized from the archive cache, or downloaded. Downloads
+are all queued on the download manager at once, so they run in parallel
+under its limits, and their file lists are fetched together on the async
+client first.
+"""
+import os
+
+from download.gamebanana.async_client import get_async_client, AsyncRateLimiter
+from download.gamebanana.cache import get_archive_cache
+from download.gamebanana.download_manager import (
+    get_download_manager,
+    FINISHED_STATES,
+    STATE_COMPLETED,
+    PRIORITY_HIGH,
+)
+from download.gamebanana.manifest import get_install_manifest
+from download.gamebanana.staging import link_or_copy
+from mod_manager import find_mod_file
+from scheduler import current_token, Cancelled
+
+SOURCE_REQUESTS_PER_SECOND = 5.0
+SOURCE_BURST = 10
+POLL_INTERVAL = 0.25
+
+
+class SourceUnavailable(Exception):
+    """A GameBanana file a modpack refers to can't be found or downloaded."""
+
+
+def _path_key(path):
+    return os.path.normcase(os.path.normpath(path))
+
+
+def find_sources(mods_dir, rel_paths):
+    """
+    Match files in mods_dir to the GameBanana installs they came from.
+
+    rel_paths are relative to mods_dir. Returns {rel_path: source} for the
+    files that belong to an installed GameBanana archive; a source is a
+    dict with mod_id, file_id, md5, name, filename and member (the file's
+    name among the archive's payloads).
+    """
+    by_path = {}
+    for entry in get_install_manifest(mods_dir).entries():
+        if not entry.get("md5"):
+            continue
+        for member in entry.get("files", []):
+            by_path[_path_key(os.path.join(entry["folder"], member))] = (entry, member)
+
+    sources = {}
+    for rel_path in rel_paths:
+        match = by_path.get(_path_key(rel_path))
+        if match:
+            entry, member = match
+            sources[rel_path] = {
+                "mod_id": entry["mod_id"],
+                "file_id": entry.get("file_id"),
+                "md5": entry["md5"],
+                "name": entry.get("name", "Unknown Mod"),
+                "filename": entry.get("filename", ""),
+                "member": member,
+            }
+    return sources
+
+
+def _link_installed(manifest, entry, folder):
+    """Link an installed archive's payloads into folder; False if any went missing."""
+    src_folder = manifest.folder_path(entry)
+    paths = [find_mod_file(os.path.join(src_folder, member)) for member in entry["files"]]
+    if not all(paths):
+        return False
+    os.makedirs(folder, exist_ok=True)
+    for member, path in zip(entry["files"], paths):
+        dest = os.path.join(folder, member)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        link_or_copy(path, dest)
+    return True
+
+
+def missing_sources(sources, mods_dir):
+    """Return the sources ({md5: source}) that are neither installed nor cached."""
+    manifest = get_install_manifest(mods_dir)
+    cache = get_archive_cache()
+    return [source for md5, source in sources.items()
+            if not manifest.find_by_md5(md5) and not cache.lookup(md5=md5)]
+
+
+def fetch_sources(sources, mods_dir, dest_root, on_status=None, manager=None):
+    """
+    Collect the payloads of every archive in sources into dest_root.
+
+    sources is {md5: source} (see find_sources); each archive ends up in
+    dest_root/<md5>. dest_root should be on the same volume as mods_dir
+    so installed and cached payloads are hardlinked. Blocks until every
+    download has finished. Returns {md5: folder}; raises SourceUnavailable
+    if an archive can't be found or downloaded, and Cancelled (with the
+    queued downloads cancelled) if the calling scheduler job is cancelled.
+    """
+    on_status = on_status or (lambda msg: None)
+    manifest = get_install_manifest(mods_dir)
+    cache = get_archive_cache()
+    folders = {}
+    to_download = []
+    for md5, source in sources.items():
+        folder = os.path.join(dest_root, md5)
+        installed = manifest.find_by_md5(md5)
+        if installed and _link_installed(manifest, installed, folder):
+            folders[md5] = folder
+            continue
+        cached = cache.lookup(md5=md5)
+        if cached:
+            cache.materialize(cached, folder)
+            folders[md5] = folder
+            continue
+        to_download.append(source)
+
+    if to_download:
+        print(f"[Sources] {len(folders)} archive(s) found locally, downloading {len(to_download)}")
+        folders.update(_download_sources(to_download, mods_dir, dest_root, on_status, manager))
+    return folders
+
+
+def _resolve_files(to_download):
+    """Find each source's file on GameBanana; returns [(source, file_info)]."""
+    mod_ids = sorted({source["mod_id"] for source in to_download}, key=str)
+    client = get_async_client()
+    limiter = AsyncRateLimiter(SOURCE_REQUESTS_PER_SECOND, burst=SOURCE_BURST)
+    files_by_mod = client.run(client.get_files_for_mods(mod_ids, limiter=limiter))
+
+    resolved = []
+    unavailable = []
+    for source in to_download:
+        files = files_by_mod.get(source["mod_id"]) or []
+        file_info = next((f for f in files if f.get("file_id") == source.get("file_id")), None) \
+            or next((f for f in files if (f.get("md5") or "").lower() == source["md5"]), None)
+        if file_info is None:
+            unavailable.append(source["name"])
+        else:
+            resolved.append((source, file_info))
+    if unavailable:
+        raise SourceUnavailable("No longer available on GameBanana: " + ", ".join(sorted(unavailable)))
+    return resolved
+
+
+def _download_sources(to_download, mods_dir, dest_root, on_status, manager=None):
+    manager = manager or get_download_manager()
+    on_status(f"Looking up {len(to_download)} mod(s) on GameBanana...")
+    resolved = _resolve_files(to_download)
+
+    tasks = {}
+    for source, file_info in resolved:
+        folder = os.path.join(dest_root, source["md5"])
+        os.makedirs(folder, exist_ok=True)
+        mod = {"mod_id": source["mod_id"], "name": source["name"]}
+        task_id = manager.enqueue(mod, mods_dir, file_info=file_info, priority=PRIORITY_HIGH, target_dir=folder)
+        tasks[task_id] = source
+
+    # The caller is a worker thread; poll the manager's snapshots until every task is
+    # done, or until the job is cancelled
+    token = current_token()
+    while True:
+        if token.cancelled:
+            for task_id in tasks:
+                manager.cancel(task_id)
+            raise Cancelled()
+        snapshots = [manager.get_task(task_id) for task_id in tasks]
+        failed = [s for s in snapshots if s["state"] in FINISHED_STATES and s["state"] != STATE_COMPLETED]
+        if failed:
+            for task_id in tasks:
+                manager.cancel(task_id)
+            raise SourceUnavailable(f"Couldn't download {failed[0]['name']}: {failed[0]['message'] or failed[0]['state']}")
+        finished = sum(1 for s in snapshots if s["state"] == STATE_COMPLETED)
+        if finished == len(tasks):
+            break
+        downloaded = sum(s["downloaded"] for s in snapshots)
+        total = sum(s["total"] for s in snapshots)
+        percent = f" ({downloaded * 100 // total}%)" if total else ""
+        on_status(f"Downloading {len(tasks)} mod(s) from GameBanana: {finished} done{percent}")
+        token.wait(POLL_INTERVAL)
+
+    return {source["md5"]: os.path.join(dest_root, source["md5"]) for source in tasks.values()}
@@ -0,0 +1,322 @@
+"""
+Persistent staging area for mod downloads.
+
+The staging area sits next to the mods folder, so it is on the same
+volume: partial downloads survive failures and app restarts (and resume
+with HTTP Range requests), and finished installs are moved into the mods
+folder with a single directory rename instead of a copy.
+"""
+import errno
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+
+# Import scheduler and mod_manager from parent package
+try:
+    from scheduler import get_scheduler
+    from mod_manager import find_mod_file
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from scheduler import get_scheduler
+    from mod_manager import find_mod_file
+
+STAGING_DIR_NAME = ".saildeck_staging"
+PARTIAL_SUBDIR = "partial"
+INSTALL_PREFIX = "install_"
+REPLACED_PREFIX = "replaced_"  # Old mod folders moved aside during an update
+ENABLED_EXTENSIONS = {".disabled": ".otr", ".di2abled": ".o2r"}
+
+# Partial downloads untouched for this long are dropped on startup
+PARTIAL_MAX_AGE_SECONDS = 14 * 24 * 60 * 60
+
+
+def get_staging_dir(mods_dir):
+    """Return (and create) the staging directory that sits next to mods_dir."""
+    parent = os.path.dirname(os.path.abspath(mods_dir))
+    staging_dir = os.path.join(parent, STAGING_DIR_NAME)
+    os.makedirs(staging_dir, exist_ok=True)
+    return staging_dir
+
+
+def get_partial_dir(mods_dir):
+    """Return (and create) the directory holding resumable downloads."""
+    partial_dir = os.path.join(get_staging_dir(mods_dir), PARTIAL_SUBDIR)
+    os.makedirs(partial_dir, exist_ok=True)
+    return partial_dir
+
+
+def get_download_path(mods_dir, file_info):
+    """
+    Return the stable staging path for a GameBanana file.
+
+    The name is derived from the file id so an interrupted download of the
+    same file always lands on the same partial and can be resumed.
+    """
+    filename = file_info.get("filename") or "mod_download"
+    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    file_id = file_info.get("file_id")
+    name = f"{file_id}_{filename}" if file_id else filename
+    return os.path.join(get_partial_dir(mods_dir), name)
+
+
+# os.link errors that mean "links aren't possible here", not "something is wrong"
+_NO_LINK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EINVAL,
+                   getattr(errno, "ENOTSUP", errno.EPERM), getattr(errno, "EOPNOTSUPP", errno.EPERM)}
+
+
+def link_or_copy(src, dst):
+    """
+    Hardlink src to dst, copying when links aren't possible (other volume, FAT, ...).
+    Never overwrites: raises FileExistsError if dst exists.
+    """
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        raise
+    except OSError as e:
+        if e.errno not in _NO_LINK_ERRNOS:
+            raise
+        with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+            shutil.copyfileobj(fsrc, fdst)
+        shutil.copystat(src, dst)
+
+
+def create_install_dir(mods_dir):
+    """Create a fresh, empty directory to build an install in."""
+    install_dir = os.path.join(get_staging_dir(mods_dir), f"{INSTALL_PREFIX}{uuid.uuid4().hex[:12]}")
+    os.makedirs(install_dir)
+    return install_dir
+
+
+def commit_install_dir(install_dir, mod_folder):
+    """
+    Move a finished install into place with one directory rename.
+
+    If mod_folder is taken, a unique suffix is appended. Returns the
+    folder the install ended up in.
+    """
+    target = mod_folder
+    for _ in range(10):
+        if not os.path.exists(target):
+            try:
+                os.rename(install_dir, target)
+                return target
+            except FileExistsError:
+                pass
+            except OSError:
+                # Created by someone else between the check and the rename
+                if not os.path.exists(target):
+                    raise
+        target = f"{mod_folder}_{uuid.uuid4().hex[:8]}"
+    raise OSError(f"Could not find a free folder name for {mod_folder}")
+
+
+def _enabled_name(path):
+    """Return a path with a disabled mod extension turned back into .otr/.o2r."""
+    base, ext = os.path.splitext(path)
+    return base + ENABLED_EXTENSIONS[ext.lower()] if ext.lower() in ENABLED_EXTENSIONS else path
+
+
+def _user_files(mod_folder, installed_files):
+    """
+    Return the files in mod_folder (relative paths) the previous install did not put there.
+
+    installed_files comes from the install manifest; without it, only files
+    that are not mod payloads count as the user's.
+    """
+    installed = {os.path.normcase(name) for name in installed_files} if installed_files is not None else None
+    found = []
+    for root, _dirs, files in os.walk(mod_folder):
+        for name in files:
+            rel = os.path.relpath(os.path.join(root, name), mod_folder)
+            if installed is None:
+                ext = os.path.splitext(_enabled_name(name))[1].lower()
+                if ext not in (".otr", ".o2r"):
+                    found.append(rel)
+            elif os.path.normcase(_enabled_name(rel)) not in installed:
+                found.append(rel)
+    return found
+
+
+def replace_install_dir(install_dir, mod_folder, installed_files=None, keep_user_changes=True):
+    """
+    Swap a finished install in for an existing mod folder (used by updates).
+
+    With keep_user_changes, what the user did to the old folder is kept:
+    new payloads whose old version was disabled are installed disabled, and
+    files the previous install did not put there (installed_files, from the
+    install manifest) are moved into the new folder. If such a file clashes
+    with a new payload the update is refused (OSError) before anything is
+    touched. Modpack imports pass False: the pack records each file's state.
+
+    The old folder is moved aside into the staging area, the new one renamed
+    into its place, and the old one deleted. If the second rename fails the
+    old folder is moved back. A sidecar file records where the old folder
+    belongs, so cleanup_staging can restore it after a crash between the two
+    renames. Returns the folder the install ended up in.
+    """
+    if not os.path.exists(mod_folder):
+        return commit_install_dir(install_dir, mod_folder)
+
+    user_files = []
+    if keep_user_changes:
+        user_files = _user_files(mod_folder, installed_files)
+        for rel in user_files:
+            if os.path.lexists(os.path.join(install_dir, rel)) \
+                    or find_mod_file(os.path.join(install_dir, _enabled_name(rel))):
+                raise OSError(f"{os.path.join(mod_folder, rel)} is not part of the installed mod "
+                              f"and clashes with a file of the update")
+
+        # Payloads the user disabled stay disabled
+        for name in os.listdir(install_dir):
+            old = find_mod_file(os.path.join(mod_folder, name))
+            if old and os.path.basename(old) != name:
+                os.rename(os.path.join(install_dir, name), os.path.join(install_dir, os.path.basename(old)))
+
+    backup = os.path.join(os.path.dirname(install_dir), f"{REPLACED_PREFIX}{uuid.uuid4().hex[:12]}")
+    with open(backup + ".json", "w", encoding="utf-8") as f:
+        json.dump({"target": os.path.abspath(mod_folder), "user_files": user_files}, f)
+
+    os.rename(mod_folder, backup)
+    try:
+        os.rename(install_dir, mod_folder)
+    except OSError:
+        os.rename(backup, mod_folder)
+        os.remove(backup + ".json")
+        raise
+
+    _move_user_files(backup, mod_folder, user_files)
+    shutil.rmtree(backup, ignore_errors=True)
+    try:
+        os.remove(backup + ".json")
+    except OSError:
+        pass
+    return mod_folder
+
+
+def _remove_tree(path):
+    """
+    Delete a directory tree file by file, counting every file against the
+    scheduler's background I/O limit (a plain rmtree on other threads).
+    """
+    scheduler = get_scheduler()
+    for root, dirs, files in os.walk(path, topdown=False):
+        for name in files:
+            file_path = os.path.join(root, name)
+            try:
+                size = os.lstat(file_path).st_size
+                os.remove(file_path)
+            except OSError:
+                continue
+            scheduler.throttle(size)
+        for name in dirs:
+            dir_path = os.path.join(root, name)
+            try:
+                if os.path.islink(dir_path):
+                    os.remove(dir_path)
+                else:
+                    os.rmdir(dir_path)
+            except OSError:
+                pass
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
+
+
+def _move_user_files(old_folder, new_folder, user_files):
+    """Move the user's own files of a replaced folder into the new one (never overwrites)."""
+    for rel in user_files:
+        src = os.path.join(old_folder, rel)
+        target = os.path.join(new_folder, rel)
+        if os.path.lexists(src) and not os.path.lexists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.rename(src, target)
+
+
+def _restore_replaced(entry):
+    """Put back an old mod folder if an update was interrupted mid-swap; otherwise drop it."""
+    sidecar = entry.path + ".json"
+    try:
+        with open(sidecar, "r", encoding="utf-8") as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        info = {}
+    target = info.get("target")
+
+    if target and not os.path.exists(target):
+        os.rename(entry.path, target)
+        print(f"[Staging] Restored {target} after an interrupted update")
+    else:
+        if target:
+            # The new folder is in place; finish moving the user's files over
+            _move_user_files(entry.path, target, info.get("user_files", []))
+        _remove_tree(entry.path)
+    try:
+        os.remove(sidecar)
+    except OSError:
+        pass
+
+
+def _changed_since(entry, timestamp):
+    """True if a staging item was created, written or moved (ctime) since timestamp."""
+    st = entry.stat()
+    return max(st.st_mtime, st.st_ctime) >= timestamp
+
+
+def cleanup_staging(mods_dir, session_start=None):
+    """
+    Remove leftovers from interrupted sessions.
+
+    Deletes abandoned install directories and partial downloads that have
+    not been touched for PARTIAL_MAX_AGE_SECONDS, and finishes or rolls back
+    interrupted update swaps. Call on startup; when it runs as a deferred
+    background job, pass the app's start time as session_start so items
+    touched since (installs already running) are left alone.
+    """
+    parent = os.path.dirname(os.path.abspath(mods_dir))
+    staging_dir = os.path.join(parent, STAGING_DIR_NAME)
+    if not os.path.isdir(staging_dir):
+        return
+
+    scheduler = get_scheduler()
+    removed = 0
+    try:
+        for entry in os.scandir(staging_dir):
+            scheduler.throttle()  # Yield to interactive work between items
+            if session_start is not None and _changed_since(entry, session_start):
+                continue
+            if entry.is_dir() and entry.name.startswith(INSTALL_PREFIX):
+                _remove_tree(entry.path)
+                removed += 1
+            elif entry.is_dir() and entry.name.startswith(REPLACED_PREFIX):
+                _restore_replaced(entry)
+                removed += 1
+            elif entry.name.startswith(REPLACED_PREFIX) and entry.name.endswith(".json") \
+                    and not os.path.exists(entry.path[:-len(".json")]):
+                try:
+                    os.remove(entry.path)  # Sidecar of a swap that already finished
+                except OSError:
+                    pass
+
+        partial_dir = os.path.join(staging_dir, PARTIAL_SUBDIR)
+        if os.path.isdir(partial_dir):
+            cutoff = time.time() - PARTIAL_MAX_AGE_SECONDS
+            for entry in os.scandir(partial_dir):
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        size = entry.stat().st_size
+                        os.remove(entry.path)
+                        removed += 1
+                        scheduler.throttle(size)
+                except OSError:
+                    pass
+    except OSError as e:
+        print(f"[Staging] Could not clean up {staging_dir}: {e}")
+
+    if removed:
+        print(f"[Staging] Cleaned up {removed} leftover item(s) in {staging_dir}")
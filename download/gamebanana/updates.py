@@ -0,0 +1,106 @@
+"""
+Update checker for mods installed from GameBanana.
+
+Installed mods come from the install manifest. The local catalog mirror is
+synced first and used to skip mods whose _tsDateUpdated has not moved
+since they were installed; the rest have their file lists fetched in
+concurrent, rate-limited batches on the async client, and the newest file's
+MD5 is compared with the installed one. Updates are installed through the
+download manager, each swapping the new files in for the old folder.
+"""
+import asyncio
+
+from download.gamebanana.async_client import get_async_client, AsyncRateLimiter
+from download.gamebanana.catalog import get_catalog, get_catalog_sync
+from download.gamebanana.download_manager import get_download_manager
+from download.gamebanana.manifest import get_install_manifest
+
+UPDATE_BATCH_SIZE = 10
+UPDATE_REQUESTS_PER_SECOND = 5.0
+
+
+def _is_newer(file_info, entry):
+    """True if file_info differs from the installed file described by entry."""
+    md5 = (file_info.get("md5") or "").lower()
+    if md5 and entry.get("md5"):
+        return md5 != entry["md5"]
+    return file_info.get("file_id") != entry.get("file_id")
+
+
+async def check_for_updates(mods_dir, on_progress=None, client=None, catalog=None):
+    """
+    Return a list of available updates for mods installed in mods_dir.
+
+    Each update is a dict with "mod" (catalog record, or a minimal mod
+    dict), "entry" (the manifest entry) and "file_info" (the newest file).
+    on_progress(checked, total) is called on the client loop after each batch.
+    """
+    client = client or get_async_client()
+    catalog = catalog or get_catalog()
+    manifest = get_install_manifest(mods_dir)
+    entries = [entry for entry in manifest.entries() if entry.get("mod_id") is not None]
+    if not entries:
+        return []
+
+    loop = asyncio.get_running_loop()
+    # A stale catalog would hide updates, so wait for a fresh one (or the sync already running)
+    sync = get_catalog_sync()
+    pending = sync.start() or sync.pending
+    catalog_fresh = True
+    if pending is not None:
+        try:
+            await asyncio.wrap_future(pending)
+        except Exception as e:
+            catalog_fresh = False
+            print(f"[Updates] Catalog sync failed, checking every installed mod: {e}")
+
+    known = await loop.run_in_executor(None, catalog.get_mods, [entry["mod_id"] for entry in entries])
+    known = {mod["mod_id"]: mod for mod in known}
+
+    # Mods whose catalog record hasn't changed since install can't have new files
+    candidates = []
+    for entry in entries:
+        mod = known.get(entry["mod_id"])
+        if catalog_fresh and mod and entry.get("date_updated") \
+                and (mod.get("date_updated") or 0) <= entry["date_updated"]:
+            continue
+        candidates.append((entry, mod or {"mod_id": entry["mod_id"], "name": entry.get("name", "Unknown Mod")}))
+
+    limiter = AsyncRateLimiter(UPDATE_REQUESTS_PER_SECOND, burst=UPDATE_BATCH_SIZE)
+    batches = [candidates[i:i + UPDATE_BATCH_SIZE] for i in range(0, len(candidates), UPDATE_BATCH_SIZE)]
+    checked = len(entries) - len(candidates)
+    updates = []
+
+    async def check_batch(batch):
+        nonlocal checked
+        files_by_mod = await client.get_files_for_mods([entry["mod_id"] for entry, _ in batch], limiter=limiter)
+        for entry, mod in batch:
+            files = files_by_mod.get(entry["mod_id"])
+            if files and _is_newer(files[0], entry):
+                updates.append({"mod": mod, "entry": entry, "file_info": files[0]})
+        checked += len(batch)
+        if on_progress:
+            on_progress(checked, len(entries))
+
+    if on_progress:
+        on_progress(checked, len(entries))
+    await asyncio.gather(*(check_batch(batch) for batch in batches))
+    updates.sort(key=lambda update: update["mod"].get("name", "").lower())
+    print(f"[Updates] {len(updates)} update(s) for {len(entries)} installed mod(s) "
+          f"({len(candidates)} checked online)")
+    return updates
+
+
+def install_updates(updates, mods_dir, manager=None):
+    """Queue updates on the download manager; returns {mod_id: task_id}."""
+    manager = manager or get_download_manager()
+    manifest = get_install_manifest(mods_dir)
+    task_ids = {}
+    for update in updates:
+        task_ids[update["mod"]["mod_id"]] = manager.enqueue(
+            update["mod"],
+            mods_dir,
+            file_info=update["file_info"],
+            replace_folder=manifest.folder_path(update["entry"])
+        )
+    return task_ids
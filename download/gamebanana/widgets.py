@@ -1,14 +1,23 @@
 import webbrowser
-import requests
 import os
-import threading
-from PIL import Image, ImageTk
-from io import BytesIO
+from collections import OrderedDict
+from PIL import ImageTk
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 
-from download.gamebanana.gb_download import download_and_install_mod, format_filesize
-from download.gamebanana.api import get_mod_files
+from download.gamebanana.gb_download import format_filesize
+from download.gamebanana.download_manager import (
+    get_download_manager,
+    FINISHED_STATES,
+    STATE_QUEUED,
+    STATE_RUNNING,
+    STATE_PAUSED,
+    STATE_COMPLETED,
+    STATE_CANCELLED,
+)
+from download.gamebanana.progress import get_progress_aggregator, format_eta
+from download.gamebanana.async_client import get_async_client
+from download.gamebanana.manifest import get_install_manifest
 
 # Import theme_manager from parent package
 try:
@@ -18,206 +27,454 @@ except ImportError:
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
     from theme_manager import get_platform_font
 
+CARD_ROW_HEIGHT = 176  # Fixed card slot height in the virtual list (card + gap)
+CARD_GAP = 10
+CARD_PADX = 10
+THUMBNAIL_SIZE = (64, 64)
+THUMBNAIL_CACHE_SIZE = 300  # PhotoImages kept for recycled cards
+NAME_MAX_CHARS = 70
+
+# url -> ImageTk.PhotoImage, least recently used first
+_thumbnail_cache = OrderedDict()
+# url -> callbacks waiting on an in-flight fetch
+_thumbnail_waiters = {}
+
+
+def _cached_thumbnail(url):
+    image = _thumbnail_cache.get(url)
+    if image is not None:
+        _thumbnail_cache.move_to_end(url)
+    return image
+
+
+def _cache_thumbnail(url, image):
+    _thumbnail_cache[url] = image
+    _thumbnail_cache.move_to_end(url)
+    while len(_thumbnail_cache) > THUMBNAIL_CACHE_SIZE:
+        _thumbnail_cache.popitem(last=False)
+
+
+def thumbnail_cached(url):
+    return url in _thumbnail_cache
+
+
+def load_thumbnail(url, widget, callback=None, retry_on_cancel=True):
+    """
+    Get the thumbnail for url through the cache, fetching it if needed.
+
+    callback(image) runs on the Tk thread with a PhotoImage, or None on
+    failure. Concurrent requests for the same url share one fetch. Results
+    are delivered through the Tk root, so a fetch outlives the widget that
+    started it. If the fetch is cancelled, it is restarted for callbacks
+    registered with retry_on_cancel (cards on screen) and dropped for the
+    rest (prefetches). Returns the fetch future, or None if the image was
+    cached or already in flight.
+    """
+    image = _cached_thumbnail(url)
+    if image is not None:
+        if callback:
+            callback(image)
+        return None
+
+    waiter = (callback, retry_on_cancel)
+    if url in _thumbnail_waiters:
+        _thumbnail_waiters[url].append(waiter)
+        return None
+    _thumbnail_waiters[url] = [waiter]
+
+    def on_image(pil_img, error):
+        tk_img = None
+        if error is None:
+            tk_img = ImageTk.PhotoImage(pil_img)
+            _cache_thumbnail(url, tk_img)
+        for waiter_callback, _ in _thumbnail_waiters.pop(url, []):
+            if not waiter_callback:
+                continue
+            try:
+                waiter_callback(tk_img)
+            except Exception as e:
+                print(f"[Widgets] Thumbnail callback error: {e}")
 
-def render_mod_card(parent, mod: dict, mods_dir=None, on_download_complete=None):
-    """Render a mod card with download functionality."""
-    font = get_platform_font()
+    root = widget.nametowidget(".")
+    client = get_async_client()
+    future = client.submit(client.fetch_image(url, size=THUMBNAIL_SIZE), on_done=on_image, widget=root)
 
-    frame = tb.Frame(parent, padding=10, bootstyle="dark")
-    frame.pack(fill="x", padx=10, pady=5, anchor="n")
+    def on_done(fut):
+        if fut.cancelled():
+            try:
+                root.after(0, _retry_thumbnail, url, root)
+            except Exception:
+                _thumbnail_waiters.pop(url, None)  # App shutting down
 
-    # Top row: image + info
-    top_row = tb.Frame(frame)
-    top_row.pack(fill="x")
+    future.add_done_callback(on_done)
+    return future
 
-    # Image
-    img_frame = tb.Frame(top_row, width=64, height=64)
-    img_frame.pack(side="left", padx=(0, 10))
-    img_frame.pack_propagate(False)
 
-    # Placeholder
-    img_label = tb.Label(img_frame, text="🎮", font=(font, 20))
-    img_label.pack(expand=True)
+def _retry_thumbnail(url, widget):
+    """A cancelled fetch never reports back; refetch for any cards still waiting on it."""
+    for callback, retry in _thumbnail_waiters.pop(url, []):
+        if callback and retry:
+            load_thumbnail(url, widget, callback)
 
-    # Load image in background
-    if mod.get("image_url"):
-        def load_image():
-            try:
-                img_data = requests.get(mod["image_url"], timeout=5).content
-                pil_img = Image.open(BytesIO(img_data)).resize((64, 64))
-                tk_img = ImageTk.PhotoImage(pil_img)
-                if not hasattr(parent, "_images"):
-                    parent._images = []
-                parent._images.append(tk_img)
-
-                def update():
-                    img_label.config(image=tk_img, text="")
-                    img_label.image = tk_img
-
-                frame.after(0, update)
-            except Exception:
-                pass
-
-        threading.Thread(target=load_image, daemon=True).start()
-
-    # Info section
-    info_frame = tb.Frame(top_row)
-    info_frame.pack(side="left", fill="both", expand=True)
-
-    # Name
-    tb.Label(
-        info_frame,
-        text=mod.get("name", "Unknown"),
-        font=(font, 10, "bold"),
-        wraplength=400,
-        anchor="w"
-    ).pack(anchor="w")
-
-    # Author
-    tb.Label(
-        info_frame,
-        text=f"by {mod.get('author', 'Unknown')}",
-        font=(font, 9),
-        anchor="w"
-    ).pack(anchor="w")
-
-    # Stats row
-    stats_frame = tb.Frame(info_frame)
-    stats_frame.pack(anchor="w", pady=(2, 0))
-
-    category = mod.get("category", "")
-    if category:
-        tb.Label(stats_frame, text=category, font=(font, 8), bootstyle="info").pack(side="left", padx=(0, 8))
-
-    views = mod.get("view_count", 0)
-    if views:
-        view_str = f"{views/1000:.1f}k" if views >= 1000 else str(views)
-        tb.Label(stats_frame, text=f"👁 {view_str}", font=(font, 8)).pack(side="left", padx=(0, 8))
-
-    likes = mod.get("like_count", 0)
-    if likes:
-        like_str = f"{likes/1000:.1f}k" if likes >= 1000 else str(likes)
-        tb.Label(stats_frame, text=f"❤ {like_str}", font=(font, 8)).pack(side="left")
-
-    # Button row
-    btn_frame = tb.Frame(frame)
-    btn_frame.pack(fill="x", pady=(8, 0))
-
-    # State for this card
-    card_state = {"downloading": False, "files": None}
-
-    # Status label
-    status_label = tb.Label(frame, text="", font=(font, 8), anchor="w")
-
-    # Progress bar (created but not packed)
-    progress_bar = tb.Progressbar(frame, mode="determinate", bootstyle="success-striped", maximum=100)
-
-    def start_download():
-        if card_state["downloading"]:
+
+def _short_count(value):
+    return f"{value/1000:.1f}k" if value >= 1000 else str(value)
+
+
+class ModCard:
+    """
+    A reusable mod card.
+
+    The widget tree is built once; bind() points it at another mod, so a
+    virtual list can recycle a small pool of cards while scrolling.
+    """
+
+    def __init__(self, parent, mods_dir=None):
+        self.mods_dir = mods_dir
+        self.mod = None
+        self.task_id = None
+        self.manager = get_download_manager()
+        font = get_platform_font()
+
+        self.frame = frame = tb.Frame(parent, padding=10, bootstyle="dark")
+        self.aggregator = get_progress_aggregator(frame)
+
+        # Top row: image + info
+        top_row = tb.Frame(frame)
+        top_row.pack(fill="x")
+
+        img_frame = tb.Frame(top_row, width=THUMBNAIL_SIZE[0], height=THUMBNAIL_SIZE[1])
+        img_frame.pack(side="left", padx=(0, 10))
+        img_frame.pack_propagate(False)
+
+        self.img_label = tb.Label(img_frame, text="🎮", font=(font, 20))
+        self.img_label.pack(expand=True)
+
+        info_frame = tb.Frame(top_row)
+        info_frame.pack(side="left", fill="both", expand=True)
+
+        self.name_label = tb.Label(info_frame, font=(font, 10, "bold"), anchor="w")
+        self.name_label.pack(anchor="w")
+
+        self.author_label = tb.Label(info_frame, font=(font, 9), anchor="w")
+        self.author_label.pack(anchor="w")
+
+        # Stats row
+        stats_frame = tb.Frame(info_frame)
+        stats_frame.pack(anchor="w", pady=(2, 0))
+        self.category_label = tb.Label(stats_frame, font=(font, 8), bootstyle="info")
+        self.category_label.pack(side="left", padx=(0, 8))
+        self.views_label = tb.Label(stats_frame, font=(font, 8))
+        self.views_label.pack(side="left", padx=(0, 8))
+        self.likes_label = tb.Label(stats_frame, font=(font, 8))
+        self.likes_label.pack(side="left")
+
+        # Button row
+        btn_frame = tb.Frame(frame)
+        btn_frame.pack(fill="x", pady=(8, 0))
+
+        self.download_btn = tb.Button(btn_frame, text="⬇ Download", bootstyle="primary", cursor="hand2",
+                                      command=self.start_download)
+        self.download_btn.pack(side="left", padx=(0, 5))
+
+        # Pause / cancel (shown while a download is queued or running)
+        self.pause_btn = tb.Button(btn_frame, text="⏸ Pause", bootstyle="secondary-outline", cursor="hand2",
+                                   command=self.toggle_pause)
+        self.cancel_btn = tb.Button(btn_frame, text="✕ Cancel", bootstyle="danger-outline", cursor="hand2",
+                                    command=self.cancel_download)
+
+        # GameBanana link
+        tb.Button(
+            btn_frame,
+            text="🌐 View",
+            bootstyle="info-outline",
+            cursor="hand2",
+            command=lambda: self.mod and webbrowser.open_new(self.mod.get("url", ""))
+        ).pack(side="left")
+
+        self.status_label = tb.Label(frame, text="", font=(font, 8), anchor="w")
+        self.progress_bar = tb.Progressbar(frame, mode="determinate", bootstyle="success-striped", maximum=100)
+
+        frame.bind("<Destroy>", self._on_destroy, add="+")
+
+    # ---- Binding ----
+
+    def bind(self, mod):
+        """Show mod in this card, replacing whatever it showed before."""
+        self.unbind()
+        self.mod = mod
+
+        name = mod.get("name", "Unknown")
+        if len(name) > NAME_MAX_CHARS:
+            name = name[:NAME_MAX_CHARS - 1] + "…"
+        self.name_label.config(text=name)
+        self.author_label.config(text=f"by {mod.get('author', 'Unknown')}")
+        self.category_label.config(text=mod.get("category", ""))
+        views = mod.get("view_count", 0)
+        self.views_label.config(text=f"👁 {_short_count(views)}" if views else "")
+        likes = mod.get("like_count", 0)
+        self.likes_label.config(text=f"❤ {_short_count(likes)}" if likes else "")
+
+        self._bind_image(mod)
+        self._bind_download_state(mod)
+
+    def unbind(self):
+        """Detach from the current mod (its download keeps running)."""
+        self.aggregator.unsubscribe(self.on_task_update)
+        self.task_id = None
+        self.mod = None
+
+    def _bind_image(self, mod):
+        self.img_label.config(image="", text="🎮")
+        url = mod.get("image_url")
+        if not url:
+            return
+
+        def on_image(tk_img):
+            if tk_img is not None and self.mod is mod and self.img_label.winfo_exists():
+                self.img_label.config(image=tk_img, text="")
+
+        load_thumbnail(url, self.frame, on_image)
+
+    def _bind_download_state(self, mod):
+        self.progress_bar.pack_forget()
+        self.status_label.pack_forget()
+        self.pause_btn.pack_forget()
+        self.cancel_btn.pack_forget()
+
+        if not mod.get("has_files", True) or not self.mods_dir:
+            self.download_btn.config(text="No files", state="disabled", bootstyle="secondary")
             return
+        self.download_btn.config(text="⬇ Download", state="normal", bootstyle="primary")
 
-        if not mods_dir:
-            status_label.config(text="Error: Mods directory not set")
-            status_label.pack(fill="x", pady=(5, 0))
+        # Pick up a download started while another card showed this mod
+        snapshot = self.manager.find_task(mod.get("mod_id"))
+        if snapshot is None or snapshot["state"] in FINISHED_STATES:
+            if get_install_manifest(self.mods_dir).is_installed(mod.get("mod_id")):
+                self.download_btn.config(text="✓ Installed", state="disabled", bootstyle="success")
+            return
+        self._show_active()
+        self.task_id = snapshot["task_id"]
+        self.aggregator.subscribe(self.on_task_update, task_id=self.task_id)
+
+    def _show_active(self):
+        self.status_label.pack(fill="x", pady=(5, 0))
+        self.progress_bar.pack(fill="x", pady=(5, 0))
+        self.cancel_btn.pack(side="left", padx=(0, 5), after=self.download_btn)
+        self.pause_btn.pack(side="left", padx=(0, 5), after=self.download_btn)
+
+    # ---- Download control ----
+
+    def on_task_update(self, snapshot):
+        """Apply a coalesced progress view to this card (Tk thread, ~10 Hz)."""
+        state = snapshot["state"]
+
+        if state in (STATE_QUEUED, STATE_RUNNING, STATE_PAUSED):
+            self.download_btn.config(state="disabled", text="Queued..." if state == STATE_QUEUED else "Downloading...")
+            self.pause_btn.config(text="▶ Resume" if state == STATE_PAUSED else "⏸ Pause")
+            total = snapshot["total"]
+            if state == STATE_RUNNING and total > 0:
+                self.progress_bar.config(value=(snapshot["downloaded"] / total) * 100)
+                if snapshot["downloaded"] < total:
+                    text = f"Downloading: {format_filesize(snapshot['downloaded'])} / {format_filesize(total)}"
+                    if snapshot["rate"] > 0:
+                        text += f" — {format_filesize(int(snapshot['rate']))}/s, {format_eta(snapshot['eta'])} left"
+                    self.status_label.config(text=text)
+                else:
+                    self.status_label.config(text=snapshot["status"])
+            else:
+                self.status_label.config(text=snapshot["status"])
             return
 
-        if not mod.get("has_files", True):
-            status_label.config(text="No files available for this mod")
-            status_label.pack(fill="x", pady=(5, 0))
+        # Finished
+        self.aggregator.unsubscribe(self.on_task_update)
+        self.task_id = None
+        self.progress_bar.pack_forget()
+        self.pause_btn.pack_forget()
+        self.cancel_btn.pack_forget()
+        if state == STATE_COMPLETED:
+            self.download_btn.config(text="✓ Installed", state="disabled", bootstyle="success")
+            self.status_label.config(text=snapshot["message"])
+        elif state == STATE_CANCELLED:
+            self.download_btn.config(text="⬇ Download", state="normal", bootstyle="primary")
+            self.status_label.config(text="Cancelled")
+        else:
+            self.download_btn.config(text="⬇ Retry", state="normal", bootstyle="warning")
+            self.status_label.config(text=f"Failed: {snapshot['message']}")
+
+    def start_download(self):
+        if self.task_id is not None or self.mod is None:
             return
 
-        card_state["downloading"] = True
-        download_btn.config(state="disabled", text="Loading...")
-        status_label.config(text="Fetching file info...")
-        status_label.pack(fill="x", pady=(5, 0))
+        if not self.mods_dir:
+            self.status_label.config(text="Error: Mods directory not set")
+            self.status_label.pack(fill="x", pady=(5, 0))
+            return
 
-        def fetch_and_download():
-            try:
-                # Fetch files if not already loaded
-                if not card_state["files"]:
-                    card_state["files"] = get_mod_files(mod["mod_id"])
-
-                files = card_state["files"]
-                if not files:
-                    frame.after(0, lambda: (
-                        status_label.config(text="No downloadable files found"),
-                        download_btn.config(state="normal", text="⬇ Download")
-                    ))
-                    card_state["downloading"] = False
-                    return
-
-                file_info = files[0]  # Use first file
-
-                def update_progress(downloaded, total):
-                    if total > 0:
-                        pct = (downloaded / total) * 100
-                        # Capture values to avoid thread-unsafe closure
-                        frame.after(0, lambda v=pct: progress_bar.config(value=v))
-                        frame.after(0, lambda d=downloaded, t=total: status_label.config(
-                            text=f"Downloading: {format_filesize(d)} / {format_filesize(t)}"
-                        ))
-
-                def update_status(msg):
-                    frame.after(0, lambda: status_label.config(text=msg))
-
-                def on_complete(success, msg):
-                    def update():
-                        progress_bar.pack_forget()
-                        card_state["downloading"] = False
-                        if success:
-                            download_btn.config(text="✓ Installed", state="disabled", bootstyle="success")
-                            status_label.config(text=msg)
-                            if on_download_complete:
-                                on_download_complete()
-                        else:
-                            download_btn.config(text="⬇ Retry", state="normal", bootstyle="warning")
-                            status_label.config(text=f"Failed: {msg}")
-
-                    frame.after(0, update)
-
-                # Show progress bar
-                frame.after(0, lambda: progress_bar.pack(fill="x", pady=(5, 0)))
-
-                # Pass mod name for subfolder creation
-                callbacks = {
-                    "on_progress": update_progress,
-                    "on_status": update_status,
-                    "on_complete": on_complete,
-                    "on_error": lambda m: frame.after(0, lambda: status_label.config(text=f"Error: {m}"))
-                }
-
-                download_and_install_mod(mod, file_info, mods_dir, callbacks)
+        if not self.mod.get("has_files", True):
+            self.status_label.config(text="No files available for this mod")
+            self.status_label.pack(fill="x", pady=(5, 0))
+            return
 
-            except Exception as e:
-                frame.after(0, lambda: (
-                    status_label.config(text=f"Error: {e}"),
-                    download_btn.config(state="normal", text="⬇ Retry", bootstyle="warning")
-                ))
-                card_state["downloading"] = False
+        self.download_btn.config(state="disabled", text="Queued...")
+        self.status_label.config(text="Queued")
+        self.progress_bar.config(value=0)
+        self._show_active()
 
-        threading.Thread(target=fetch_and_download, daemon=True).start()
+        self.task_id = self.manager.enqueue(self.mod, self.mods_dir)
+        self.aggregator.subscribe(self.on_task_update, task_id=self.task_id)
 
-    # Download button
-    if mod.get("has_files", True) and mods_dir:
-        download_btn = tb.Button(
-            btn_frame,
-            text="⬇ Download",
-            bootstyle="primary",
-            cursor="hand2",
-            command=start_download
+    def toggle_pause(self):
+        if self.task_id is None:
+            return
+        if not self.manager.pause(self.task_id):
+            self.manager.resume(self.task_id)
+
+    def cancel_download(self):
+        if self.task_id is not None:
+            self.manager.cancel(self.task_id)
+
+    def _on_destroy(self, event):
+        if event.widget is self.frame:
+            self.aggregator.unsubscribe(self.on_task_update)
+
+
+class VirtualCardList:
+    """
+    Scrollable list of mod cards that only builds cards near the viewport.
+
+    Every item gets a fixed row_height slot on the canvas. Cards whose
+    slots scroll out of view go back to a pool and are rebound to the slots
+    scrolling in, so the widget count is bounded by the window height
+    rather than by the number of loaded mods.
+    """
+
+    def __init__(self, canvas, scrollbar, card_factory, row_height=CARD_ROW_HEIGHT, overscan=2,
+                 on_range_changed=None):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.card_factory = card_factory  # card_factory(parent) -> ModCard
+        self.on_range_changed = on_range_changed  # on_range_changed(first, last) after each refresh
+        self.row_height = row_height
+        self.overscan = overscan  # Extra rows kept bound above and below the viewport
+        self.items = []
+        self._bound = {}  # item index -> card
+        self._free = []  # unbound cards
+        self._windows = {}  # card -> canvas window id
+        self._footer = None
+        self._footer_window = None
+        self._footer_height = 0
+        self._refresh_pending = False
+
+        canvas.configure(yscrollcommand=self._on_yscroll)
+        canvas.bind("<Configure>", self._on_configure, add="+")
+
+    # ---- Items ----
+
+    def set_items(self, items):
+        """Replace all items and scroll back to the top."""
+        self._release_all()
+        self.items = list(items)
+        self._update_scrollregion()
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def append_items(self, items):
+        self.items.extend(items)
+        self._update_scrollregion()
+        self.refresh()
+
+    def clear(self):
+        self.set_items([])
+        self.set_footer(None)
+
+    def set_footer(self, widget, height=60):
+        """Show widget (a child of the canvas) below the last item; None removes it."""
+        if self._footer is not None:
+            self.canvas.delete(self._footer_window)
+            self._footer.destroy()
+        self._footer = widget
+        self._footer_window = None
+        self._footer_height = height if widget is not None else 0
+        if widget is not None:
+            self._footer_window = self.canvas.create_window(
+                0, len(self.items) * self.row_height, window=widget, anchor="nw",
+                width=self.canvas.winfo_width(), height=height
+            )
+        self._update_scrollregion()
+
+    # ---- Viewport ----
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_refresh()
+
+    def _on_configure(self, event):
+        for window_id in self._windows.values():
+            self.canvas.itemconfig(window_id, width=event.width - 2 * CARD_PADX)
+        if self._footer_window is not None:
+            self.canvas.itemconfig(self._footer_window, width=event.width)
+        self._update_scrollregion()
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.canvas.after_idle(self.refresh)
+
+    def _update_scrollregion(self):
+        height = len(self.items) * self.row_height + self._footer_height
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), max(height, 1)))
+        if self._footer_window is not None:
+            self.canvas.coords(self._footer_window, 0, len(self.items) * self.row_height)
+
+    def visible_range(self):
+        """Return (first, last) indexes of the rows in and near the viewport, last exclusive."""
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.row_height)
+        first = max(0, int(top // self.row_height) - self.overscan)
+        last = min(len(self.items), int((top + height) // self.row_height) + 1 + self.overscan)
+        return first, last
+
+    def refresh(self):
+        """Bind cards to the rows in and near the viewport and release the rest."""
+        self._refresh_pending = False
+        try:
+            first, last = self.visible_range()
+        except Exception:
+            return  # Canvas destroyed
+
+        for index in [i for i in self._bound if i < first or i >= last]:
+            self._release(index)
+
+        width = self.canvas.winfo_width() - 2 * CARD_PADX
+        for index in range(first, last):
+            if index in self._bound:
+                continue
+            card = self._free.pop() if self._free else self._new_card()
+            window_id = self._windows[card]
+            card.bind(self.items[index])
+            self.canvas.coords(window_id, CARD_PADX, index * self.row_height + CARD_GAP // 2)
+            self.canvas.itemconfig(window_id, state="normal", width=width)
+            self._bound[index] = card
+
+        if self.on_range_changed:
+            self.on_range_changed(first, last)
+
+    def _new_card(self):
+        card = self.card_factory(self.canvas)
+        self._windows[card] = self.canvas.create_window(
+            CARD_PADX, 0, window=card.frame, anchor="nw",
+            height=self.row_height - CARD_GAP, state="hidden"
         )
-        download_btn.pack(side="left", padx=(0, 5))
-    else:
-        download_btn = tb.Label(btn_frame, text="No files", font=(font, 9))
-        download_btn.pack(side="left", padx=(0, 5))
-
-    # GameBanana link
-    tb.Button(
-        btn_frame,
-        text="🌐 View",
-        bootstyle="info-outline",
-        cursor="hand2",
-        command=lambda: webbrowser.open_new(mod.get("url", ""))
-    ).pack(side="left")
-
-    return frame
+        return card
+
+    def _release(self, index):
+        card = self._bound.pop(index)
+        card.unbind()
+        self.canvas.itemconfig(self._windows[card], state="hidden")
+        self._free.append(card)
+
+    def _release_all(self):
+        for index in list(self._bound):
+            self._release(index)
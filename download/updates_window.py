@@ -0,0 +1,169 @@
+"""
+Update window for mods installed from GameBanana.
+Checks every installed mod for a newer file and installs the updates in one batch.
+"""
+
+import os
+import sys
+import time
+import ttkbootstrap as tb
+from ttkbootstrap.constants import *
+
+from download.gamebanana.async_client import get_async_client
+from download.gamebanana.download_manager import get_download_manager, FINISHED_STATES, STATE_COMPLETED
+from download.gamebanana.progress import get_progress_aggregator
+from download.gamebanana.updates import check_for_updates, install_updates
+
+try:
+    from theme_manager import get_platform_font
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from theme_manager import get_platform_font
+
+
+def _format_date(timestamp):
+    if not timestamp:
+        return "-"
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+def open_updates_window(parent, mods_dir, on_updated=None):
+    """Check installed mods for updates; on_updated() runs after a batch install."""
+    font = get_platform_font()
+    client = get_async_client()
+    manager = get_download_manager()
+    aggregator = get_progress_aggregator(parent)
+
+    win = tb.Toplevel(parent)
+    win.title("Mod Updates")
+    win.geometry("640x420")
+    win.minsize(520, 320)
+    win.transient(parent)
+
+    state = {
+        "updates": [],
+        "task_ids": {},  # task_id -> mod_id
+        "future": None,
+    }
+
+    status_var = tb.StringVar(value="Checking installed mods for updates...")
+    tb.Label(win, textvariable=status_var, font=(font, 10)).pack(fill="x", padx=10, pady=(10, 5))
+
+    progress = tb.Progressbar(win, mode="determinate", bootstyle="info-striped")
+    progress.pack(fill="x", padx=10)
+
+    tree_frame = tb.Frame(win)
+    tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
+    tree = tb.Treeview(tree_frame, columns=("name", "installed", "available", "status"), show="headings",
+                       selectmode="none", bootstyle="info")
+    tree.heading("name", text="Mod")
+    tree.heading("installed", text="Installed")
+    tree.heading("available", text="Available")
+    tree.heading("status", text="Status")
+    tree.column("name", width=200)
+    tree.column("installed", width=110, anchor="center")
+    tree.column("available", width=110, anchor="center")
+    tree.column("status", width=200)
+    scrollbar = tb.Scrollbar(tree_frame, orient=VERTICAL, command=tree.yview)
+    tree.configure(yscrollcommand=scrollbar.set)
+    tree.pack(side="left", fill="both", expand=True)
+    scrollbar.pack(side="right", fill="y")
+
+    button_row = tb.Frame(win)
+    button_row.pack(fill="x", padx=10, pady=(0, 10))
+    close_btn = tb.Button(button_row, text="Close", bootstyle="secondary", command=lambda: on_close())
+    close_btn.pack(side="right")
+    update_btn = tb.Button(button_row, text="Update All", bootstyle="success", state="disabled",
+                           command=lambda: start_updates())
+    update_btn.pack(side="right", padx=(0, 5))
+    recheck_btn = tb.Button(button_row, text="Check Again", bootstyle="info-outline", state="disabled",
+                            command=lambda: start_check())
+    recheck_btn.pack(side="left")
+
+    # ---- Checking ----
+
+    def on_check_progress(checked, total):
+        # Called on the client loop thread
+        try:
+            win.after(0, lambda: progress.configure(maximum=max(total, 1), value=checked))
+        except Exception:
+            pass
+
+    def start_check():
+        update_btn.configure(state="disabled")
+        recheck_btn.configure(state="disabled")
+        tree.delete(*tree.get_children())
+        status_var.set("Checking installed mods for updates...")
+        progress.configure(value=0)
+        state["future"] = client.submit(check_for_updates(mods_dir, on_progress=on_check_progress),
+                                        on_done=on_checked, widget=win)
+
+    def on_checked(updates, error):
+        if not win.winfo_exists():
+            return
+        recheck_btn.configure(state="normal")
+        if error:
+            status_var.set(f"Update check failed: {error}")
+            return
+        state["updates"] = updates
+        for update in updates:
+            mod_id = update["mod"]["mod_id"]
+            tree.insert("", "end", iid=str(mod_id), values=(
+                update["mod"].get("name", "Unknown Mod"),
+                _format_date(update["entry"].get("date_updated")),
+                _format_date(update["mod"].get("date_updated")),
+                "Update available"
+            ))
+        if updates:
+            status_var.set(f"{len(updates)} update(s) available")
+            update_btn.configure(state="normal")
+        else:
+            status_var.set("All installed mods are up to date")
+
+    # ---- Installing ----
+
+    def start_updates():
+        if not state["updates"]:
+            return
+        update_btn.configure(state="disabled")
+        recheck_btn.configure(state="disabled")
+        task_ids = install_updates(state["updates"], mods_dir, manager)
+        state["task_ids"] = {task_id: mod_id for mod_id, task_id in task_ids.items()}
+        progress.configure(maximum=len(task_ids), value=0)
+        status_var.set(f"Updating {len(task_ids)} mod(s)...")
+        aggregator.subscribe(on_progress_views)
+
+    def on_progress_views(views):
+        # Keeps running after the window closes so on_updated still fires
+        alive = win.winfo_exists()
+        for task_id, view in views.items():
+            mod_id = state["task_ids"].get(task_id)
+            if alive and mod_id is not None and tree.exists(str(mod_id)):
+                tree.set(str(mod_id), "status", view["status"])
+
+        finished = [manager.get_task(task_id) for task_id in state["task_ids"]]
+        done = [task for task in finished if task and task["state"] in FINISHED_STATES]
+        if alive:
+            progress.configure(value=len(done))
+        if len(done) < len(state["task_ids"]):
+            return
+
+        aggregator.unsubscribe(on_progress_views)
+        updated = sum(1 for task in done if task["state"] == STATE_COMPLETED)
+        failed = len(done) - updated
+        print(f"[Updates] Updated {updated} mod(s), {failed} failed")
+        state["updates"] = []
+        state["task_ids"] = {}
+        if alive:
+            status_var.set(f"Updated {updated} mod(s)" + (f", {failed} failed" if failed else ""))
+            recheck_btn.configure(state="normal")
+        if updated and on_updated:
+            on_updated()
+
+    def on_close():
+        if state["future"] is not None:
+            state["future"].cancel()
+        win.destroy()
+
+    win.protocol("WM_DELETE_WINDOW", on_close)
+    start_check()
@@ -3,7 +3,9 @@ import sys
 import json
 import zipfile
 from tkinter import filedialog, messagebox
-import threading
+from download.gamebanana.sources import find_sources
+from scheduler import get_scheduler, USER_INITIATED
+from modpack_archive import write_modpack, read_manifest_file, preview_modpack, extract_modpack, format_rate
 
 if getattr(sys, 'frozen', False):
     # Packaged exe
@@ -22,11 +24,33 @@ def load_data():
         messagebox.showerror("Error reading data", f"Can't load data: {e}")
         return None
 
-def export_selected_modpack(window, status_var):
+def export_selected_modpack(window, status_var, delta=False, references=False):
+    """
+    Export the selected modpack; with delta, only what changed since a previous export.
+    With references, mods installed from GameBanana are exported as references only.
+    """
+    base_manifest = None
+    if delta:
+        base_path = filedialog.askopenfilename(
+            title="Select the previous export of this modpack",
+            filetypes=[("Modpack ZIP", "*.zip")],
+        )
+        if not base_path:
+            return
+        try:
+            base_manifest = read_manifest_file(base_path)
+        except (OSError, zipfile.BadZipFile) as e:
+            messagebox.showerror("Error", f"Can't read the previous export:\n{e}")
+            return
+        if base_manifest is None:
+            messagebox.showerror("Error", "The previous export has no checksum manifest.\n"
+                                          "Export the full modpack once with this version of Saildeck first.")
+            return
+
     export_path = filedialog.asksaveasfilename(
         defaultextension=".zip",
         filetypes=[("ZIP file", "*.zip")],
-        title="Export modpack as..."
+        title="Export modpack update as..." if delta else "Export modpack as..."
     )
     if not export_path:
         return
@@ -55,27 +79,42 @@ def export_selected_modpack(window, status_var):
 
         update_status(f"📦 Exporting modpack '{modpack_name}' ...")
 
+        def on_progress(done, total, rate):
+            percent = done * 100 // total if total else 100
+            update_status(f"📦 Exporting '{modpack_name}': {percent}% ({format_rate(rate)})")
+
         try:
             # Sort relative paths (folders + files) alphabetically
             sorted_mods = sorted(mod_paths, key=lambda p: p.lower())
-
-            with zipfile.ZipFile(export_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for i, mod_rel_path in enumerate(sorted_mods):
-                    mod_full_path = os.path.join(mods_root, mod_rel_path)
-                    if os.path.isfile(mod_full_path):
-                        base_name = os.path.basename(mod_full_path)
-                        prefix = f"{i:04d}-"  # Ex: 0000-, 0001-, ...
-                        arcname = prefix + base_name
-                        zipf.write(mod_full_path, arcname)
-                        update_status(f"✅ Exported ({i+1}/{len(sorted_mods)}) : {arcname}")
-                    else:
-                        update_status(f"⚠️ Can't find files: {mod_rel_path}")
-
-            update_status(f"✅ Finished export: '{modpack_name}'")
+            mod_files = []
+            for i, mod_rel_path in enumerate(sorted_mods):
+                base_name = os.path.basename(mod_rel_path)
+                prefix = f"{i:04d}-"  # Ex: 0000-, 0001-, ...
+                mod_files.append((prefix + base_name, os.path.join(mods_root, mod_rel_path), mod_rel_path))
+
+            sources = find_sources(mods_root, sorted_mods) if references else None
+            summary = write_modpack(mod_files, export_path, name=modpack_name, on_progress=on_progress,
+                                    base_manifest=base_manifest, sources=sources)
+
+            details = f"{summary['files']} files, {format_rate(summary['rate'])}"
+            if delta:
+                changed = summary["files"] - summary["unchanged"]
+                details = f"{changed} changed, {summary['removed']} removed, {format_rate(summary['rate'])}"
+            if references:
+                details = (f"{summary['referenced']} from GameBanana, "
+                           f"{summary['files'] - summary['referenced']} embedded, "
+                           f"{summary['bytes_written'] / 1024:.0f} KB")
+            if summary["duplicates"]:
+                details += f", {summary['duplicates']} duplicates stored once"
+            if summary["missing"]:
+                update_status(f"⚠️ Exported '{modpack_name}' ({details}); can't find {len(summary['missing'])} file(s): "
+                              + ", ".join(summary["missing"][:3]))
+            else:
+                update_status(f"✅ Finished export: '{modpack_name}' ({details})")
         except Exception as e:
             update_status(f"❌ Error exporting: {e}")
 
-    threading.Thread(target=export_task, daemon=True).start()
+    get_scheduler().submit(export_task, priority=USER_INITIATED, name="export modpack")
 
 def import_modpack(window):
     if not hasattr(window, "mods_dir") or not os.path.isdir(window.mods_dir):
@@ -95,38 +134,62 @@ def import_modpack(window):
         return
 
     modpack_name = os.path.splitext(os.path.basename(filepath))[0]
-    target_dir = os.path.join(window.mods_dir, modpack_name)
 
-    if os.path.exists(target_dir):
-        confirm = messagebox.askyesno("Overwrite?", f"The folder '{modpack_name}' already exists. Overwrite it?")
-        if not confirm:
-            window.status_var.set("⚠️ Import cancelled (folder already exists).")
+    # Preview from the central directory before touching anything
+    try:
+        preview = preview_modpack(filepath, window.mods_dir, modpack_name)
+    except (OSError, zipfile.BadZipFile) as e:
+        window.status_var.set(f"❌ Can't read modpack: {e}")
+        return
+
+    lines = [f"{preview['files']} files, {preview['total_size'] / (1024 * 1024):.1f} MB"]
+    if preview["delta"]:
+        # Updates apply on top of the installed pack they were exported against
+        if not preview["base_folder"]:
+            messagebox.showerror("Import modpack", "This is an update for a modpack that isn't installed, "
+                                                   "or whose files have changed since it was imported.")
+            window.status_var.set("❌ No installed modpack matches this update.")
             return
-        import shutil
-        shutil.rmtree(target_dir)
+        modpack_name = os.path.basename(preview["base_folder"])
+        lines[0] = f"{preview['files']} new or changed files, {preview['total_size'] / (1024 * 1024):.1f} MB"
+        lines.append(f"{preview['unchanged']} unchanged, {preview['removed']} removed")
+    elif preview["target_exists"]:
+        lines.append(f"The folder '{modpack_name}' already exists and will be replaced.")
+    if preview["conflicts"]:
+        shown = "\n".join(f"  • {path}" for path in preview["conflicts"][:8])
+        more = len(preview["conflicts"]) - 8
+        lines.append(f"Already installed elsewhere ({len(preview['conflicts'])}):\n{shown}"
+                     + (f"\n  … and {more} more" if more > 0 else ""))
+    if preview["referenced"]:
+        download = f", {preview['downloads']} to download" if preview["downloads"] else ", all found locally"
+        lines.append(f"{preview['referenced']} files come from GameBanana{download}.")
+    if not preview["has_manifest"]:
+        lines.append("This pack has no checksum manifest; files can't be verified.")
+    question = f"Update '{modpack_name}'?" if preview["delta"] else f"Import '{modpack_name}'?"
+    if not messagebox.askyesno("Import modpack", question + "\n\n" + "\n\n".join(lines)):
+        window.status_var.set("⚠️ Import cancelled.")
+        return
+
+    def update_status(text):
+        window.after(0, lambda: window.status_var.set(text))
 
-    os.makedirs(target_dir, exist_ok=True)
+    def on_progress(done, total, rate):
+        percent = done * 100 // total if total else 100
+        update_status(f"📥 Importing '{modpack_name}': {percent}% ({format_rate(rate)})")
 
     def import_task():
         try:
-            with zipfile.ZipFile(filepath, 'r') as zipf:
-                members = zipf.namelist()
-                total = len(members)
-                for i, member in enumerate(members, 1):
-                    # Extract single file/folder
-                    zipf.extract(member, target_dir)
-
-                    # Update status
-                    display_name = os.path.basename(member.rstrip('/\\'))
-                    if display_name:  # ignore empty names (folders usually end with /)
-                        window.after(0, lambda text=f"📥 Imported ({i}/{total}): {display_name}": window.status_var.set(text))
-                        # Refresh mod list after each file extracted
-                        window.after(0, window.refresh_mod_list)
-
-            window.after(0, lambda: window.status_var.set(f"✅ Import complete in '{modpack_name}/'"))
+            summary = extract_modpack(filepath, window.mods_dir, modpack_name, on_progress=on_progress,
+                                      on_status=lambda msg: update_status(f"📥 {msg}"))
+            rel_folder = os.path.relpath(summary["folder"], window.mods_dir)
+            verified = ", verified" if summary["verified"] else ""
+            window.after(0, lambda: window.request_refresh(summary["folder"]))
+            update_status(f"✅ Import complete in '{rel_folder}/' ({summary['files']} files, "
+                          f"{format_rate(summary['rate'])}{verified})")
             window.after(0, lambda: messagebox.showinfo("Import successful", f"Modpack '{modpack_name}' imported successfully."))
         except Exception as e:
-            window.after(0, lambda: window.status_var.set(f"❌ Import failed: {e}"))
-            window.after(0, lambda: messagebox.showerror("Import Error", str(e)))
+            msg = str(e)
+            update_status(f"❌ Import failed: {msg}")
+            window.after(0, lambda: messagebox.showerror("Import Error", msg))
 
-    threading.Thread(target=import_task, daemon=True).start()
\ No newline at end of file
+    get_scheduler().submit(import_task, priority=USER_INITIATED, name="import modpack")
@@ -11,10 +11,15 @@ from utils import get_mods_folder
 from menubar import init_menubar
 from launch import launch_game
 from download.downloader_window import open_downloader_window
+from download.gamebanana.staging import cleanup_staging
+from download.gamebanana.download_manager import get_download_manager, STATE_COMPLETED
 from save_modpacks import save_modpack, list_modpacks, load_modpack
-from delete import delete_mod
+from delete import confirm_delete, trash_path
 from platform_handler import get_platform_handler
 from theme_manager import get_theme_manager, get_platform_font
+from scheduler import get_scheduler, Cancelled, BACKGROUND, INTERACTIVE
+from ui_watchdog import apply_watchdog_setting, stop_watchdog
+from tracing import traced, save_requested_trace
 
 if sys.platform == "win32":
     import ctypes
@@ -28,6 +33,25 @@ if sys.platform == "win32":
         except Exception:
             pass
 
+OPERATION_PROGRESS_INTERVAL = 0.1  # Seconds between status bar progress updates
+REFRESH_COALESCE_MS = 16  # Refresh requests within one frame are merged
+
+
+@traced("folder_states", cat="scan")
+def _folder_states(mods, mods_dir):
+    """Map each folder (node id, "" for the mods folder) to (has_enabled, has_disabled)."""
+    states = {}
+    for mod in mods:
+        rel_dir = os.path.dirname(os.path.normpath(os.path.relpath(mod["path"], mods_dir)))
+        while True:
+            has_enabled, has_disabled = states.get(rel_dir, (False, False))
+            states[rel_dir] = (has_enabled or mod["enabled"], has_disabled or not mod["enabled"])
+            if not rel_dir:
+                break
+            rel_dir = os.path.dirname(rel_dir)
+    return states
+
+
 def normalize_path(path):
     # Normalise le chemin Windows, remplace les slashes par backslashes
     path = os.path.normpath(path)
@@ -93,11 +117,29 @@ class ModManagerGUI(tb.Window):
         self.mods_dir = get_mods_folder(game_dir)
         self.mods = []
 
+        # Drop leftovers of interrupted sessions as a deferred background job; items
+        # touched since startup (installs already running) are skipped
+        get_scheduler().submit(cleanup_staging, self.mods_dir, time.time(), priority=BACKGROUND,
+                               name="cleanup staging")
+
         self._last_click_time = 0
+        self._operation = None  # Running file operation (scheduler Job)
+        self._action_buttons = []  # Disabled while a file operation runs
+        self._refresh_generation = 0
+        self._refresh_callbacks = []
+        # Coalesced refresh requests (see request_refresh)
+        self._dirty_all = False
+        self._dirty_folders = set()
+        self._pending_refresh_callbacks = []
+        self._refresh_after_id = None
+        self._refresh_busy = False
         init_menubar(self)
         self.status_var = tb.StringVar(value="Ready")
         self.create_widgets()
 
+        # Refresh for every finished install, even if the card or window that started it is gone
+        get_download_manager().subscribe(self._on_download_update)
+
         self.after(100, self.force_style_reload)
         self.after(100, self.refresh_mod_list)
 
@@ -109,6 +151,9 @@ class ModManagerGUI(tb.Window):
         self.after(500, lambda: self.attributes('-topmost', False))
 
     def on_close(self):
+        # os._exit skips launch_gui's cleanup
+        stop_watchdog()
+        save_requested_trace()
         self.destroy()
         os._exit(0)
 
@@ -141,7 +186,8 @@ class ModManagerGUI(tb.Window):
         if self.logo_small_img:
             tb.Label(topbar, image=self.logo_small_img).pack(side="left", padx=(0, 10))
 
-        tb.Button(topbar, text="🚀 Launch game", command=self.launch_game, bootstyle="success", cursor="hand2").pack(side="right", padx=5)
+        launch_btn = tb.Button(topbar, text="🚀 Launch game", command=self.launch_game, bootstyle="success", cursor="hand2")
+        launch_btn.pack(side="right", padx=5)
 
         self.tree = tb.Treeview(self, show="tree", selectmode="browse", bootstyle="success")
         self.tree.heading("#0", text="Name")
@@ -159,8 +205,10 @@ class ModManagerGUI(tb.Window):
         bottom = tb.Frame(bottom_container)
         bottom.pack(side="top", fill="x", pady=5)
 
-        tb.Button(bottom, text="⚙️ Toggle state", command=self.toggle_selected_mod, bootstyle="warning", cursor="hand2").pack(side="left", padx=10)
-        tb.Button(bottom, text="🗑️ Delete", command=self.delete_selected_mod, bootstyle="danger", cursor="hand2").pack(side="left", padx=10)
+        toggle_btn = tb.Button(bottom, text="⚙️ Toggle state", command=self.toggle_selected_mod, bootstyle="warning", cursor="hand2")
+        toggle_btn.pack(side="left", padx=10)
+        delete_btn = tb.Button(bottom, text="🗑️ Delete", command=self.delete_selected_mod, bootstyle="danger", cursor="hand2")
+        delete_btn.pack(side="left", padx=10)
         tb.Button(bottom, text="📂 Open Mods Folder", command=self.open_mods_folder, bootstyle="info", cursor="hand2").pack(side="left", padx=10)
 
         # Groupe "Mods profile" dans topbar (avec message à droite)
@@ -187,10 +235,12 @@ class ModManagerGUI(tb.Window):
                             bootstyle="secondary", cursor="hand2", width=6, style="Tiny.TButton")
         load_btn.pack(side="left", padx=(0, 10))
 
+        self._action_buttons = [launch_btn, toggle_btn, delete_btn, save_btn, load_btn]
+
         tb.Button(
             bottom,
             text="⬇️ Download Mods",
-            command=lambda: open_downloader_window(self, self.mods_dir, self.refresh_mod_list),
+            command=lambda: open_downloader_window(self, self.mods_dir),
             bootstyle="primary",
             cursor="hand2"
         ).pack(side="right", padx=10)
@@ -240,12 +290,17 @@ class ModManagerGUI(tb.Window):
         if not selected or selected == "New mods profile...":
             self.status_var.set("⚠️ Select a mod profile first.")
             return
-        try:
-            load_modpack(selected, self.mods_dir)
-            self.refresh_mod_list()
+
+        def work(progress):
+            load_modpack(selected, self.mods_dir,
+                         on_progress=lambda done, total: progress(f"Loading '{selected}': {done}/{total}"))
+
+        def on_success(_):
             self.status_var.set(f"✅ Loaded '{selected}'")
-        except Exception as e:
-            self.status_var.set(f"❌ Load failed: {e}")
+            self.request_refresh()
+
+        self.run_operation(f"Loading '{selected}'...", work, on_success,
+                           on_error=lambda msg: self.status_var.set(f"❌ Load failed: {msg}"))
 
     def refresh_modpack_list(self):
         try:
@@ -279,64 +334,119 @@ class ModManagerGUI(tb.Window):
             self._last_item_clicked = item_id
 
     def handle_tree_toggle(self, item_id):
-        if item_id == "mods_root":
-            # Toggle récursif sur tout le dossier mods
-            try:
-                toggle_mods_in_folder(self.mods_dir)
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
-                return
-        else:
-            abs_path = os.path.join(self.mods_dir, item_id)
-            is_dir = os.path.isdir(abs_path)
-            rel_base = os.path.splitext(item_id)[0] if not is_dir else item_id
-            try:
-                if is_dir:
-                    toggle_mods_in_folder(abs_path)
-                elif os.path.isfile(abs_path):
-                    toggle_mod_state(abs_path)
-                else:
-                    return
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
-                return
+        self._toggle_node(item_id, on_error=lambda msg: messagebox.showerror("Error", msg))
 
-        expanded = self.get_all_expanded_nodes()
-        self.refresh_mod_list()
-        for iid in expanded:
-            if self.tree.exists(iid):
-                self.tree.item(iid, open=True)
-
-        if item_id == "mods":
-            # sélectionne le dossier mods et scroll dessus
-            if self.tree.exists("mods"):
-                self.tree.selection_set("mods")
-                self.tree.see("mods")
+    def _toggle_node(self, node_id, on_error):
+        """Toggle a mod, a folder or (for "mods_root") every mod, off the Tk thread."""
+        if node_id == "mods_root":
+            target, name = self.mods_dir, "all mods"
         else:
-            if is_dir:
-                if self.tree.exists(rel_base):
-                    self.tree.selection_set(rel_base)
-                    self.tree.see(rel_base)
-            else:
-                for mod in self.mods:
-                    rel_path = os.path.relpath(mod["path"], self.mods_dir)
-                    if os.path.splitext(rel_path)[0] == rel_base:
-                        iid = os.path.normpath(rel_path)
-                        if self.tree.exists(iid):
-                            self.tree.selection_set(iid)
-                            self.tree.see(iid)
-                        break
-
-    def get_folder_icon(self, path):
-        enabled_exts = {".otr", ".o2r"}
-        disabled_exts = {".disabled", ".di2abled"}
-        has_enabled = has_disabled = False
-        for root, _, files in os.walk(path):
-            for f in files:
-                if any(f.endswith(ext) for ext in disabled_exts):
-                    has_disabled = True
-                elif any(f.endswith(ext) for ext in enabled_exts):
-                    has_enabled = True
+            target, name = os.path.normpath(os.path.join(self.mods_dir, node_id)), os.path.basename(node_id)
+
+        def work(progress):
+            if os.path.isdir(target):
+                toggle_mods_in_folder(target, on_progress=lambda done, total: progress(f"Toggling {name}: {done}/{total}"))
+                return True
+            if os.path.isfile(target):
+                toggle_mod_state(target)
+            return False
+
+        def on_success(is_dir):
+            self.status_var.set(f"✅ Toggled {name}")
+            self.request_refresh(None if node_id == "mods_root" else node_id,
+                                 on_done=lambda: self._reselect(node_id, is_dir))
+
+        self.run_operation(f"Toggling {name}...", work, on_success, on_error)
+
+    def _reselect(self, node_id, is_dir):
+        """Select a node again after a refresh; a toggled file's id changes with its extension."""
+        iid = None
+        if node_id == "mods_root" or is_dir:
+            iid = node_id
+        else:
+            base = os.path.splitext(node_id)[0]
+            for mod in self.mods:
+                rel_path = os.path.normpath(os.path.relpath(mod["path"], self.mods_dir))
+                if os.path.splitext(rel_path)[0] == base:
+                    iid = rel_path
+                    break
+        if iid and self.tree.exists(iid):
+            self.tree.selection_set(iid)
+            self.tree.see(iid)
+
+    # ---- Background file operations ----
+
+    def run_operation(self, description, work, on_success=None, on_error=None):
+        """
+        Run a file operation off the Tk thread.
+
+        work(progress) runs on the scheduler's interactive pool; progress(text)
+        shows text in the status bar (at most every OPERATION_PROGRESS_INTERVAL
+        seconds). The actions that change the mods folder are disabled until
+        it finishes; then on_success(result) or on_error(message) runs on the
+        Tk thread (errors go to the status bar by default); a cancelled
+        operation only re-enables them and refreshes the list. Returns False
+        if another operation is still running.
+        """
+        if self._operation_busy():
+            return False
+        self._set_actions_enabled(False)
+        self.status_var.set(f"⏳ {description}")
+        last_report = [0.0]
+
+        def progress(text):
+            now = time.monotonic()
+            if now - last_report[0] >= OPERATION_PROGRESS_INTERVAL:
+                last_report[0] = now
+                self.after(0, lambda: self.status_var.set(f"⏳ {text}"))
+
+        def done(result, error):
+            self._operation = None
+            self._set_actions_enabled(True)
+            if error is not None:
+                if on_error:
+                    on_error(str(error))
+                else:
+                    self.status_var.set(f"❌ {error}")
+            elif on_success:
+                on_success(result)
+
+        job = get_scheduler().submit(work, progress, priority=INTERACTIVE, name=description,
+                                     on_done=done, widget=self)
+        self._operation = job
+
+        def released():
+            if self._operation is job:
+                self._operation = None
+                self._set_actions_enabled(True)
+                self.status_var.set("⚠️ Operation cancelled.")
+                self.request_refresh()  # It may have changed part of the mods folder
+
+        def on_finished(future):
+            # on_done isn't delivered for cancelled jobs; release the actions anyway
+            if future.cancelled() or isinstance(future.exception(), Cancelled):
+                try:
+                    self.after(0, released)
+                except Exception:
+                    pass  # Window destroyed
+
+        job.future.add_done_callback(on_finished)
+        return True
+
+    def _operation_busy(self):
+        """True (and says so in the status bar) while another file operation is running."""
+        if self._operation is None:
+            return False
+        self.status_var.set("⏳ Please wait for the current operation to finish.")
+        return True
+
+    def _set_actions_enabled(self, enabled):
+        for button in self._action_buttons:
+            button.configure(state="normal" if enabled else "disabled")
+
+    def get_folder_icon(self, node_id, folder_states):
+        """Icon for a folder from the state of its mods: all enabled, all disabled or mixed."""
+        has_enabled, has_disabled = folder_states.get(node_id, (False, False))
         if has_enabled and has_disabled:
             return self.icons["dash"]
         elif has_enabled:
@@ -345,25 +455,70 @@ class ModManagerGUI(tb.Window):
             return self.icons["cross"]
         return ""
 
-    def refresh_mod_list(self):
+    def refresh_mod_list(self, on_done=None):
+        """
+        Rescan the mods folder on a worker and rebuild the tree when it's done.
+
+        Call on the Tk thread; most callers want request_refresh, which
+        coalesces bursts. Only the newest scan is rendered; on_done()
+        callbacks of superseded scans run after it.
+        """
+        self._refresh_generation += 1
+        generation = self._refresh_generation
+        if on_done:
+            self._refresh_callbacks.append(on_done)
+        mods_dir = self.mods_dir
+
+        def scan(progress=None):
+            mods = load_mods(mods_dir)
+            return mods, _folder_states(mods, mods_dir)
+
+        def apply(result, error):
+            if generation != self._refresh_generation:
+                return  # A newer scan is on its way
+            if error is not None:
+                self.status_var.set(f"❌ Can't read the mods folder: {error}")
+            else:
+                self._render_mod_list(*result)
+            callbacks, self._refresh_callbacks = self._refresh_callbacks, []
+            for callback in callbacks:
+                callback()
+
+        get_scheduler().submit(scan, priority=INTERACTIVE, name="scan mods", on_done=apply, widget=self)
+
+    @traced("render_mod_list", cat="ui")
+    def _render_mod_list(self, mods, folder_states):
         expanded = self.get_all_expanded_nodes()
         self.tree.delete(*self.tree.get_children())
-        self.mods = load_mods(self.mods_dir)
+        self.mods = mods
         self.tree_images = {}
         node_map = {}
 
         # Ajout du dossier racine "mods" (toujours affiché en haut, toujours ouvert)
         root_id = "mods_root"
         root_label = " | 📁 mods"
-        # Icône pour dossier "mods" : peut être celle retournée par get_folder_icon
-        root_icon = self.get_folder_icon(self.mods_dir)
+        # Icône pour dossier "mods" : état de tous les mods
+        root_icon = self.get_folder_icon("", folder_states)
         if root_icon:
             self.tree_images[root_id] = root_icon
 
         self.tree.insert("", "end", iid=root_id, text=root_label, image=self.tree_images.get(root_id, ""), open=True)
 
         # Ajout des mods en enfants de "mods_root"
-        for mod in self.mods:
+        self._insert_mod_nodes(self.mods, node_map, folder_states)
+
+        # On restaure l'état des noeuds ouverts sauf pour root_id qu'on force ouvert
+        for iid in expanded:
+            if self.tree.exists(iid) and iid != root_id:
+                self.tree.item(iid, open=True)
+        # Forcer toujours root_id ouvert
+        if self.tree.exists(root_id):
+            self.tree.item(root_id, open=True)
+
+    def _insert_mod_nodes(self, mods, node_map, folder_states):
+        """Insert tree nodes (folders + files) for mods under "mods_root"."""
+        root_id = "mods_root"
+        for mod in mods:
             rel_path = os.path.relpath(mod["path"], self.mods_dir)
             parts = rel_path.split(os.sep)
             parent = root_id  # ici on force comme parent le dossier racine
@@ -387,8 +542,7 @@ class ModManagerGUI(tb.Window):
                         name, _ = os.path.splitext(part)
                         label = f" | 📄 {name}"
                     else:
-                        folder_path = os.path.join(self.mods_dir, node_id)
-                        folder_icon = self.get_folder_icon(folder_path)
+                        folder_icon = self.get_folder_icon(node_id, folder_states)
                         if folder_icon:
                             self.tree_images[node_id] = folder_icon
                         label = f" | 📁 {part}"
@@ -402,13 +556,127 @@ class ModManagerGUI(tb.Window):
                     node_map[node_id] = node
                 parent = node_id
 
-        # On restaure l'état des noeuds ouverts sauf pour root_id qu'on force ouvert
+    # ---- Coalesced refreshes ----
+
+    def request_refresh(self, path=None, on_done=None):
+        """
+        Ask for the mod tree to be brought up to date (Tk thread).
+
+        path (absolute, or relative to the mods folder) marks only the
+        top-level folder containing it dirty; None marks the whole tree.
+        Requests within REFRESH_COALESCE_MS are merged into one update, and
+        requests made while a scan is running are merged into the next one.
+        on_done() runs once the update containing this request is on screen.
+        """
+        folder = self._dirty_folder_for(path)
+        if folder is None:
+            self._dirty_all = True
+        else:
+            self._dirty_folders.add(folder)
+        if on_done:
+            self._pending_refresh_callbacks.append(on_done)
+        self._schedule_refresh()
+
+    def _on_download_update(self, snapshot):
+        """Download manager subscriber (worker threads): refresh the folder an install went into."""
+        if snapshot["state"] != STATE_COMPLETED or not snapshot["result"]:
+            return
+        folder = os.path.abspath(snapshot["result"]["folder"])
+        mods_dir = os.path.abspath(self.mods_dir)
+        try:
+            inside = os.path.commonpath([folder, mods_dir]) == mods_dir
+        except ValueError:
+            inside = False  # Different drive
+        if not inside:
+            return  # Modpack sources are downloaded outside the mods folder
+        self.after(0, lambda: self.request_refresh(folder))
+
+    def _dirty_folder_for(self, path):
+        """Top-level folder node holding path, or None if the whole tree must be rescanned."""
+        if not path:
+            return None
+        rel_path = os.path.normpath(os.path.relpath(os.path.join(self.mods_dir, path), self.mods_dir))
+        if rel_path == "." or rel_path.startswith(".."):
+            return None
+        top, _, rest = rel_path.partition(os.sep)
+        if not rest and not os.path.isdir(os.path.join(self.mods_dir, top)) \
+                and not (self.tree.exists(top) and self.tree.get_children(top)):
+            return None  # A mod file at the top level
+        return top
+
+    def _schedule_refresh(self):
+        if self._refresh_after_id is None and not self._refresh_busy:
+            self._refresh_after_id = self.after(REFRESH_COALESCE_MS, self._flush_refresh)
+
+    def _flush_refresh(self):
+        self._refresh_after_id = None
+        if not self._dirty_all and not self._dirty_folders:
+            return
+        callbacks, self._pending_refresh_callbacks = self._pending_refresh_callbacks, []
+        self._refresh_busy = True
+        if self._dirty_all or not self.tree.exists("mods_root"):
+            self._dirty_all = False
+            self._dirty_folders.clear()
+            self.refresh_mod_list(on_done=lambda: self._refresh_finished(callbacks))
+        else:
+            folders, self._dirty_folders = self._dirty_folders, set()
+            self._refresh_folders(folders, callbacks)
+
+    def _refresh_finished(self, callbacks):
+        self._refresh_busy = False
+        for callback in callbacks:
+            callback()
+        self._schedule_refresh()  # Requests that came in during the scan
+
+    def _refresh_folders(self, folders, callbacks):
+        """Rescan the given top-level folders in one job and rebuild only their subtrees."""
+        generation = self._refresh_generation
+        paths = {node_id: os.path.join(self.mods_dir, node_id) for node_id in folders}
+
+        def scan(progress=None):
+            return {node_id: load_mods(path) if os.path.isdir(path) else [] for node_id, path in paths.items()}
+
+        def apply(folder_mods, error):
+            if error is not None or generation != self._refresh_generation:
+                # Failed, or a full rescan ran meanwhile: fall back to a full refresh
+                self._dirty_all = True
+                self._pending_refresh_callbacks[:0] = callbacks
+                self._refresh_finished([])
+                return
+            self._render_mod_folders(folder_mods)
+            self._refresh_finished(callbacks)
+
+        get_scheduler().submit(scan, priority=INTERACTIVE, name="scan mod folders", on_done=apply, widget=self)
+
+    @traced("render_mod_folders", cat="ui")
+    def _render_mod_folders(self, folder_mods):
+        root_id = "mods_root"
+        expanded = self.get_all_expanded_nodes()
+
+        prefixes = tuple(node_id + os.sep for node_id in folder_mods)
+        self.mods = [mod for mod in self.mods
+                     if not os.path.relpath(mod["path"], self.mods_dir).startswith(prefixes)]
+        for mods in folder_mods.values():
+            self.mods.extend(mods)
+        # Folder states from the mods already scanned, without walking the whole folder again
+        folder_states = _folder_states(self.mods, self.mods_dir)
+
+        for node_id, mods in folder_mods.items():
+            index = "end"
+            if self.tree.exists(node_id):
+                index = self.tree.index(node_id)
+                self.tree.delete(node_id)
+            self._insert_mod_nodes(mods, {}, folder_states)
+            if self.tree.exists(node_id):
+                self.tree.move(node_id, root_id, index)
+
+        root_icon = self.get_folder_icon("", folder_states)
+        self.tree_images[root_id] = root_icon
+        self.tree.item(root_id, image=root_icon)
+
         for iid in expanded:
-            if self.tree.exists(iid) and iid != root_id:
+            if self.tree.exists(iid):
                 self.tree.item(iid, open=True)
-        # Forcer toujours root_id ouvert
-        if self.tree.exists(root_id):
-            self.tree.item(root_id, open=True)
 
     def on_tree_open_close(self, event):
         # Empêche la fermeture du dossier "mods_root"
@@ -454,78 +722,41 @@ class ModManagerGUI(tb.Window):
         if not selection:
             self.status_var.set("⚠️ Select a mod or a folder to toggle.")
             return
-        node_id = selection[0]
-
-        try:
-            # Le noeud racine est "mods_root" dans refresh_mod_list
-            if node_id == "mods_root":
-                toggle_mods_in_folder(self.mods_dir)
-            else:
-                abs_path = os.path.normpath(os.path.join(self.mods_dir, node_id))
-                is_dir = os.path.isdir(abs_path)
-                if is_dir:
-                    toggle_mods_in_folder(abs_path)
-                else:
-                    toggle_mod_state(abs_path)
-        except Exception as e:
-            self.status_var.set(f"❌ Can't change mod state: {e}")
-            return
-
-        expanded = self.get_all_expanded_nodes()
-        self.refresh_mod_list()
-        for iid in expanded:
-            if self.tree.exists(iid):
-                self.tree.item(iid, open=True)
-
-        # Rétablir sélection et scroll
-        if node_id == "mods_root":
-            if self.tree.exists("mods_root"):
-                self.tree.selection_set("mods_root")
-                self.tree.see("mods_root")
-        else:
-            if is_dir:
-                if self.tree.exists(node_id):
-                    self.tree.selection_set(node_id)
-                    self.tree.see(node_id)
-            else:
-                for mod in self.mods:
-                    rel_path = os.path.relpath(mod["path"], self.mods_dir)
-                    if os.path.splitext(rel_path)[0] == os.path.splitext(node_id)[0]:
-                        iid = os.path.normpath(rel_path)
-                        if self.tree.exists(iid):
-                            self.tree.selection_set(iid)
-                            self.tree.see(iid)
-                        break
+        self._toggle_node(selection[0], on_error=lambda msg: self.status_var.set(f"❌ Can't change mod state: {msg}"))
 
     def delete_selected_mod(self):
         path = self.get_selected_mod()
         if not path:
             self.status_var.set("⚠️ Select a mod or folder to delete.")
             return
+        self._delete_path(path)
 
-        # Appelle la fonction externe avec callbacks pour UI
-        delete_mod(
-            path=path,
-            refresh_callback=self.refresh_mod_list,
-            status_callback=lambda text: self.status_var.set(text)
-        )
-    
     def on_delete_key(self, event):
         path = self.get_selected_mod()
         if not path:
             self.status_var.set("⚠️ Select a mod or folder to delete.")
             return "break"  # stop propagation
 
-        # Appelle la fonction delete_mod avec callbacks
-        from delete import delete_mod  # au cas où ce n'est pas déjà importé
+        self._delete_path(path)
+        return "break"  # Stop event propagation (prevent default behavior)
+
+    def _delete_path(self, path):
+        """Confirm on the Tk thread, then move path to the trash on a worker."""
+        if self._operation_busy():
+            return  # Don't ask for a confirmation the operation would then refuse
+        if not confirm_delete(path, status_callback=self.status_var.set):
+            return
+        name = os.path.basename(path)
 
-        delete_mod(
-            path=path,
-            refresh_callback=self.refresh_mod_list,
-            status_callback=lambda text: self.status_var.set(text)
-        )
+        def on_success(_):
+            self.status_var.set(f"✅ Deleted '{name}'")
+            self.request_refresh(path)
 
-        return "break"  # Stop event propagation (prevent default behavior)
+        def on_error(msg):
+            self.status_var.set(f"❌ Failed to delete: {msg}")
+            messagebox.showerror("Error", f"Failed to delete:\n{msg}")
+
+        self.run_operation(f"Deleting '{name}'...", lambda progress: trash_path(path), on_success, on_error)
 
     def open_mods_folder(self):
         handler = get_platform_handler()
@@ -533,8 +764,9 @@ class ModManagerGUI(tb.Window):
 
     def launch_game(self):
         try:
-            # Use platform-specific mods directory
-            launch_game(self.game_dir, self.mods_dir)
+            # Use platform-specific mods directory; background work waits until the game is started
+            with get_scheduler().foreground():
+                launch_game(self.game_dir, self.mods_dir)
             self.destroy()
         except FileNotFoundError as e:
             self.status_var.set(str(e))
@@ -547,4 +779,11 @@ class ModManagerGUI(tb.Window):
 
 def launch_gui(game_dir):
     app = ModManagerGUI(game_dir)
-    app.mainloop()
+    apply_watchdog_setting(app)
+    try:
+        app.mainloop()
+    finally:
+        stop_watchdog()
+        save_requested_trace()
+        # Stop running jobs instead of waiting for them on exit
+        get_scheduler().shutdown()
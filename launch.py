@@ -4,6 +4,7 @@ import json
 import subprocess
 from pathlib import Path
 from platform_handler import get_platform_handler, is_macos
+from tracing import traced
 
 SETTINGS_FILE = "saildeck.data"
 
@@ -22,6 +23,7 @@ def should_enable_altassets():
         print(f"[!] Error reading {SETTINGS_FILE}: {e}")
         return True
 
+@traced(cat="launch")
 def has_enabled_mod(mods_dir):
     """Return True if an active .otr or .o2r is found anywhere in /mods."""
     print(f"[Search] Recursively searching for active mods in: {mods_dir}")
@@ -67,6 +69,7 @@ def ensure_altassets_enabled(config_path):
     except Exception as e:
         print(f"[!] Error updating AltAssets: {e}")
 
+@traced(cat="launch")
 def launch_game(soh_path, mods_dir):
     """Launch the game after enabling AltAssets if necessary."""
     handler = get_platform_handler()
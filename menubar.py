@@ -1,8 +1,12 @@
-from tkinter import Menu
+from tkinter import Menu, BooleanVar, filedialog
 import about
 import settings_window
 import export_modpacks
+import watchdog_window
+import tracing
+from download.updates_window import open_updates_window
 from theme_manager import get_theme_manager, LIGHT_THEMES, DARK_THEMES, SPECIAL_THEMES
+from scheduler import get_scheduler, USER_INITIATED
 
 
 def init_menubar(window):
@@ -12,7 +16,22 @@ def init_menubar(window):
     # === Saildeck menu ===
     saildeck_menu = Menu(menubar, tearoff=0)
     saildeck_menu.add_command(label="Open mods folder", command=window.open_mods_folder)
-    saildeck_menu.add_command(label="Refresh mods list", command=window.refresh_mod_list)
+    saildeck_menu.add_command(label="Refresh mods list", command=window.request_refresh)
+    saildeck_menu.add_separator()
+    saildeck_menu.add_command(label="Check for Mod Updates...",
+                              command=lambda: open_updates_window(window, window.mods_dir, window.request_refresh))
+    saildeck_menu.add_command(label="Responsiveness Report...",
+                              command=lambda: watchdog_window.show_watchdog_report(window))
+    trace_var = BooleanVar(master=window, value=tracing.is_enabled())
+
+    def _toggle_tracing():
+        if trace_var.get():
+            tracing.enable()
+        else:
+            tracing.disable()
+
+    saildeck_menu.add_checkbutton(label="Record Trace", variable=trace_var, command=_toggle_tracing)
+    saildeck_menu.add_command(label="Save Trace...", command=lambda: _save_trace(window))
     menubar.add_cascade(label="Saildeck", menu=saildeck_menu)
 
     # === View menu ===
@@ -124,6 +143,8 @@ def init_menubar(window):
     option_menu.add_command(label="Settings", command=lambda: settings_window.show_settings(window))
     option_menu.add_separator()
     option_menu.add_command(label="Export Modpack", command=lambda: export_modpacks.export_selected_modpack(window, window.status_var))
+    option_menu.add_command(label="Export Modpack Update (Delta)...", command=lambda: export_modpacks.export_selected_modpack(window, window.status_var, delta=True))
+    option_menu.add_command(label="Export Modpack (GameBanana References)...", command=lambda: export_modpacks.export_selected_modpack(window, window.status_var, references=True))
     option_menu.add_command(label="Import Modpack", command=lambda: export_modpacks.import_modpack(window))
     menubar.add_cascade(label="Option", menu=option_menu)
 
@@ -133,3 +154,24 @@ def init_menubar(window):
     menubar.add_cascade(label="About", menu=help_menu)
 
     window.config(menu=menubar)
+
+
+def _save_trace(window):
+    """Export the recorded spans as Chrome trace JSON (chrome://tracing, ui.perfetto.dev)."""
+    path = filedialog.asksaveasfilename(
+        title="Save Trace",
+        defaultextension=".json",
+        initialfile=tracing.TRACE_FILENAME,
+        filetypes=[("Chrome trace", "*.json")],
+    )
+    if not path:
+        return
+
+    def on_done(count, error):
+        if error is not None:
+            window.status_var.set(f"❌ Could not save trace: {error}")
+        else:
+            window.status_var.set(f"✅ Saved {count} trace event(s) to {path}")
+
+    get_scheduler().submit(tracing.export_chrome_trace, path, priority=USER_INITIATED, name="export trace",
+                           on_done=on_done, widget=window)
@@ -1,7 +1,9 @@
 import os
 from utils import list_mod_files
+from tracing import span, traced
 
 
+@traced(cat="toggle")
 def toggle_mod_state(mod_path: str):
     """
     Toggle mod state between enabled/disabled.
@@ -22,6 +24,20 @@ def toggle_mod_state(mod_path: str):
     os.rename(mod_path, new_path)
 
 
+def find_mod_file(mod_path: str):
+    """
+    Return mod_path, or its disabled variant if the mod was disabled since.
+    Returns None if neither exists.
+    """
+    if os.path.isfile(mod_path):
+        return mod_path
+    base, ext = os.path.splitext(mod_path)
+    disabled = {".otr": ".disabled", ".o2r": ".di2abled"}.get(ext.lower())
+    if disabled and os.path.isfile(base + disabled):
+        return base + disabled
+    return None
+
+
 def delete_mod(mod_path: str):
     if os.path.exists(mod_path):
         os.remove(mod_path)
@@ -45,17 +61,19 @@ def set_mod_enabled(mod_path: str, enable: bool):
 
 
 def load_mods(mods_dir: str) -> list:
-    mods = []
-    files = list_mod_files(mods_dir)
+    with span("load_mods", cat="scan") as s:
+        mods = []
+        files = list_mod_files(mods_dir)
 
-    for path in files:
-        is_enabled = not (path.endswith(".disabled") or path.endswith(".di2abled"))
-        mods.append({
-            "path": path,
-            "enabled": is_enabled
-        })
+        for path in files:
+            is_enabled = not (path.endswith(".disabled") or path.endswith(".di2abled"))
+            mods.append({
+                "path": path,
+                "enabled": is_enabled
+            })
 
-    return mods
+        s.set(mods=len(mods))
+        return mods
 
 
 def find_mods_root(path: str) -> str:
@@ -73,9 +91,11 @@ def find_mods_root(path: str) -> str:
     return os.path.dirname(path)
 
 
-def toggle_mods_in_folder(folder_path: str):
+@traced(cat="toggle")
+def toggle_mods_in_folder(folder_path: str, on_progress=None):
     """
     Enable or disable all mods in a folder (recursively).
+    on_progress(done, total) is called after each renamed file.
     """
     if not os.path.isdir(folder_path):
         raise ValueError("The specified path is not a folder.")
@@ -95,7 +115,7 @@ def toggle_mods_in_folder(folder_path: str):
         f.endswith(".disabled") or f.endswith(".di2abled") for f in mod_files
     )
 
-    for mod in mod_files:
+    for i, mod in enumerate(mod_files, 1):
         # If we want to enable all disabled mods
         if has_disabled:
             if mod.endswith(".disabled") or mod.endswith(".di2abled"):
@@ -103,3 +123,5 @@ def toggle_mods_in_folder(folder_path: str):
         else:
             if mod.endswith(".otr") or mod.endswith(".o2r"):
                 toggle_mod_state(mod)
+        if on_progress:
+            on_progress(i, len(mod_files))
@@ -0,0 +1,593 @@
+"""
+Modpack archive engine.
+
+Writes modpack zips in one streaming pass:
+  - payloads that are already compressed (.o2r/.otr and other archives or
+    media) are stored as-is; other files are probed and only deflated when
+    it actually saves space
+  - files that could be identical (same size) are hashed in parallel up
+    front, and identical files are written once and listed as duplicates
+  - every other file is hashed while it streams into the zip, so each
+    file is read once
+  - a manifest with SHA-256 checksums is written as the last member
+  - the zip is written to a temporary file and renamed into place
+
+Imports preview a pack from the zip's central directory alone, then
+extract members in parallel into a staging folder next to the mods folder,
+check them against the manifest checksums and move the folder into place
+with a rename.
+
+A delta export is made against the manifest of an earlier export: it lists
+the complete new file set, but only carries bytes for files that are new
+or changed; every other file points at the base file with the same hash,
+and files no longer in the pack are listed as removed. Imported packs keep
+their manifest in the folder, so a delta finds the pack it applies to by
+the base manifest's fingerprint, and every base file it reuses is
+re-hashed before anything changes.
+
+A reference export carries no bytes for files installed from GameBanana:
+their records name the mod, file and archive MD5 instead, and importing
+collects those archives from other installs, the archive cache or the
+download manager (download/gamebanana/sources.py) before verifying them
+against the pack's SHA-256 like any other file.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from download.gamebanana.sources import fetch_sources, missing_sources
+from download.gamebanana.staging import create_install_dir, replace_install_dir, link_or_copy
+from scheduler import current_token
+from mod_manager import find_mod_file
+from utils import list_mod_files
+
+MANIFEST_NAME = "saildeck_modpack.json"
+INSTALLED_MANIFEST_NAME = ".saildeck_modpack.json"  # Kept in imported pack folders
+MANIFEST_VERSION = 1
+
+COPY_BUFFER_SIZE = 1024 * 1024
+PROBE_SIZE = 256 * 1024
+STORE_RATIO = 0.9  # Store files that deflate to more than 90% of their size
+PROGRESS_INTERVAL = 0.25  # Seconds between progress callbacks
+HASH_WORKERS = min(4, os.cpu_count() or 1)
+EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
+MOD_FILE_EXTENSIONS = (".otr", ".o2r", ".disabled", ".di2abled")
+
+_EXPORT_PREFIX_RE = re.compile(r"^\d{4}-")
+
+# ZIP, MPQ and media formats that deflate can't shrink
+COMPRESSED_EXTENSIONS = {
+    ".o2r", ".otr", ".disabled", ".di2abled",
+    ".zip", ".7z", ".rar", ".gz", ".xz", ".bz2",
+    ".png", ".jpg", ".jpeg", ".webp", ".ogg", ".mp3", ".mp4",
+}
+
+
+def hash_file(path):
+    """Return the SHA-256 of a file as hex."""
+    sha256 = hashlib.sha256()
+    buf = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buf)
+    with open(path, "rb") as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            sha256.update(view[:n])
+    return sha256.hexdigest()
+
+
+def should_store(path):
+    """True if a file is better stored than deflated."""
+    if os.path.splitext(path.lower())[1] in COMPRESSED_EXTENSIONS:
+        return True
+    with open(path, "rb") as f:
+        sample = f.read(PROBE_SIZE)
+    if not sample:
+        return True
+    return len(zlib.compress(sample, 1)) > len(sample) * STORE_RATIO
+
+
+def format_rate(bytes_per_second):
+    return f"{bytes_per_second / (1024 * 1024):.1f} MB/s"
+
+
+def manifest_fingerprint(files):
+    """Identify a pack's exact contents: a hash over every file's name and SHA-256."""
+    sha256 = hashlib.sha256()
+    for record in sorted(files, key=lambda r: r["arcname"]):
+        sha256.update(f"{record['arcname']}:{record['sha256']}\n".encode("utf-8"))
+    return sha256.hexdigest()
+
+
+def write_modpack(mod_files, export_path, name="", on_progress=None, base_manifest=None, sources=None):
+    """
+    Write a modpack zip.
+
+    mod_files is a list of (arcname, path, rel_path) tuples in archive order;
+    rel_path is the file's path relative to the mods folder, recorded in the
+    manifest. on_progress(done_bytes, total_bytes, bytes_per_second) is
+    called at most every PROGRESS_INTERVAL seconds.
+
+    With base_manifest (the manifest of an earlier full export), a delta
+    is written: files whose hash is in the base are listed with a "base"
+    reference instead of being stored.
+
+    sources ({rel_path: source}, from sources.find_sources) lists files
+    installed from GameBanana; they are recorded by reference instead of
+    being stored.
+
+    Returns a summary dict (files, duplicates, unchanged, referenced,
+    removed, missing, bytes_read, bytes_written, seconds, rate).
+    """
+    started = time.monotonic()
+    token = current_token()  # Scheduler job cancellation, checked per chunk
+    entries = []
+    missing = []
+    for arcname, path, rel_path in mod_files:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            missing.append(rel_path)
+            continue
+        entries.append({"arcname": arcname, "path": path, "rel_path": rel_path, "size": size})
+
+    # Only files that share a size can be duplicates; hash those up front
+    # (all of them for a delta, and references). Probe compressibility at
+    # the same time.
+    sources = sources or {}
+    base_files = (base_manifest or {}).get("files", [])
+    # Match base files by path first; the hash only finds new or renamed paths
+    base_by_path = {_path_key(record["path"]): record for record in base_files if record.get("path")}
+    base_by_hash = {record["sha256"]: record["arcname"] for record in base_files}
+    sizes = {}
+    for entry in entries:
+        sizes[entry["size"]] = sizes.get(entry["size"], 0) + 1
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        hash_jobs = {id(entry): pool.submit(hash_file, entry["path"])
+                     for entry in entries
+                     if base_manifest or sizes[entry["size"]] > 1 or entry["rel_path"] in sources}
+        store_jobs = {id(entry): pool.submit(should_store, entry["path"]) for entry in entries}
+        for entry in entries:
+            job = hash_jobs.get(id(entry))
+            entry["sha256"] = job.result() if job else None
+            entry["stored"] = store_jobs[id(entry)].result()
+
+    total = sum(entry["size"] for entry in entries)
+    done = 0
+    last_report = 0.0
+
+    def report(force=False):
+        nonlocal last_report
+        now = time.monotonic()
+        if on_progress and (force or now - last_report >= PROGRESS_INTERVAL):
+            last_report = now
+            elapsed = now - started
+            on_progress(done, total, done / elapsed if elapsed > 0 else 0.0)
+
+    tmp_path = f"{export_path}.{uuid.uuid4().hex[:8]}.tmp"
+    written = {}  # sha256 -> arcname
+    manifest_files = []
+    duplicates = 0
+    unchanged = 0
+    referenced = 0
+    buf = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buf)
+
+    try:
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as zipf:
+            for entry in entries:
+                record = {"path": entry["rel_path"], "arcname": entry["arcname"], "size": entry["size"]}
+                base = base_by_path.get(_path_key(entry["rel_path"]))
+                if base and base["sha256"] == entry["sha256"]:
+                    base = base["arcname"]
+                else:
+                    base = base_by_hash.get(entry["sha256"])
+                if base:
+                    record["sha256"] = entry["sha256"]
+                    record["base"] = base
+                    manifest_files.append(record)
+                    unchanged += 1
+                    done += entry["size"]
+                    report()
+                    continue
+                if entry["rel_path"] in sources:
+                    record["sha256"] = entry["sha256"]
+                    record["gamebanana"] = sources[entry["rel_path"]]
+                    manifest_files.append(record)
+                    referenced += 1
+                    done += entry["size"]
+                    report()
+                    continue
+                if entry["sha256"] and entry["sha256"] in written:
+                    record["sha256"] = entry["sha256"]
+                    record["source"] = written[entry["sha256"]]
+                    manifest_files.append(record)
+                    duplicates += 1
+                    done += entry["size"]
+                    report()
+                    continue
+
+                zinfo = zipfile.ZipInfo.from_file(entry["path"], entry["arcname"])
+                zinfo.compress_type = zipfile.ZIP_STORED if entry["stored"] else zipfile.ZIP_DEFLATED
+                sha256 = hashlib.sha256()
+                with open(entry["path"], "rb") as src, \
+                        zipf.open(zinfo, "w", force_zip64=entry["size"] >= zipfile.ZIP64_LIMIT) as dst:
+                    while True:
+                        n = src.readinto(buf)
+                        if not n:
+                            break
+                        chunk = view[:n]
+                        sha256.update(chunk)
+                        dst.write(chunk)
+                        done += n
+                        token.raise_if_cancelled()
+                        report()
+
+                record["sha256"] = sha256.hexdigest()
+                record["stored"] = entry["stored"]
+                written[record["sha256"]] = entry["arcname"]
+                manifest_files.append(record)
+
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "type": "delta" if base_manifest else "full",
+                "name": name,
+                "created": int(time.time()),
+                "fingerprint": manifest_fingerprint(manifest_files),
+                "files": manifest_files,
+            }
+            if base_manifest:
+                paths = {record["path"] for record in manifest_files}
+                manifest["base"] = {
+                    "name": base_manifest.get("name", ""),
+                    "created": base_manifest.get("created"),
+                    "fingerprint": base_manifest.get("fingerprint") or manifest_fingerprint(base_files),
+                }
+                manifest["removed"] = sorted({record["path"] for record in base_files} - paths)
+            zipf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+        os.replace(tmp_path, export_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    report(force=True)
+    seconds = time.monotonic() - started
+    summary = {
+        "files": len(manifest_files),
+        "duplicates": duplicates,
+        "unchanged": unchanged,
+        "referenced": referenced,
+        "removed": len(manifest.get("removed", [])),
+        "missing": missing,
+        "bytes_read": total,
+        "bytes_written": os.path.getsize(export_path),
+        "seconds": seconds,
+        "rate": total / seconds if seconds > 0 else 0.0,
+    }
+    kind = f"delta ({unchanged} unchanged, {summary['removed']} removed)" if base_manifest else "pack"
+    if referenced:
+        kind += f" ({referenced} from GameBanana)"
+    print(f"[Modpack] Exported {kind}: {summary['files']} file(s) ({duplicates} duplicate(s)) "
+          f"in {seconds:.2f}s at {format_rate(summary['rate'])}")
+    return summary
+
+
+def read_manifest(zipf):
+    """Return the manifest dict of an open modpack zip, or None for older exports."""
+    try:
+        with zipf.open(MANIFEST_NAME) as f:
+            return json.load(f)
+    except (KeyError, ValueError):
+        return None
+
+
+def read_manifest_file(path):
+    """Return the manifest of a modpack zip on disk, or None."""
+    with zipfile.ZipFile(path, "r") as zipf:
+        return read_manifest(zipf)
+
+
+def _load_installed_manifest(folder):
+    try:
+        with open(os.path.join(folder, INSTALLED_MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_installed_manifest(folder, manifest):
+    """Keep the manifest of an imported pack in its folder, so deltas can find and verify it."""
+    files = [{key: value for key, value in record.items() if key not in ("base", "source", "stored")}
+             for record in manifest.get("files", [])]
+    installed = {
+        "version": MANIFEST_VERSION,
+        "type": "full",
+        "name": manifest.get("name", ""),
+        "created": manifest.get("created"),
+        "fingerprint": manifest.get("fingerprint") or manifest_fingerprint(files),
+        "files": files,
+    }
+    with open(os.path.join(folder, INSTALLED_MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(installed, f, indent=2)
+
+
+def find_delta_base(mods_dir, manifest):
+    """Return the imported pack folder a delta applies to, or None."""
+    fingerprint = (manifest.get("base") or {}).get("fingerprint")
+    if not fingerprint or not os.path.isdir(mods_dir):
+        return None
+    for entry in os.scandir(mods_dir):
+        if entry.is_dir():
+            installed = _load_installed_manifest(entry.path)
+            if installed and installed.get("fingerprint") == fingerprint:
+                return entry.path
+    return None
+
+
+class ModpackVerificationError(Exception):
+    """An imported file does not match the checksum in the pack's manifest."""
+
+
+def _path_key(path):
+    """Compare exported paths ignoring the separator and the enabled/disabled extension."""
+    return os.path.splitext(path.replace("\\", "/"))[0]
+
+
+def _mod_key(filename):
+    """Compare mods by name, ignoring the export order prefix and enabled/disabled state."""
+    name = os.path.splitext(os.path.basename(filename))[0]
+    return _EXPORT_PREFIX_RE.sub("", name).lower()
+
+
+def _safe_member_path(member, target_dir):
+    """Return where member extracts to, or raise ValueError if it escapes target_dir."""
+    dest = os.path.normpath(os.path.join(target_dir, member))
+    if os.path.isabs(member) or not dest.startswith(os.path.normpath(target_dir) + os.sep):
+        raise ValueError(f"Unsafe path in modpack: {member}")
+    return dest
+
+
+def preview_modpack(zip_path, mods_dir, target_name):
+    """
+    Describe a modpack without extracting it.
+
+    Reads only the central directory and the manifest. Returns a dict with
+    files, total_size, has_manifest, target_exists and conflicts (mods in
+    the pack that are already installed elsewhere in mods_dir), referenced
+    (files that come from GameBanana) and downloads (GameBanana archives
+    that are neither installed nor cached). For a delta, also delta=True,
+    base_folder (None if no installed pack matches), unchanged and removed.
+    """
+    with zipfile.ZipFile(zip_path, "r") as zipf:
+        infos = [info for info in zipf.infolist() if not info.is_dir() and info.filename != MANIFEST_NAME]
+        manifest = read_manifest(zipf)
+
+    names = [info.filename for info in infos]
+    total_size = sum(info.file_size for info in infos)
+    referenced = []
+    downloads = 0
+    if manifest:
+        duplicates = [record for record in manifest.get("files", []) if record.get("source")]
+        referenced = [record for record in manifest.get("files", []) if record.get("gamebanana")]
+        names += [record["arcname"] for record in duplicates + referenced]
+        total_size += sum(record.get("size", 0) for record in duplicates + referenced)
+        if referenced:
+            sources = {record["gamebanana"]["md5"]: record["gamebanana"] for record in referenced}
+            downloads = len(missing_sources(sources, mods_dir))
+
+    if manifest and manifest.get("type") == "delta":
+        base_folder = find_delta_base(mods_dir, manifest)
+        return {
+            "files": len(names),
+            "total_size": total_size,
+            "has_manifest": True,
+            "target_exists": base_folder is not None,
+            "conflicts": [],
+            "referenced": len(referenced),
+            "downloads": downloads,
+            "delta": True,
+            "base_folder": base_folder,
+            "unchanged": sum(1 for record in manifest.get("files", []) if record.get("base")),
+            "removed": len(manifest.get("removed", [])),
+        }
+
+    target_dir = os.path.join(mods_dir, target_name)
+    installed = {}
+    for path in list_mod_files(mods_dir):
+        if os.path.commonpath([path, target_dir]) != target_dir:
+            installed.setdefault(_mod_key(path), os.path.relpath(path, mods_dir))
+    conflicts = sorted({installed[_mod_key(name)] for name in names
+                        if name.lower().endswith(MOD_FILE_EXTENSIONS) and _mod_key(name) in installed})
+
+    return {
+        "files": len(names),
+        "total_size": total_size,
+        "has_manifest": manifest is not None,
+        "target_exists": os.path.exists(target_dir),
+        "conflicts": conflicts,
+        "referenced": len(referenced),
+        "downloads": downloads,
+        "delta": False,
+    }
+
+
+def extract_modpack(zip_path, mods_dir, target_name, on_progress=None, on_status=None):
+    """
+    Import a modpack into mods_dir/target_name, or apply a delta.
+
+    Members are extracted in parallel (one zip handle per worker) into a
+    staging folder and hashed as they are written; with a manifest, every
+    file must match its SHA-256 or ModpackVerificationError is raised and
+    nothing is installed. The finished folder replaces any existing one
+    with a rename. on_progress is called like in write_modpack.
+
+    A delta is applied to the installed pack whose manifest fingerprint
+    matches its base (target_name is ignored): the unchanged files it
+    reuses are re-hashed, then linked or copied next to the new ones.
+
+    Files a pack refers to on GameBanana are collected first (see
+    sources.fetch_sources; on_status(message) reports downloads) and
+    checked against their SHA-256 before they are linked into place.
+
+    Returns a summary dict (folder, files, verified, bytes, seconds, rate).
+    """
+    started = time.monotonic()
+    token = current_token()  # Scheduler job cancellation, checked per chunk
+    with zipfile.ZipFile(zip_path, "r") as zipf:
+        infos = [info for info in zipf.infolist() if not info.is_dir() and info.filename != MANIFEST_NAME]
+        manifest = read_manifest(zipf)
+    expected = {}
+    duplicates = []
+    reused = []
+    referenced = []
+    for record in (manifest or {}).get("files", []):
+        if record.get("source"):
+            duplicates.append(record)
+        elif record.get("base"):
+            reused.append(record)
+        elif record.get("gamebanana"):
+            referenced.append(record)
+        elif record.get("sha256"):
+            expected[record["arcname"]] = record["sha256"]
+
+    target_folder = os.path.join(mods_dir, target_name)
+    if manifest and manifest.get("type") == "delta":
+        target_folder = find_delta_base(mods_dir, manifest)
+        if target_folder is None:
+            raise ModpackVerificationError("This update doesn't match any installed modpack "
+                                           "(its base pack is missing or was changed)")
+
+    total = sum(info.file_size for info in infos) + sum(record.get("size", 0) for record in reused + referenced)
+    progress = {"done": 0, "last": 0.0}
+    lock = threading.Lock()
+    local = threading.local()
+    handles = []
+
+    def report(n, force=False):
+        with lock:
+            progress["done"] += n
+            now = time.monotonic()
+            if not on_progress or not (force or now - progress["last"] >= PROGRESS_INTERVAL):
+                return
+            progress["last"] = now
+            done = progress["done"]
+        elapsed = now - started
+        on_progress(done, total, done / elapsed if elapsed > 0 else 0.0)
+
+    def verify_base(record):
+        path = find_mod_file(os.path.join(target_folder, record["base"]))
+        if path is None or hash_file(path) != record["sha256"]:
+            raise ModpackVerificationError(f"Installed file {record['base']} doesn't match the update's base")
+        report(record.get("size", 0))
+        return path
+
+    source_folders = {}
+
+    def verify_reference(record):
+        source = record["gamebanana"]
+        path = find_mod_file(os.path.join(source_folders[source["md5"]], source["member"]))
+        if path is None or hash_file(path) != record["sha256"]:
+            raise ModpackVerificationError(f"{record['path']} from GameBanana doesn't match the pack "
+                                           f"(it may have been changed after it was installed)")
+        report(record.get("size", 0))
+        return path
+
+    install_dir = create_install_dir(mods_dir)
+    sources_dir = None
+
+    def extract(info):
+        zipf = getattr(local, "zipf", None)
+        if zipf is None:
+            zipf = local.zipf = zipfile.ZipFile(zip_path, "r")
+            with lock:
+                handles.append(zipf)
+        dest = _safe_member_path(info.filename, install_dir)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        sha256 = hashlib.sha256()
+        buf = bytearray(COPY_BUFFER_SIZE)
+        view = memoryview(buf)
+        with zipf.open(info) as src, open(dest, "wb") as dst:
+            while True:
+                n = src.readinto(buf)
+                if not n:
+                    break
+                sha256.update(view[:n])
+                dst.write(view[:n])
+                token.raise_if_cancelled()
+                report(n)
+        want = expected.get(info.filename)
+        if want and sha256.hexdigest() != want:
+            raise ModpackVerificationError(f"Checksum mismatch for {info.filename}")
+
+    try:
+        if referenced:
+            sources_dir = create_install_dir(mods_dir)
+            sources = {record["gamebanana"]["md5"]: record["gamebanana"] for record in referenced}
+            source_folders.update(fetch_sources(sources, mods_dir, sources_dir, on_status=on_status))
+
+        with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as pool:
+            # Check the base and the GameBanana files before extracting anything
+            base_paths = list(pool.map(verify_base, reused))
+            reference_paths = list(pool.map(verify_reference, referenced))
+            for _ in pool.map(extract, infos):
+                pass
+
+        for record, path in zip(referenced, reference_paths):
+            dest = _safe_member_path(record["arcname"], install_dir)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            link_or_copy(path, dest)
+
+        # Unchanged files come from the installed pack. A file at the same path keeps its
+        # installed enabled/disabled state; one matched by content takes the update's
+        for record, path in zip(reused, base_paths):
+            dest = _safe_member_path(record["arcname"], install_dir)
+            same_path = _path_key(record["base"]) == _path_key(record["arcname"])
+            if same_path and not path.endswith(record["base"]):
+                dest = os.path.splitext(dest)[0] + os.path.splitext(path)[1]
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            link_or_copy(path, dest)
+
+        # Identical files are stored once; recreate the copies
+        for record in duplicates:
+            source = _safe_member_path(record["source"], install_dir)
+            dest = _safe_member_path(record["arcname"], install_dir)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.copyfile(source, dest)
+
+        if manifest:
+            _save_installed_manifest(install_dir, manifest)
+        folder = replace_install_dir(install_dir, target_folder, keep_user_changes=False)
+        install_dir = None
+    finally:
+        for zipf in handles:
+            zipf.close()
+        if install_dir:
+            shutil.rmtree(install_dir, ignore_errors=True)
+        if sources_dir:
+            shutil.rmtree(sources_dir, ignore_errors=True)
+
+    report(0, force=True)
+    seconds = time.monotonic() - started
+    summary = {
+        "folder": folder,
+        "files": len(infos) + len(duplicates) + len(reused) + len(referenced),
+        "verified": bool(expected) or bool(reused) or bool(referenced),
+        "bytes": total,
+        "seconds": seconds,
+        "rate": total / seconds if seconds > 0 else 0.0,
+    }
+    print(f"[Modpack] Imported {summary['files']} file(s) into {os.path.basename(folder)} "
+          f"in {seconds:.2f}s at {format_rate(summary['rate'])}" + (" (verified)" if summary["verified"] else ""))
+    return summary
@@ -47,7 +47,11 @@ def list_modpacks():
     return list(data.get("modpacks", {}).keys())
 
 
-def load_modpack(name, mods_dir):
+def load_modpack(name, mods_dir, on_progress=None):
+    """
+    Enable exactly the mods of a saved modpack.
+    on_progress(done, total) is called as mods are disabled and re-enabled.
+    """
     data = load_all_data()
     modpacks = data.get("modpacks", {})
 
@@ -57,13 +61,21 @@ def load_modpack(name, mods_dir):
 
     active_mods = modpacks[name]
 
+    enabled = []
     for root, _, files in os.walk(mods_dir):
         for file in files:
             if file.endswith(".otr") or file.endswith(".o2r"):
-                path = os.path.join(root, file)
-                set_mod_enabled(path, enable=False)
+                enabled.append(os.path.join(root, file))
 
-    for mod_rel_path in active_mods:
+    total = len(enabled) + len(active_mods)
+    for i, path in enumerate(enabled, 1):
+        set_mod_enabled(path, enable=False)
+        if on_progress:
+            on_progress(i, total)
+
+    for i, mod_rel_path in enumerate(active_mods, len(enabled) + 1):
+        if on_progress:
+            on_progress(i, total)
         full_path = os.path.join(mods_dir, mod_rel_path)
 
         if os.path.exists(full_path):
@@ -0,0 +1,255 @@
+"""
+Background work scheduler.
+
+All work Saildeck runs off the Tk thread goes through one scheduler with
+three priority classes, each on its own bounded pool:
+
+  - INTERACTIVE: short file operations the user is waiting on (toggles,
+    deletes, refreshes)
+  - USER_INITIATED: longer jobs the user started (downloads, modpack
+    exports and imports)
+  - BACKGROUND: maintenance nobody is waiting on (staging cleanup,
+    catalog indexing)
+
+Background jobs don't start while interactive work is running, and long
+background jobs call throttle() in their I/O loops to yield to it mid-job
+and to respect the optional "background_io_mb" limit. Every job carries
+a CancelToken that the job checks (current_token()) and that cancel()
+sets.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from theme_manager import get_theme_manager
+from tracing import span, add_counter
+
+INTERACTIVE = "interactive"
+USER_INITIATED = "user_initiated"
+BACKGROUND = "background"
+
+POOL_SIZES = {
+    INTERACTIVE: 2,
+    USER_INITIATED: 6,  # Room for the download manager's 3 tasks plus exports/imports
+    BACKGROUND: 1,
+}
+
+YIELD_POLL_SECONDS = 0.25
+
+_current = threading.local()  # priority and token of the job on this thread
+
+
+class Cancelled(Exception):
+    """Raised inside a job whose token was cancelled."""
+
+
+class CancelToken:
+    """Cooperative cancellation flag shared by a job and whoever started it."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """Sleep up to timeout; returns True as soon as the token is cancelled."""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise Cancelled()
+
+
+# Token for code running outside a scheduler job; never cancelled
+_NEVER_CANCELLED = CancelToken()
+
+
+def current_token():
+    """Return the CancelToken of the job running on this thread."""
+    return getattr(_current, "token", None) or _NEVER_CANCELLED
+
+
+class Job:
+    """A submitted piece of work: its future, token, name and priority class."""
+
+    def __init__(self, name, priority, token):
+        self.name = name
+        self.priority = priority
+        self.token = token
+        self.future = None
+
+    def cancel(self):
+        """Cancel the job: dropped if still queued, told to stop if running."""
+        self.token.cancel()
+        if self.future is not None:
+            self.future.cancel()
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+
+class Scheduler:
+    """Bounded per-class pools with background work yielding to interactive work."""
+
+    def __init__(self, pool_sizes=None, io_limit=0):
+        self._pools = {}
+        for priority, size in (pool_sizes or POOL_SIZES).items():
+            self._pools[priority] = ThreadPoolExecutor(
+                max_workers=size,
+                thread_name_prefix=f"saildeck-{priority}",
+                initializer=self._init_worker,
+                initargs=(priority,),
+            )
+        self.io_limit = io_limit  # Background bytes per second, 0 = unlimited
+        self._jobs = set()  # Unfinished jobs
+        self._jobs_lock = threading.Lock()
+        self._foreground = 0
+        self._cond = threading.Condition()
+        self._bucket_lock = threading.Lock()
+        self._allowance = 0.0
+        self._last_refill = time.monotonic()
+
+    @staticmethod
+    def _init_worker(priority):
+        _current.priority = priority
+
+    # ---- Submitting ----
+
+    def submit(self, fn, *args, priority=USER_INITIATED, name=None, token=None, on_done=None, widget=None):
+        """
+        Run fn(*args) on the pool for priority; returns a Job.
+
+        on_done(result, error) is called when it finishes: on the Tk thread
+        via widget.after if widget is given, otherwise on the worker thread.
+        It is not called for jobs that were cancelled or raised Cancelled.
+        """
+        job = Job(name or getattr(fn, "__name__", "job"), priority, token or CancelToken())
+
+        def call():
+            add_counter(f"jobs.{priority}", 1)
+            try:
+                with span(job.name, cat=priority):
+                    return fn(*args)
+            finally:
+                add_counter(f"jobs.{priority}", -1)
+
+        def run():
+            _current.token = job.token
+            try:
+                job.token.raise_if_cancelled()
+                if priority == BACKGROUND:
+                    self._wait_for_foreground(job.token)
+                    return call()
+                if priority == INTERACTIVE:
+                    with self.foreground():
+                        return call()
+                return call()
+            finally:
+                _current.token = None
+
+        with self._jobs_lock:
+            self._jobs.add(job)
+        job.future = self._pools[priority].submit(run)
+        job.future.add_done_callback(lambda _: self._forget(job))
+
+        if on_done is not None:
+            def deliver(fut):
+                if fut.cancelled() or isinstance(fut.exception(), Cancelled):
+                    return
+                error = fut.exception()
+                result = None if error else fut.result()
+                if widget is None:
+                    on_done(result, error)
+                    return
+                try:
+                    widget.after(0, lambda: on_done(result, error))
+                except Exception:
+                    pass  # Widget destroyed before the job finished
+
+            job.future.add_done_callback(deliver)
+        return job
+
+    def _forget(self, job):
+        with self._jobs_lock:
+            self._jobs.discard(job)
+
+    def active_jobs(self):
+        """Return the unfinished jobs (queued or running)."""
+        with self._jobs_lock:
+            return list(self._jobs)
+
+    # ---- Yielding to interactive work ----
+
+    @contextmanager
+    def foreground(self):
+        """Mark interactive work in progress (also usable around Tk-thread work like launching)."""
+        with self._cond:
+            self._foreground += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._foreground -= 1
+                self._cond.notify_all()
+
+    @property
+    def foreground_busy(self):
+        return self._foreground > 0
+
+    def _wait_for_foreground(self, token):
+        with self._cond:
+            while self._foreground > 0 and not token.cancelled:
+                self._cond.wait(YIELD_POLL_SECONDS)
+        token.raise_if_cancelled()
+
+    def throttle(self, nbytes=0):
+        """
+        Call from I/O loops; only has an effect on background threads.
+
+        Waits while interactive work is running, then rate-limits to
+        io_limit bytes per second. Raises Cancelled if the job was cancelled.
+        """
+        if getattr(_current, "priority", None) != BACKGROUND:
+            return
+        token = current_token()
+        self._wait_for_foreground(token)
+        limit = self.io_limit
+        if not nbytes or limit <= 0:
+            return
+        with self._bucket_lock:
+            now = time.monotonic()
+            self._allowance = min(limit, self._allowance + (now - self._last_refill) * limit)
+            self._last_refill = now
+            self._allowance -= nbytes
+            delay = -self._allowance / limit if self._allowance < 0 else 0.0
+        if delay and token.wait(delay):
+            raise Cancelled()
+
+    def shutdown(self, wait=False):
+        """Cancel every job and stop the pools (running jobs stop at their next token check)."""
+        for job in self.active_jobs():
+            job.cancel()
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global scheduler instance
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Get the global Scheduler, with its I/O limit from the background_io_mb setting."""
+    global _scheduler
+    io_limit = get_theme_manager().get_setting("behavior", "background_io_mb", 0) * 1024 * 1024
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler(io_limit=io_limit)
+        _scheduler.io_limit = io_limit
+        return _scheduler
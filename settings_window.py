@@ -14,6 +14,7 @@ from theme_manager import (
     SPECIAL_THEMES,
     DEFAULT_SETTINGS,
 )
+from ui_watchdog import apply_watchdog_setting
 
 
 def show_settings(parent):
@@ -24,7 +25,7 @@ def show_settings(parent):
 
     win = tb.Toplevel(parent)
     win.title("Settings")
-    win.geometry("450x420")
+    win.geometry("450x500")
     win.resizable(False, False)
     win.transient(parent)
     win.grab_set()
@@ -244,6 +245,67 @@ def show_settings(parent):
         bootstyle="round-toggle"
     ).pack(anchor="w", pady=(0, 10))
 
+    tb.Label(
+        behavior_frame,
+        text="Downloads",
+        font=(font, 10, "bold")
+    ).pack(anchor="w", pady=(10, 10))
+
+    segments_row = tb.Frame(behavior_frame)
+    segments_row.pack(anchor="w", pady=(0, 10))
+    tb.Label(segments_row, text="Connections per large download:").pack(side="left", padx=(0, 8))
+    var_download_segments = tb.IntVar(value=settings["behavior"].get("download_segments", 4))
+    tb.Spinbox(
+        segments_row,
+        from_=1,
+        to=8,
+        width=4,
+        textvariable=var_download_segments,
+        state="readonly"
+    ).pack(side="left")
+
+    cache_row = tb.Frame(behavior_frame)
+    cache_row.pack(anchor="w", pady=(0, 10))
+    tb.Label(cache_row, text="Downloaded mod cache (MB, 0 = off):").pack(side="left", padx=(0, 8))
+    var_archive_cache_mb = tb.IntVar(value=settings["behavior"].get("archive_cache_mb", 2048))
+    tb.Spinbox(
+        cache_row,
+        from_=0,
+        to=20480,
+        increment=512,
+        width=6,
+        textvariable=var_archive_cache_mb,
+        state="readonly"
+    ).pack(side="left")
+
+    io_row = tb.Frame(behavior_frame)
+    io_row.pack(anchor="w", pady=(0, 10))
+    tb.Label(io_row, text="Background disk limit (MB/s, 0 = none):").pack(side="left", padx=(0, 8))
+    var_background_io_mb = tb.IntVar(value=settings["behavior"].get("background_io_mb", 0))
+    tb.Spinbox(
+        io_row,
+        from_=0,
+        to=500,
+        increment=10,
+        width=6,
+        textvariable=var_background_io_mb,
+        state="readonly"
+    ).pack(side="left")
+
+    tb.Label(
+        behavior_frame,
+        text="Diagnostics",
+        font=(font, 10, "bold")
+    ).pack(anchor="w", pady=(10, 10))
+
+    var_watchdog = tb.BooleanVar(value=settings["behavior"].get("watchdog", False))
+    tb.Checkbutton(
+        behavior_frame,
+        text="Record UI stalls (Saildeck → Responsiveness Report)",
+        variable=var_watchdog,
+        bootstyle="round-toggle"
+    ).pack(anchor="w", pady=(0, 10))
+
     # ========== Advanced Tab ==========
     advanced_frame = tb.Frame(notebook, padding=15)
     notebook.add(advanced_frame, text="Advanced")
@@ -291,6 +353,10 @@ def show_settings(parent):
             var_skip_update.set(False)
             var_enable_altassets.set(True)
             var_confirm_delete.set(True)
+            var_download_segments.set(DEFAULT_SETTINGS["behavior"]["download_segments"])
+            var_archive_cache_mb.set(DEFAULT_SETTINGS["behavior"]["archive_cache_mb"])
+            var_background_io_mb.set(DEFAULT_SETTINGS["behavior"]["background_io_mb"])
+            var_watchdog.set(DEFAULT_SETTINGS["behavior"]["watchdog"])
 
             # Apply theme
             theme_manager.set_special_theme(None)
@@ -314,6 +380,11 @@ def show_settings(parent):
         theme_manager.set_setting("behavior", "skip_update", var_skip_update.get())
         theme_manager.set_setting("behavior", "enable_altassets", var_enable_altassets.get())
         theme_manager.set_setting("behavior", "confirm_delete", var_confirm_delete.get())
+        theme_manager.set_setting("behavior", "download_segments", var_download_segments.get())
+        theme_manager.set_setting("behavior", "archive_cache_mb", var_archive_cache_mb.get())
+        theme_manager.set_setting("behavior", "background_io_mb", var_background_io_mb.get())
+        theme_manager.set_setting("behavior", "watchdog", var_watchdog.get())
+        apply_watchdog_setting(parent)
         win.destroy()
 
     # Handle window close button (X)
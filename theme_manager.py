@@ -84,6 +84,10 @@ DEFAULT_SETTINGS = {
         "skip_update": False,
         "enable_altassets": True,
         "confirm_delete": True,
+        "download_segments": 4,  # Parallel connections for large downloads
+        "archive_cache_mb": 2048,  # Size limit of the downloaded-mod cache (0 disables it)
+        "background_io_mb": 0,  # Disk throughput limit for background jobs in MB/s (0 = none)
+        "watchdog": False,  # Record Tk main-loop stalls (Saildeck -> Responsiveness Report)
     }
 }
 
@@ -0,0 +1,205 @@
+"""
+Lightweight span tracing.
+
+with span("name", key=value): ... records how long a block took, on which
+thread, nested inside whatever span is open around it; @traced does the
+same for a whole function. counter() and add_counter() record values over
+time (active downloads, running jobs). export_chrome_trace() writes the
+session as Chrome trace JSON, which chrome://tracing and ui.perfetto.dev
+load as a per-thread timeline.
+
+Tracing is off unless enable() is called (Saildeck → Record Trace) or
+SAILDECK_TRACE is set. Its value is the trace file written on exit ("1"
+writes saildeck_trace.json next to the settings file). While off, span()
+only checks a flag and returns a shared no-op object.
+"""
+import functools
+import json
+import os
+import threading
+import time
+
+from theme_manager import get_settings_path
+
+TRACE_FILENAME = "saildeck_trace.json"
+MAX_EVENTS = 500000  # Later events are dropped (and counted) to bound memory
+
+_enabled = False
+_origin = time.perf_counter()
+_pid = os.getpid()
+_events = []
+_dropped = 0
+_lock = threading.Lock()
+_thread_names = {}  # tid -> name, written as metadata events
+_counters = {}
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable():
+    """Start recording (keeps events recorded earlier this session)."""
+    global _enabled
+    if not _enabled:
+        _enabled = True
+        print("[Trace] Recording spans")
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def clear():
+    """Drop every recorded event."""
+    global _dropped, _origin
+    with _lock:
+        _events.clear()
+        _thread_names.clear()
+        _counters.clear()
+        _dropped = 0
+        _origin = time.perf_counter()
+
+
+def _now_us():
+    return (time.perf_counter() - _origin) * 1_000_000
+
+
+def _record(event):
+    global _dropped
+    tid = threading.get_ident()
+    event["pid"] = _pid
+    event["tid"] = tid
+    with _lock:
+        if len(_events) >= MAX_EVENTS:
+            _dropped += 1
+            return
+        if tid not in _thread_names:
+            _thread_names[tid] = threading.current_thread().name
+        _events.append(event)
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = _now_us()
+        if exc_type is not None and not issubclass(exc_type, SystemExit):
+            self.args["error"] = exc_type.__name__
+        _record({"name": self.name, "cat": self.cat, "ph": "X", "ts": self.start,
+                 "dur": end - self.start, "args": self.args})
+        return False
+
+    def set(self, **args):
+        """Attach values found out while the span runs (sizes, counts)."""
+        self.args.update(args)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, cat="saildeck", **args):
+    """Context manager timing a block; returns a no-op when tracing is off."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, cat, args)
+
+
+def traced(name=None, cat="saildeck"):
+    """Decorator recording a span for every call of the function."""
+    def decorate(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(span_name, cat, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def counter(name, value):
+    """Record the current value of a counter."""
+    if _enabled:
+        _record({"name": name, "ph": "C", "ts": _now_us(), "args": {"value": value}})
+
+
+def add_counter(name, delta):
+    """Add delta to a running counter (e.g. +1/-1 around active work) and record it."""
+    if not _enabled:
+        return
+    with _lock:
+        value = _counters.get(name, 0) + delta
+        _counters[name] = value
+    counter(name, value)
+
+
+def export_chrome_trace(path):
+    """Write the recorded events as Chrome trace JSON; returns the number of events."""
+    with _lock:
+        events = list(_events)
+        names = dict(_thread_names)
+        dropped = _dropped
+    metadata = [{"name": "process_name", "ph": "M", "pid": _pid, "tid": 0, "args": {"name": "Saildeck"}}]
+    metadata += [{"name": "thread_name", "ph": "M", "pid": _pid, "tid": tid, "args": {"name": thread_name}}
+                 for tid, thread_name in names.items()]
+    trace = {
+        "traceEvents": metadata + events,
+        "displayTimeUnit": "ms",
+        "otherData": {"dropped_events": dropped},
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(trace, f)
+    os.replace(tmp_path, path)
+    print(f"[Trace] Wrote {len(events)} event(s) to {path}" + (f" ({dropped} dropped)" if dropped else ""))
+    return len(events)
+
+
+def requested_trace_path():
+    """Trace file named by SAILDECK_TRACE, or None."""
+    value = os.environ.get("SAILDECK_TRACE", "").strip()
+    if not value or value.lower() in ("0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return os.path.join(os.path.dirname(get_settings_path()), TRACE_FILENAME)
+    return value
+
+
+def save_requested_trace():
+    """On exit: write the trace to the SAILDECK_TRACE file, if one was requested."""
+    path = requested_trace_path()
+    if path and _events:
+        try:
+            export_chrome_trace(path)
+        except OSError as e:
+            print(f"[Trace] Could not write {path}: {e}")
+
+
+if requested_trace_path():
+    enable()
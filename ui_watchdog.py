@@ -0,0 +1,250 @@
+"""
+Tk event-loop watchdog.
+
+A heartbeat re-arms itself with after() every HEARTBEAT_MS; how late each
+beat fires is the main loop's lag. While a beat is overdue by more than the
+long-task threshold, a monitor thread samples the Tk thread's stack
+(sys._current_frames), so a stall is recorded together with what the
+blocking callback was doing. The last MAX_STALLS stalls and the lag
+statistics are kept in memory and rewritten to a rolling report file
+(saildeck_watchdog.log next to the settings file), which can be viewed
+from Saildeck → Responsiveness Report.
+
+Enabled by the "watchdog" setting or by SAILDECK_WATCHDOG=1, for headless
+benchmark runs. SAILDECK_WATCHDOG_THRESHOLD_MS and SAILDECK_WATCHDOG_REPORT
+override the threshold and the report path.
+"""
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+
+from theme_manager import get_settings_path, get_theme_manager
+
+HEARTBEAT_MS = 100
+LONG_TASK_MS = 200  # Stalls at least this long are recorded
+SAMPLE_INTERVAL = 0.05  # Seconds between stack samples during a stall
+MAX_SAMPLES = 40  # Stack samples kept per stall
+MAX_STALLS = 50  # Stalls kept in the rolling report
+LAG_WINDOW = 3000  # Heartbeats kept for the lag statistics (~5 minutes)
+STACK_DEPTH = 12  # Innermost frames shown per stack
+
+REPORT_FILENAME = "saildeck_watchdog.log"
+
+
+def _env_flag(name):
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def get_report_path():
+    """Path of the rolling report (SAILDECK_WATCHDOG_REPORT overrides it)."""
+    return os.environ.get("SAILDECK_WATCHDOG_REPORT") or \
+        os.path.join(os.path.dirname(get_settings_path()), REPORT_FILENAME)
+
+
+def _callback_name(frame):
+    """Name the Tk callback a Tk-thread stack is in (the frame below tkinter's CallWrapper)."""
+    stack = traceback.extract_stack(frame)
+    for outer, inner in zip(stack, stack[1:]):
+        if outer.name == "__call__" and os.path.basename(os.path.dirname(outer.filename)) == "tkinter":
+            return f"{inner.name} ({os.path.basename(inner.filename)}:{inner.lineno})"
+    if stack:
+        return f"{stack[-1].name} ({os.path.basename(stack[-1].filename)}:{stack[-1].lineno})"
+    return "unknown"
+
+
+class EventLoopWatchdog:
+    """Measures Tk main-loop lag and records long callbacks with stack samples."""
+
+    def __init__(self, widget, threshold_ms=LONG_TASK_MS, report_path=None):
+        self.widget = widget
+        self.threshold = threshold_ms / 1000
+        self.report_path = report_path or get_report_path()
+        self.started_at = None
+        self.beats = 0
+        self.lags = deque(maxlen=LAG_WINDOW)  # Seconds each heartbeat fired late
+        self.max_lag = 0.0
+        self.stalls = deque(maxlen=MAX_STALLS)
+        self.stall_count = 0
+        self._lock = threading.Lock()
+        self._samples = []  # Stacks sampled during the current stall
+        self._expected = 0.0  # When the next heartbeat should fire
+        self._after_id = None
+        self._stop = threading.Event()
+        self._monitor = None
+        self._tk_thread = None
+
+    # ---- Lifecycle ----
+
+    def start(self):
+        """Start the heartbeat and the monitor thread (call on the Tk thread)."""
+        if self._monitor is not None:
+            return
+        self._tk_thread = threading.get_ident()
+        self.started_at = time.time()
+        self._stop.clear()
+        self._expected = time.monotonic() + HEARTBEAT_MS / 1000
+        self._after_id = self.widget.after(HEARTBEAT_MS, self._beat)
+        self._monitor = threading.Thread(target=self._run_monitor, name="saildeck-watchdog", daemon=True)
+        self._monitor.start()
+        print(f"[Watchdog] Recording Tk stalls over {self.threshold * 1000:.0f} ms to {self.report_path}")
+
+    def stop(self):
+        """Stop watching and write the final report."""
+        if self._monitor is None:
+            return
+        self._stop.set()
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass  # Widget already destroyed
+            self._after_id = None
+        self._monitor = None
+        self.write_report()
+        print(f"[Watchdog] {self.stall_count} stall(s), max lag {self.max_lag * 1000:.0f} ms")
+
+    @property
+    def running(self):
+        return self._monitor is not None
+
+    # ---- Tk thread ----
+
+    def _beat(self):
+        now = time.monotonic()
+        lag = max(0.0, now - self._expected)
+        self._expected = now + HEARTBEAT_MS / 1000
+        self.beats += 1
+        self.lags.append(lag)
+        self.max_lag = max(self.max_lag, lag)
+        with self._lock:
+            samples, self._samples = self._samples, []
+        if lag >= self.threshold:
+            self._record_stall(lag, samples)
+        if not self._stop.is_set():
+            self._after_id = self.widget.after(HEARTBEAT_MS, self._beat)
+
+    def _record_stall(self, lag, samples):
+        # The beat was due HEARTBEAT_MS after the previous one; the stall is how late it fired
+        stacks = Counter(stack for _, stack in samples)
+        callbacks = Counter(name for name, _ in samples)
+        self.stalls.append({
+            "time": time.time(),
+            "duration": lag,
+            "callback": callbacks.most_common(1)[0][0] if callbacks else "unknown (no samples)",
+            "samples": len(samples),
+            "stacks": stacks.most_common(3),
+        })
+        self.stall_count += 1
+        print(f"[Watchdog] Tk blocked for {lag * 1000:.0f} ms in {self.stalls[-1]['callback']}")
+        self.write_report()
+
+    # ---- Monitor thread ----
+
+    def _run_monitor(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            if time.monotonic() - self._expected < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._tk_thread)
+            if frame is None:
+                continue
+            sample = (_callback_name(frame), "".join(traceback.format_stack(frame)[-STACK_DEPTH:]))
+            del frame
+            with self._lock:
+                if len(self._samples) < MAX_SAMPLES:
+                    self._samples.append(sample)
+
+    # ---- Reporting ----
+
+    def summary(self):
+        """Lag statistics over the last LAG_WINDOW heartbeats, in milliseconds."""
+        lags = list(self.lags)
+        return {
+            "beats": self.beats,
+            "p50_ms": _percentile(lags, 50) * 1000,
+            "p95_ms": _percentile(lags, 95) * 1000,
+            "p99_ms": _percentile(lags, 99) * 1000,
+            "max_ms": self.max_lag * 1000,
+            "stalls": self.stall_count,
+        }
+
+    def format_report(self):
+        stats = self.summary()
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)) if self.started_at else "-"
+        lines = [
+            "Saildeck responsiveness report",
+            f"Watching since {started}, heartbeat {HEARTBEAT_MS} ms, long-task threshold {self.threshold * 1000:.0f} ms",
+            f"Main loop lag: p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+            f"p99 {stats['p99_ms']:.1f} ms, max {stats['max_ms']:.0f} ms over {stats['beats']} heartbeats",
+            f"Stalls: {stats['stalls']} (last {len(self.stalls)} below, newest first)",
+        ]
+        for stall in reversed(self.stalls):
+            stamp = time.strftime("%H:%M:%S", time.localtime(stall["time"]))
+            lines.append("")
+            lines.append(f"[{stamp}] {stall['duration'] * 1000:.0f} ms in {stall['callback']} "
+                         f"({stall['samples']} sample(s))")
+            for stack, count in stall["stacks"]:
+                lines.append(f"  -- {count}/{stall['samples']} sample(s):")
+                lines.extend("  " + line for line in stack.rstrip().splitlines())
+        return "\n".join(lines) + "\n"
+
+    def write_report(self):
+        try:
+            tmp_path = self.report_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.format_report())
+            os.replace(tmp_path, self.report_path)
+        except OSError as e:
+            print(f"[Watchdog] Could not write {self.report_path}: {e}")
+
+
+# Global watchdog instance (None while disabled)
+_watchdog = None
+
+
+def watchdog_requested():
+    """True if SAILDECK_WATCHDOG or the "watchdog" setting asks for the watchdog."""
+    return _env_flag("SAILDECK_WATCHDOG") or get_theme_manager().get_setting("behavior", "watchdog", False)
+
+
+def get_watchdog():
+    """Get the running EventLoopWatchdog, or None."""
+    return _watchdog
+
+
+def start_watchdog(widget):
+    """Start watching widget's event loop (Tk thread); returns the watchdog."""
+    global _watchdog
+    if _watchdog is None:
+        try:
+            threshold_ms = float(os.environ.get("SAILDECK_WATCHDOG_THRESHOLD_MS") or LONG_TASK_MS)
+        except ValueError:
+            threshold_ms = LONG_TASK_MS
+        _watchdog = EventLoopWatchdog(widget, threshold_ms=threshold_ms)
+        _watchdog.start()
+    return _watchdog
+
+
+def stop_watchdog():
+    """Stop the watchdog, if running, and write its final report."""
+    global _watchdog
+    if _watchdog is not None:
+        _watchdog.stop()
+        _watchdog = None
+
+
+def apply_watchdog_setting(widget):
+    """Start or stop the watchdog to match the setting and the environment."""
+    if watchdog_requested():
+        start_watchdog(widget)
+    else:
+        stop_watchdog()
@@ -0,0 +1,66 @@
+"""
+Responsiveness report window for Saildeck.
+Shows the Tk event-loop watchdog's rolling report (see ui_watchdog.py).
+"""
+
+import os
+from pathlib import Path
+import ttkbootstrap as tb
+from tkinter import Text
+from theme_manager import get_platform_font
+from platform_handler import get_platform_handler
+from ui_watchdog import get_watchdog, get_report_path
+
+
+def _report_text():
+    watchdog = get_watchdog()
+    if watchdog is not None:
+        return watchdog.format_report()
+
+    text = ("The responsiveness monitor is off.\n"
+            "Turn on \"Record UI stalls\" in Settings → Behavior, or start Saildeck with SAILDECK_WATCHDOG=1.\n")
+    path = get_report_path()
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text += "\nLast saved report:\n\n" + f.read()
+        except OSError as e:
+            print(f"[!] Error reading {path}: {e}")
+    return text
+
+
+def show_watchdog_report(parent):
+    font = get_platform_font()
+
+    win = tb.Toplevel(parent)
+    win.title("Responsiveness Report")
+    win.geometry("760x520")
+    win.minsize(500, 300)
+    win.transient(parent)
+
+    text_frame = tb.Frame(win)
+    text_frame.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+    text = Text(text_frame, wrap="none", font=("Courier", 10))
+    vsb = tb.Scrollbar(text_frame, orient="vertical", command=text.yview)
+    text.configure(yscrollcommand=vsb.set)
+    vsb.pack(side="right", fill="y")
+    text.pack(side="left", fill="both", expand=True)
+
+    def refresh():
+        text.configure(state="normal")
+        text.delete("1.0", "end")
+        text.insert("1.0", _report_text())
+        text.configure(state="disabled")
+
+    def open_report_folder():
+        get_platform_handler().open_folder(Path(os.path.dirname(get_report_path())))
+
+    button_frame = tb.Frame(win)
+    button_frame.pack(fill="x", padx=10, pady=(0, 10))
+    tb.Button(button_frame, text="Refresh", command=refresh, bootstyle="primary").pack(side="left")
+    tb.Button(button_frame, text="Open Report Folder", command=open_report_folder,
+              bootstyle="secondary-outline").pack(side="left", padx=(8, 0))
+    tb.Button(button_frame, text="Close", command=win.destroy, bootstyle="secondary").pack(side="right")
+    tb.Label(button_frame, text=get_report_path(), font=(font, 8)).pack(side="left", padx=(12, 0))
+
+    refresh()